@@ -0,0 +1,58 @@
+"""Benchmark batch generation of feedback.
+
+``fm.feedback_batch`` is compared with calling ``fm.feedback`` once per feedback and
+with the previous implementation, which created a Faker instance per feedback, e.g.
+
+    python benchmarks/bench_feedback.py -n 10000
+
+"""
+
+import argparse
+import time
+
+import faker
+
+import fakeitmakeit as fm
+
+
+def bench(generate, n, repeat):
+    """Best time in seconds of generating ``n`` feedbacks with ``generate``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        generate(n)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """Print times and speedups of batch feedback generation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=10_000, help="number of feedbacks")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--faker", type=int, default=1_000, help="number of feedbacks with Faker"
+    )
+    args = parser.parse_args()
+
+    # Load the sentence pool, so that it is not included in the timings.
+    fm.feedback_batch(1, rng=0)
+
+    batch = bench(lambda n: fm.feedback_batch(n, rng=0), args.n, args.repeat)
+    calls = bench(lambda n: [fm.feedback(rng=0) for _ in range(n)], args.n, 1)
+    # Faker is slow, so it is timed on fewer feedbacks and scaled.
+    previous = bench(
+        lambda n: ["\n\n".join(faker.Faker().paragraphs(nb=1)) for _ in range(n)],
+        args.faker,
+        1,
+    ) * (args.n / args.faker)
+
+    print(f"{'method':>14} {'time [s]':>10} {'speedup':>8}")
+    for name, res in [("feedback_batch", batch), ("feedback", calls)]:
+        print(f"{name:>14} {res:>10.3f} {previous / res:>8.1f}")
+    print(f"{'Faker':>14} {previous:>10.3f} {1:>8.1f}")
+    print(f"feedback_batch is {calls / batch:.0f}x faster than feedback calls.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark random-access generation of cohorts.
+
+``fm.cohort_slice`` is compared with ``fm.cohort`` and with generating the same
+students one by one with ``fm.student_at``, e.g.
+
+    python benchmarks/bench_slice.py -n 100000
+
+"""
+
+import argparse
+import time
+
+import fakeitmakeit as fm
+
+
+def bench(generate, n, repeat):
+    """Best time in seconds of generating ``n`` students with ``generate``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        generate(n)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """Print times and slowdowns of random-access generation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=10_000, help="number of students")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--student-at", type=int, default=100, help="number of students one by one"
+    )
+    args = parser.parse_args()
+
+    # Load pools, so that they are not included in the timings.
+    fm.cohort(1_000, rng=0)
+    fm.cohort_slice(0, 0, 1_000)
+
+    cohort = bench(lambda n: fm.cohort(n, rng=0), args.n, args.repeat)
+    sliced = bench(lambda n: fm.cohort_slice(0, 0, n), args.n, args.repeat)
+    # Students one by one are slow, so they are timed on fewer students and scaled.
+    students = bench(
+        lambda n: [fm.student_at(0, i) for i in range(n)], args.student_at, 1
+    ) * (args.n / args.student_at)
+
+    print(f"{'method':>12} {'time [s]':>10} {'slowdown':>9}")
+    for name, res in [
+        ("cohort", cohort),
+        ("cohort_slice", sliced),
+        ("student_at", students),
+    ]:
+        print(f"{name:>12} {res:>10.3f} {res / cohort:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark loading cohorts with marks into SQLite databases.
+
+The load is compared with generating the cohort and marks alone, e.g.
+
+    python benchmarks/bench_sqlite.py -n 1000000 --chunk-size 100000
+
+"""
+
+import argparse
+import tempfile
+import time
+
+import fakeitmakeit as fm
+
+
+def main():
+    """Print times of generating and loading a cohort with marks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=100_000, help="number of students")
+    parser.add_argument("--assignments", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    # Load pools, so that they are not included in the timings.
+    fm.cohort(1_000, rng=0)
+
+    start = time.perf_counter()
+    fm.cohort(args.n, rng=0)
+    cohort = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fm.marks(args.n * args.assignments, rng=0)
+    marks = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        fm.load_sqlite(
+            f"{tmp}/cohort.db",
+            args.n,
+            n_assignments=args.assignments,
+            seed=0,
+            chunk_size=args.chunk_size,
+        )
+        load = time.perf_counter() - start
+
+    rows = args.n * (1 + args.assignments)
+    print(f"{'step':>8} {'time [s]':>10}")
+    print(f"{'cohort':>8} {cohort:>10.3f}")
+    print(f"{'marks':>8} {marks:>10.3f}")
+    print(f"{'load':>8} {load:>10.3f}")
+    print(f"{rows / load:,.0f} rows/s, {load - cohort - marks:.3f} s in SQLite")
+
+
+if __name__ == "__main__":
+    main()
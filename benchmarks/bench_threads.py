@@ -0,0 +1,52 @@
+"""Benchmark thread scaling of cohort generation.
+
+Run the benchmark with both a regular and a free-threaded (no-GIL) interpreter, e.g.
+
+    python benchmarks/bench_threads.py
+    python3.13t benchmarks/bench_threads.py
+
+Threads speed up generation only if the GIL is disabled.
+
+"""
+
+import argparse
+import sys
+import time
+
+import fakeitmakeit as fm
+
+
+def bench(n, threads, repeat):
+    """Best time in seconds of generating a cohort of ``n`` students."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fm.cohort(n, rng=0, threads=threads)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """Print times and speedups of cohort generation with different thread counts."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=100_000, help="number of students")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+
+    # Load pools, so that they are not included in the timings.
+    fm.cohort(1_000, rng=0)
+
+    baseline = bench(args.n, None, args.repeat)
+    print(f"{'threads':>8} {'time [s]':>10} {'speedup':>8}")
+    print(f"{'-':>8} {baseline:>10.3f} {1:>8.2f}")
+    for threads in args.threads:
+        res = bench(args.n, threads, args.repeat)
+        print(f"{threads:>8} {res:>10.3f} {baseline / res:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
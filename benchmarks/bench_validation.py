@@ -0,0 +1,52 @@
+"""Benchmark validation of corrupted cohorts and assignments.
+
+Faults are injected with ``fm.corrupt`` and validators are timed on the corrupted
+data and on the rows without faults, e.g.
+
+    python benchmarks/bench_validation.py -n 1000000 --rate 0.001
+
+"""
+
+import argparse
+import logging
+import time
+
+import fakeitmakeit as fm
+
+
+def bench(name, validate, value, mask):
+    """Print the time of validating ``value`` and its rows without faults."""
+    clean = value[~mask.any(axis=1).to_numpy()]
+    for label, data, expected in [("corrupted", value, False), ("clean", clean, True)]:
+        start = time.perf_counter()
+        res = validate(data)
+        elapsed = time.perf_counter() - start
+        status = "ok" if res == expected else "WRONG"
+        print(f"{name:>10} {label:>10} {elapsed:>10.3f} {status:>6}")
+
+
+def main():
+    """Print times of validating corrupted data."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=100_000, help="number of students")
+    parser.add_argument("--rate", type=float, default=0.001, help="rate of faults")
+    args = parser.parse_args()
+
+    # Validators log every fault.
+    logging.disable(logging.WARNING)
+
+    cohort = fm.cohort(args.n, rng=0)
+    assignment = fm.assignment(cohort.index, rng=0)
+
+    start = time.perf_counter()
+    corrupted_cohort, cohort_mask = fm.corrupt(cohort, args.rate, rng=0)
+    corrupted_assignment, assignment_mask = fm.corrupt(assignment, args.rate, rng=0)
+    print(f"corrupt: {time.perf_counter() - start:.3f} s")
+
+    print(f"{'data':>10} {'rows':>10} {'time [s]':>10} {'result':>6}")
+    bench("cohort", fm.isvalid.cohort, corrupted_cohort, cohort_mask)
+    bench("assignment", fm.isvalid.assignment, corrupted_assignment, assignment_mask)
+
+
+if __name__ == "__main__":
+    main()
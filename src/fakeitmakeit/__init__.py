@@ -1,35 +1,120 @@
-from importlib.metadata import version
-
-from .factory import (
-    assignment,
-    cid,
-    cohort,
-    country,
-    course,
-    email,
-    feedback,
-    gender,
-    mark,
-    name,
-    student,
-    title,
-    username,
-)
-
-__version__ = version("fakeitmakeit")
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cache import cached
+    from .factory import (
+        assignment,
+        cid,
+        cohort,
+        cohort_slice,
+        country,
+        course,
+        email,
+        emails,
+        extend_cohort,
+        feedback,
+        feedback_batch,
+        gender,
+        gradebook,
+        mark,
+        marks,
+        name,
+        names,
+        student,
+        student_at,
+        title,
+        username,
+    )
+    from .faults import corrupt
+    from .privacy import pseudonymise
+    from .relational import dataset
+    from .schema import Column, Schema
+    from .shared import attach_cohort, detach_cohort, share_cohort
+    from .sqlite import load_sqlite
 
 __all__ = [
+    "Column",
+    "Schema",
     "assignment",
+    "attach_cohort",
+    "cached",
     "cid",
     "cohort",
+    "cohort_slice",
+    "corrupt",
     "country",
     "course",
+    "dataset",
+    "detach_cohort",
     "email",
+    "emails",
+    "extend_cohort",
     "feedback",
+    "feedback_batch",
     "gender",
+    "gradebook",
+    "load_sqlite",
     "mark",
+    "marks",
     "name",
+    "names",
+    "pseudonymise",
+    "share_cohort",
     "student",
+    "student_at",
     "title",
     "username",
 ]
+
+# Submodules in which functions and classes not defined in factory are defined.
+_FUNCTION_MODULES = {
+    "Column": "schema",
+    "Schema": "schema",
+    "attach_cohort": "shared",
+    "cached": "cache",
+    "corrupt": "faults",
+    "dataset": "relational",
+    "detach_cohort": "shared",
+    "load_sqlite": "sqlite",
+    "pseudonymise": "privacy",
+    "share_cohort": "shared",
+}
+
+# Submodules, functions and version are imported on first access so that importing
+# fakeitmakeit does not import pandas, Faker and pycountry before they are needed.
+_SUBMODULES = {
+    "cache",
+    "distributions",
+    "factory",
+    "faults",
+    "isvalid",
+    "pools",
+    "privacy",
+    "relational",
+    "schema",
+    "shared",
+    "sqlite",
+    "util",
+}
+
+
+def __getattr__(name):
+    if name == "__version__":
+        from importlib.metadata import version
+
+        value = globals()[name] = version("fakeitmakeit")
+        return value
+    elif name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    elif name in __all__:
+        module_name = _FUNCTION_MODULES.get(name, "factory")
+        module = importlib.import_module(f".{module_name}", __name__)
+        value = globals()[name] = getattr(module, name)
+        return value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *__all__, *_SUBMODULES, "__version__"})
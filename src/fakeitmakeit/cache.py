@@ -0,0 +1,251 @@
+import dataclasses
+import functools
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import fakeitmakeit.pools as fmp
+import fakeitmakeit.util as fmu
+
+# Default maximum size of the dataset cache in bytes.
+MAX_SIZE = 2**30
+
+# Key of the Arrow schema metadata in which the type of the cached result is stored.
+_KIND = b"fakeitmakeit.kind"
+
+# Lock serialising writes and evictions in this process.
+_lock = threading.Lock()
+
+
+def cached(function, max_size=None):
+    """Cache seeded calls of ``function`` on disk.
+
+    The returned function calls ``function`` with the same arguments. If the ``rng``
+    argument is an integer seed, the result is stored in the ``datasets``
+    subdirectory of the on-disk cache (see ``fm.pools.cache_dir``) as an Arrow IPC
+    file named after a hash of the function, its arguments, the ``fakeitmakeit``
+    version, the cohort bias (``fm.util.cohort_bias``) and the key of the pools
+    (``fm.pools.cache_key``). Further calls with the same arguments memory-map the
+    file instead of generating the data again. Arguments are hashed by their contents,
+    e.g. all values of arrays and all fields of distributions. Calls without a seed,
+    with a random number generator, with arguments which cannot be hashed exactly
+    (e.g. iterators) or returning anything other than a pandas series or dataframe,
+    pyarrow table or polars dataframe are not cached. Functions without an ``rng``
+    argument are assumed to be deterministic.
+
+    When the cache grows over ``max_size`` bytes, the least recently used results
+    are evicted. Requires the ``arrow`` extra.
+
+    Parameters
+    ----------
+    function: Callable
+
+        Function generating a dataset, e.g. ``fm.cohort`` or ``fm.gradebook``.
+
+    max_size: int, optional
+
+        Maximum size of the cache in bytes. Defaults to ``MAX_SIZE``.
+
+    Returns
+    -------
+    Callable
+
+        Function with the same signature as ``function``.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> cohort = fm.cached(fm.cohort)
+    >>> cohort(100, rng=0).equals(cohort(100, rng=0))  # doctest: +SKIP
+    True
+
+    """
+    signature = inspect.signature(function)
+    max_size = MAX_SIZE if max_size is None else max_size
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        rng = arguments.arguments.get("rng", 0)
+        if isinstance(rng, bool) or not isinstance(rng, int | np.integer):
+            return function(*args, **kwargs)
+
+        try:
+            key = _key(function, arguments.arguments)
+        except TypeError:
+            # Arguments cannot be hashed exactly.
+            return function(*args, **kwargs)
+
+        path = cache_dir() / f"{key}.arrow"
+        try:
+            res = _load(path)
+        except (OSError, ValueError):
+            # The result is missing or corrupted.
+            res = function(*args, **kwargs)
+            _save(path, res, max_size)
+        return res
+
+    return wrapper
+
+
+def cache_dir():
+    """Directory of the on-disk dataset cache.
+
+    Returns
+    -------
+    pathlib.Path
+
+        Cache directory, ``datasets`` subdirectory of ``fm.pools.cache_dir``.
+
+    """
+    return fmp.cache_dir() / "datasets"
+
+
+def clear():
+    """Remove all results from the on-disk dataset cache."""
+    with _lock:
+        for path in cache_dir().glob("*.arrow"):
+            path.unlink(missing_ok=True)
+
+
+def _key(function, arguments):
+    """Hash of ``function``, its ``arguments`` and the global state of generators.
+
+    The global state is the ``fakeitmakeit`` version, the cohort bias
+    (``fm.util.cohort_bias``) and the key of the pools (``fm.pools.cache_key``), which
+    covers the Faker version and the pool parameters.
+
+    """
+    state = {
+        "function": f"{function.__module__}.{function.__qualname__}",
+        "arguments": _state(dict(arguments)),
+        "version": importlib.metadata.version("fakeitmakeit"),
+        "cohort_bias": _state(fmu.cohort_bias),
+        "pools": fmp.cache_key(),
+    }
+    text = json.dumps(state, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def _state(value):
+    """JSON-serialisable state of ``value`` which determines it exactly.
+
+    Raises ``TypeError`` if ``value`` cannot be represented exactly.
+
+    """
+    import pandas as pd
+
+    if value is None or isinstance(value, bool | int | float | str):
+        return value
+    elif isinstance(value, np.generic):
+        return _state(value.item())
+    elif isinstance(value, list | tuple):
+        return [type(value).__name__, [_state(v) for v in value]]
+    elif isinstance(value, dict):
+        return ["dict", [[_state(k), _state(v)] for k, v in value.items()]]
+    elif isinstance(value, pd.Index | pd.Series):
+        return [type(value).__name__, _state(value.name), _state(value.to_numpy())]
+    elif isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return ["ndarray", value.shape, _state(value.ravel().tolist())]
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return ["ndarray", value.dtype.str, value.shape, digest]
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {
+            f.name: _state(getattr(value, f.name)) for f in dataclasses.fields(value)
+        }
+        return [f"{type(value).__module__}.{type(value).__qualname__}", fields]
+    raise TypeError(f"Cannot hash {type(value).__name__!r} exactly.")
+
+
+def _load(path):
+    """Memory-map the result cached in ``path`` and mark it as recently used."""
+    pa = fmu.optional_import("pyarrow")
+
+    # The file stays mapped while the buffers of the table are in use.
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    _touch(path)
+
+    kind = table.schema.metadata[_KIND].decode()
+    if kind == "pandas":
+        return table.to_pandas()
+    elif kind == "series":
+        return table.to_pandas().iloc[:, 0]
+    elif kind == "polars":
+        return fmu.optional_import("polars").from_arrow(table)
+    return table.replace_schema_metadata(
+        {k: v for k, v in table.schema.metadata.items() if k != _KIND} or None
+    )
+
+
+def _save(path, res, max_size):
+    """Save ``res`` to ``path`` and evict results over ``max_size`` bytes."""
+    pa = fmu.optional_import("pyarrow")
+
+    kind = type(res).__module__.split(".")[0]
+    if kind == "pandas" and hasattr(res, "to_frame"):
+        kind = "series"
+        table = pa.Table.from_pandas(res.to_frame())
+    elif kind == "pandas" and hasattr(res, "columns"):
+        table = pa.Table.from_pandas(res)
+    elif kind == "polars" and hasattr(res, "columns"):
+        table = res.to_arrow()
+    elif isinstance(res, pa.Table):
+        table = res
+    else:
+        return
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), _KIND: kind.encode()}
+    )
+
+    with _lock:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file and rename it so that other processes never
+            # read a partially written result.
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+                with pa.ipc.new_file(f, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(f.name, path)
+            _touch(path)
+            _evict(path.parent, max_size)
+        except OSError as e:
+            logging.warning(f"Dataset could not be cached: {e}")
+
+
+def _touch(path):
+    """Mark ``path`` as used now.
+
+    The time is set explicitly, because file systems may update it coarsely.
+
+    """
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+
+def _evict(directory, max_size):
+    """Remove least recently used results until they fit in ``max_size`` bytes."""
+    entries = []
+    for path in directory.glob("*.arrow"):
+        try:
+            entries.append((path.stat(), path))
+        except FileNotFoundError:
+            # Removed by another process.
+            continue
+
+    size = sum(stat.st_size for stat, _ in entries)
+    for stat, path in sorted(entries, key=lambda entry: entry[0].st_mtime_ns):
+        if size <= max_size:
+            break
+        path.unlink(missing_ok=True)
+        size -= stat.st_size
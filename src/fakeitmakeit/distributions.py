@@ -0,0 +1,483 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+import fakeitmakeit.util as fmu
+
+# Marks are generated from [MIN_MARK, MAX_MARK] range.
+MIN_MARK = 0.0
+MAX_MARK = 100.0
+
+
+@dataclass(frozen=True)
+class TruncatedNormal:
+    """Normal distribution truncated to [0, 100].
+
+    Unlike clipping, truncation does not put probability mass on exactly 0 and 100.
+    Note that ``mean`` and ``std`` are the parameters of the normal distribution before
+    truncation, so the mean and standard deviation of marks differ from them when a
+    significant part of the distribution is outside [0, 100].
+
+    Parameters
+    ----------
+    mean: float
+
+        Mean.
+
+    std: float
+
+        Standard deviation.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.distributions.TruncatedNormal(65, 10).sample(3)  # doctest: +SKIP
+    array([71.52, 58.04, 63.87])
+
+    """
+
+    mean: float = 65.0
+    std: float = 6.0
+
+    def __post_init__(self):
+        """Validate parameters."""
+        if not self.std > 0:
+            raise ValueError(f"Standard deviation must be positive ({self.std=}).")
+
+    def sample(self, n, rng=None):
+        """Draw ``n`` marks.
+
+        Parameters
+        ----------
+        n: int
+
+            Number of marks.
+
+        rng: np.random.Generator, int, optional
+
+            Random number generator or a seed. If not provided, the default generator
+            is used.
+
+        Returns
+        -------
+        np.ndarray
+
+            Array of marks.
+
+        """
+        a = (MIN_MARK - self.mean) / self.std
+        b = (MAX_MARK - self.mean) / self.std
+        z = _truncated_standard_normal(n, a, b, fmu.get_rng(rng))
+        # Clipping only removes floating-point errors at the bounds.
+        return np.clip(self.mean + self.std * z, MIN_MARK, MAX_MARK)
+
+
+@dataclass(frozen=True)
+class NormalMixture:
+    """Mixture of normal distributions truncated to [0, 100], e.g. for bimodal classes.
+
+    Each mark is drawn from one of the components, chosen with probabilities
+    ``weights``. Components are truncated individually (see ``TruncatedNormal``), so
+    ``weights`` are the expected fractions of marks drawn from each component.
+
+    Parameters
+    ----------
+    means: tuple[float]
+
+        Means of the components.
+
+    stds: tuple[float]
+
+        Standard deviations of the components.
+
+    weights: tuple[float], optional
+
+        Relative weights of the components. If not provided, components are equally
+        likely.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> dist = fm.distributions.NormalMixture(means=(45, 75), stds=(8, 6))
+    >>> dist.sample(3)  # doctest: +SKIP
+    array([77.21, 41.9 , 70.08])
+
+    """
+
+    means: tuple
+    stds: tuple
+    weights: tuple | None = None
+
+    def __post_init__(self):
+        """Validate parameters."""
+        if len(self.means) != len(self.stds) or not self.means:
+            raise ValueError("Means and stds must be non-empty and of the same length.")
+        if self.weights is not None and (
+            len(self.weights) != len(self.means)
+            or min(self.weights) < 0
+            or not sum(self.weights) > 0
+        ):
+            raise ValueError(f"Invalid weights {self.weights}.")
+        # Validate components.
+        self.components()
+
+    def components(self):
+        """Components of the mixture.
+
+        Returns
+        -------
+        list[TruncatedNormal]
+
+            Truncated normal distributions.
+
+        """
+        return [
+            TruncatedNormal(mean, std)
+            for mean, std in zip(self.means, self.stds, strict=True)
+        ]
+
+    def sample(self, n, rng=None):
+        """Draw ``n`` marks.
+
+        Parameters
+        ----------
+        n: int
+
+            Number of marks.
+
+        rng: np.random.Generator, int, optional
+
+            Random number generator or a seed. If not provided, the default generator
+            is used.
+
+        Returns
+        -------
+        np.ndarray
+
+            Array of marks.
+
+        """
+        rng = fmu.get_rng(rng)
+
+        weights = np.ones(len(self.means)) if self.weights is None else self.weights
+        weights = np.asarray(weights, dtype=float)
+        choices = rng.choice(len(weights), size=n, p=weights / weights.sum())
+
+        res = np.empty(n)
+        for i, component in enumerate(self.components()):
+            mask = choices == i
+            res[mask] = component.sample(np.count_nonzero(mask), rng=rng)
+        return res
+
+
+@dataclass(frozen=True)
+class Beta:
+    """Beta distribution scaled to [0, 100].
+
+    Parameters
+    ----------
+    a: float
+
+        Alpha parameter.
+
+    b: float
+
+        Beta parameter.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.distributions.Beta(6.5, 3.5).sample(3)  # doctest: +SKIP
+    array([68.4 , 51.93, 80.12])
+
+    """
+
+    a: float
+    b: float
+
+    def __post_init__(self):
+        """Validate parameters."""
+        if not (self.a > 0 and self.b > 0):
+            raise ValueError(f"Parameters must be positive ({self.a=}, {self.b=}).")
+
+    @classmethod
+    def from_mean_std(cls, mean, std):
+        """Beta distribution with the given ``mean`` and standard deviation ``std``.
+
+        Parameters
+        ----------
+        mean: float
+
+            Mean from (0, 100) range.
+
+        std: float
+
+            Standard deviation. It must be smaller than
+            ``sqrt(mean * (100 - mean))``.
+
+        Returns
+        -------
+        Beta
+
+            Beta distribution.
+
+        Examples
+        --------
+        >>> import fakeitmakeit as fm
+        ...
+        >>> fm.distributions.Beta.from_mean_std(60, 20)
+        Beta(a=3.0, b=2.0)
+
+        """
+        mu = (mean - MIN_MARK) / (MAX_MARK - MIN_MARK)
+        var = (std / (MAX_MARK - MIN_MARK)) ** 2
+        if not (0 < mu < 1 and 0 < var < mu * (1 - mu)):
+            raise ValueError(f"No beta distribution with {mean=} and {std=}.")
+        nu = mu * (1 - mu) / var - 1
+        return cls(a=round(mu * nu, 12), b=round((1 - mu) * nu, 12))
+
+    def sample(self, n, rng=None):
+        """Draw ``n`` marks.
+
+        Parameters
+        ----------
+        n: int
+
+            Number of marks.
+
+        rng: np.random.Generator, int, optional
+
+            Random number generator or a seed. If not provided, the default generator
+            is used.
+
+        Returns
+        -------
+        np.ndarray
+
+            Array of marks.
+
+        """
+        return MIN_MARK + (MAX_MARK - MIN_MARK) * fmu.get_rng(rng).beta(
+            self.a, self.b, size=n
+        )
+
+
+@dataclass(frozen=True)
+class Empirical:
+    """Empirical distribution defined by a quantile table.
+
+    The cumulative distribution function is linearly interpolated between
+    ``quantiles``, i.e. marks are uniformly distributed between neighbouring
+    quantiles. The table can be built from a histogram (``from_histogram``) or from
+    real (anonymised) marks (``from_marks``).
+
+    Parameters
+    ----------
+    quantiles: tuple[float]
+
+        Non-decreasing marks from [0, 100] range.
+
+    probabilities: tuple[float], optional
+
+        Cumulative probabilities of ``quantiles``, non-decreasing from 0 to 1. If not
+        provided, quantiles are evenly spaced, e.g. ``(min, median, max)`` for three
+        quantiles.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> dist = fm.distributions.Empirical((30, 55, 65, 72, 95))
+    >>> dist.sample(3)  # doctest: +SKIP
+    array([61.17, 70.5 , 48.02])
+
+    """
+
+    quantiles: tuple
+    probabilities: tuple | None = None
+
+    def __post_init__(self):
+        """Validate parameters."""
+        quantiles = np.asarray(self.quantiles, dtype=float)
+        if (
+            len(quantiles) < 2
+            or (np.diff(quantiles) < 0).any()
+            or quantiles[0] < MIN_MARK
+            or quantiles[-1] > MAX_MARK
+        ):
+            raise ValueError(f"Invalid quantiles {self.quantiles}.")
+        if self.probabilities is not None:
+            probabilities = np.asarray(self.probabilities, dtype=float)
+            if (
+                len(probabilities) != len(quantiles)
+                or (np.diff(probabilities) < 0).any()
+                or probabilities[0] != 0
+                or probabilities[-1] != 1
+            ):
+                raise ValueError(f"Invalid probabilities {self.probabilities}.")
+
+    @classmethod
+    def from_histogram(cls, edges, counts):
+        """Empirical distribution from a histogram.
+
+        Marks are uniformly distributed within each bin.
+
+        Parameters
+        ----------
+        edges: Iterable[float]
+
+            Bin edges, e.g. ``(0, 40, 50, 60, 70, 100)``.
+
+        counts: Iterable[float]
+
+            Number (or fraction) of marks in each bin. There is one count fewer than
+            there are edges.
+
+        Returns
+        -------
+        Empirical
+
+            Empirical distribution.
+
+        Examples
+        --------
+        >>> import fakeitmakeit as fm
+        ...
+        >>> fm.distributions.Empirical.from_histogram((0, 50, 100), (1, 3))
+        Empirical(quantiles=(0.0, 50.0, 100.0), probabilities=(0.0, 0.25, 1.0))
+
+        """
+        edges = np.asarray(edges, dtype=float)
+        counts = np.asarray(counts, dtype=float)
+        if len(counts) != len(edges) - 1 or (counts < 0).any() or counts.sum() <= 0:
+            raise ValueError(f"Invalid counts {counts}.")
+
+        cumulative = np.r_[0, np.cumsum(counts)]
+        # Dividing by the last cumulative count (rather than the sum, which is rounded
+        # differently) makes the last probability exactly 1.
+        cumulative /= cumulative[-1]
+        return cls(
+            quantiles=tuple(edges.tolist()), probabilities=tuple(cumulative.tolist())
+        )
+
+    @classmethod
+    def from_marks(cls, marks, n_quantiles=101):
+        """Empirical distribution from a sample of marks.
+
+        Missing values are ignored.
+
+        Parameters
+        ----------
+        marks: Iterable[float]
+
+            Marks, e.g. a column of a real gradebook.
+
+        n_quantiles: int
+
+            Number of quantiles stored in the table.
+
+        Returns
+        -------
+        Empirical
+
+            Empirical distribution.
+
+        Examples
+        --------
+        >>> import fakeitmakeit as fm
+        ...
+        >>> fm.distributions.Empirical.from_marks([40, 60, 80, 100], n_quantiles=3)
+        Empirical(quantiles=(40.0, 70.0, 100.0), probabilities=None)
+
+        """
+        marks = np.asarray(marks, dtype=float)
+        marks = marks[~np.isnan(marks)]
+        if not len(marks):
+            raise ValueError("There are no marks.")
+        quantiles = np.quantile(marks, np.linspace(0, 1, n_quantiles))
+        return cls(quantiles=tuple(quantiles.tolist()))
+
+    def sample(self, n, rng=None):
+        """Draw ``n`` marks.
+
+        Parameters
+        ----------
+        n: int
+
+            Number of marks.
+
+        rng: np.random.Generator, int, optional
+
+            Random number generator or a seed. If not provided, the default generator
+            is used.
+
+        Returns
+        -------
+        np.ndarray
+
+            Array of marks.
+
+        """
+        quantiles = np.asarray(self.quantiles, dtype=float)
+        if self.probabilities is None:
+            probabilities = np.linspace(0, 1, len(quantiles))
+        else:
+            probabilities = np.asarray(self.probabilities, dtype=float)
+        # Invert the piecewise linear cumulative distribution function. Intervals of
+        # zero probability, e.g. empty histogram bins, are never selected.
+        u = fmu.get_rng(rng).random(n)
+        upper = np.searchsorted(probabilities, u, side="right")
+        lower = upper - 1
+        t = (u - probabilities[lower]) / (probabilities[upper] - probabilities[lower])
+        return quantiles[lower] + t * (quantiles[upper] - quantiles[lower])
+
+
+def _truncated_standard_normal(n, a, b, rng):
+    """Draw ``n`` values from the standard normal distribution truncated to [a, b].
+
+    Values are drawn with rejection sampling. The proposal distribution is chosen
+    depending on the interval so that the acceptance rate is high even far in the
+    tails: the standard normal, uniform on [a, b], or exponential shifted to ``a``
+    (Robert, 1995).
+
+    """
+    if not a < b:
+        raise ValueError(f"Invalid interval [{a}, {b}].")
+
+    # Sample from the tail on the right of zero and flip the sign at the end.
+    sign = 1.0
+    if b <= 0:
+        a, b, sign = -b, -a, -1.0
+
+    if a > 0.5:
+        # Optimal rate of the exponential proposal.
+        rate = (a + math.sqrt(a**2 + 4)) / 2
+        proposal = "exponential" if rate * (b - a) > 1 else "uniform"
+    else:
+        proposal = "normal" if b - a > 2 else "uniform"
+    # Minimum of z**2 on [a, b] for the uniform proposal.
+    min_square = 0.0 if a <= 0 else a**2
+
+    res = np.empty(n)
+    filled = 0
+    while filled < n:
+        size = 2 * (n - filled) + 16
+        if proposal == "normal":
+            z = rng.standard_normal(size)
+            accept = (a <= z) & (z <= b)
+        elif proposal == "uniform":
+            z = rng.uniform(a, b, size)
+            accept = rng.random(size) <= np.exp((min_square - z**2) / 2)
+        else:
+            z = a + rng.standard_exponential(size) / rate
+            accept = (z <= b) & (rng.random(size) <= np.exp(-((z - rate) ** 2) / 2))
+
+        z = z[accept][: n - filled]
+        res[filled : filled + len(z)] = z
+        filled += len(z)
+
+    return sign * res
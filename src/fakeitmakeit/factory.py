@@ -1,22 +1,40 @@
-import random
-import re
+import dataclasses
 import string
-from dataclasses import fields
 
 import numpy as np
-import pandas as pd
-from faker import Faker
 
+import fakeitmakeit.distributions as fmd
 import fakeitmakeit.isvalid as fmiv
+import fakeitmakeit.pools as fmp
 import fakeitmakeit.util as fmu
 
+# Random-access generation derives CIDs from a permutation of student indices, so the
+# number of students is limited by the number of distinct CIDs (0[12]xxxxxx).
+MAX_STUDENTS = 2_000_000
 
-def cid():
+# Usernames in random-access generation have an optional middle letter (27 options)
+# and a 2-5 digit number (99990 options), which are unique for each index.
+USERNAME_CODES = 27 * 99_990
+
+# Random-access generation draws students in blocks with one random number generator
+# per block, so that columns are generated for the whole block at once. Generating
+# a single student costs as much as generating its block.
+SLICE_BLOCK = 256
+
+
+def cid(rng=None):
     """Generate a random 8-digit CID.
 
     The first digit is always 0, whereas the second digit is 1 or 2. The remaining 6
     digits are randomly generated between 0 and 9.
 
+    Parameters
+    ----------
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     str
@@ -31,19 +49,21 @@ def cid():
     "01234567"
 
     """
+    rng = fmu.get_rng(rng)
+
     # The first digit is always 0.
     number = "0"
 
     # The second digit is 1 or 2.
-    number += str(random.choice([1, 2]))
+    number += str(rng.integers(1, 3))
 
     # Generate the remaining 6 digits randomly between 0 and 9.
-    number += "".join(str(random.randint(0, 9)) for _ in range(6))
+    number += "".join(map(str, rng.integers(0, 10, size=6)))
 
     return number
 
 
-def gender(distribution=dict(fmu.GENDERS)):
+def gender(distribution=dict(fmu.GENDERS), rng=None):
     """Generate a random gender.
 
     Possible gender values and their relative probabilities are passed via
@@ -58,6 +78,11 @@ def gender(distribution=dict(fmu.GENDERS)):
         Keys are possible output values and values are relative probablilities. For
         instance, ``{"male": 0.5, "female": 0.5}``.
 
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     str
@@ -72,10 +97,10 @@ def gender(distribution=dict(fmu.GENDERS)):
     'male'
 
     """
-    return fmu.discrete_draw(distribution)
+    return fmu.discrete_draw(distribution, rng=rng)
 
 
-def title(genderval=None):
+def title(genderval=None, rng=None):
     """Generate a random title.
 
     If gender is provided via ``genderval``, then the title is generated
@@ -92,6 +117,11 @@ def title(genderval=None):
 
         Gender.
 
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     str
@@ -110,18 +140,19 @@ def title(genderval=None):
     'Mx'
 
     """
-    genderval = genderval or gender()
+    rng = fmu.get_rng(rng)
+    genderval = genderval or gender(rng=rng)
     if genderval == "male":
         return "Mr"
     elif genderval == "female":
-        return random.choice(["Ms", "Mrs", "Miss"])
+        return ["Ms", "Mrs", "Miss"][rng.integers(3)]
     elif genderval == "nonbinary":
         return "Mx"
     else:
         raise ValueError(f"Invalid gender: {genderval=}")
 
 
-def course(distribution=dict(fmu.COURSES)):
+def course(distribution=dict(fmu.COURSES), rng=None):
     """Generate a random course.
 
     Possible courses and their relative probabilities are passed via ``distribution``.
@@ -136,6 +167,11 @@ def course(distribution=dict(fmu.COURSES)):
         Keys are possible outputs and values are relative probablilities. For instance,
         ``{"course1": 0.5, "course2": 0.5}``.
 
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     str
@@ -150,10 +186,10 @@ def course(distribution=dict(fmu.COURSES)):
     'acse'
 
     """
-    return fmu.discrete_draw(distribution)
+    return fmu.discrete_draw(distribution, rng=rng)
 
 
-def country(distribution=dict(fmu.COUNTRIES), bias=None):
+def country(distribution=None, bias=None, rng=None):
     """Generate a random country.
 
     Distribution is passed via ``distribution``. It is a dictionary whose keys are
@@ -161,17 +197,26 @@ def country(distribution=dict(fmu.COUNTRIES), bias=None):
     ``distribution`` do not have to sum to 1 because selections will be made according
     to the relative weights.
 
-    By default, all countries are equally likely and their relative probablility is 1.
-    To modify the default probablilities, pass a dictionary of countries and their
-    relative probabilities via ``bias``. Internally, ``distribution |= bias`` is
-    calculated.
+    By default, all countries (``fm.util.COUNTRIES``) are equally likely and their
+    relative probablility is 1. To modify the default probablilities, pass a dictionary
+    of countries and their relative probabilities via ``bias``. Internally,
+    ``distribution | bias`` is calculated.
 
     Parameters
     ----------
-    distribution: dict
+    distribution: dict, optional
 
         Keys are possible outputs and values are relative probablilities.
 
+    bias: dict, optional
+
+        Keys are countries and values are their relative probablilities.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     str
@@ -190,11 +235,12 @@ def country(distribution=dict(fmu.COUNTRIES), bias=None):
     'France'
 
     """
-    distribution |= bias or {}
-    return fmu.discrete_draw(distribution)
+    if distribution is None:
+        distribution = fmu.COUNTRIES
+    return fmu.discrete_draw(distribution | (bias or {}), rng=rng)
 
 
-def username(nameval=None):
+def username(nameval=None, rng=None):
     """Generate a random username.
 
     The username is the combination of 2-3 lowercase letters and a random number with 2
@@ -209,6 +255,11 @@ def username(nameval=None):
 
         Name.
 
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     str
@@ -223,7 +274,8 @@ def username(nameval=None):
     'jws4122'
 
     """
-    nameval = nameval or name()
+    rng = fmu.get_rng(rng)
+    nameval = nameval or name(rng=rng)
 
     # Get the first letter of the first name.
     first_letter, *_ = nameval.casefold().split()[0]
@@ -232,23 +284,22 @@ def username(nameval=None):
     last_letter, *_ = nameval.casefold().split()[-1]
 
     # Randomly decide if the string will have 2 or 3 letters.
-    if random.choice([2, 3]) == 3:
+    if rng.integers(2, 4) == 3:
         # Generate a random middle lowercase letter (can be any lowercase letter).
-        middle_letter = random.choice(string.ascii_lowercase)
+        middle_letter = string.ascii_lowercase[rng.integers(26)]
         letters = first_letter + middle_letter + last_letter
     else:
         letters = first_letter + last_letter
 
     # Generate a random number between 2 and 4 digits where the first digit is not zero.
-    num_digits = random.choice([2, 3, 4])
-    numbers = str(random.randint(1, 9))  # First digit is never zero
-    for _ in range(num_digits - 1):
-        numbers += str(random.randint(0, 9))
+    num_digits = rng.integers(2, 5)
+    numbers = str(rng.integers(1, 10))  # First digit is never zero
+    numbers += "".join(map(str, rng.integers(0, 10, size=num_digits - 1)))
 
     return letters + numbers
 
 
-def email(domainval=None):
+def email(domainval=None, rng=None):
     """Generate a random email.
 
     If ``domainval`` is not provided, then an email with a random domain is generated.
@@ -260,6 +311,11 @@ def email(domainval=None):
 
         Domain.
 
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     str
@@ -276,18 +332,109 @@ def email(domainval=None):
     'john.doe@myuniversity.ac.uk'
 
     """
-    fake = Faker()
-    domain = domainval or fake.domain_name()
-    return f"{fake.user_name()}@{domain}"
+    return str(emails(1, domain=domainval, unique=False, rng=rng)[0])
+
+
+def emails(n, domain=None, unique=True, rng=None, taken=None):
+    """Generate ``n`` random emails.
+
+    Local parts are drawn from the user name pool (``fm.pools.user_names()``). If
+    ``domain`` is not provided, domains are drawn from the domain pool
+    (``fm.pools.domains()``). Otherwise, all emails are generated with the provided
+    domain.
+
+    If ``unique`` is ``True``, emails which were already generated or are in ``taken``
+    are redrawn with a random number appended to their local part until all emails are
+    unique. The number of appended digits grows with each redraw, so that the loop
+    always terminates.
+
+    Parameters
+    ----------
+    n: int
+
+        Number of emails.
+
+    domain: str, optional
+
+        Domain.
+
+    unique: bool, optional
+
+        If ``True``, all generated emails are unique.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    taken: Iterable[str], optional
+
+        Emails the generated emails must differ from, e.g. emails of existing
+        students. Ignored if ``unique`` is ``False``.
+
+    Returns
+    -------
+    np.ndarray
+
+        Array of randomly generated emails.
 
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.emails(2)  # doctest: +SKIP
+    array(['john72@smith.com', 'sarah61@jones.net'], dtype='<U27')
+    >>> fm.emails(2, domain='myuniversity.ac.uk')  # doctest: +SKIP
+    array(['john72@myuniversity.ac.uk', 'sarah61@myuniversity.ac.uk'], dtype='<U27')
 
-def name(genderval=None, countryval=None):
+    """
+    rng = fmu.get_rng(rng)
+
+    local = rng.choice(fmp.user_names(), size=n)
+    if domain is None:
+        domains = rng.choice(fmp.domains(), size=n)
+    else:
+        domains = np.full(n, domain)
+    res = np.strings.add(np.strings.add(local, "@"), domains)
+
+    if unique:
+        seen = set(taken or ())
+        todo = np.arange(n)
+        digits = 1
+        while todo.size:
+            # Remember new emails and collect indices of the already seen ones.
+            duplicated = []
+            for i, value in zip(todo, res[todo].tolist(), strict=True):
+                if value in seen:
+                    duplicated.append(i)
+                else:
+                    seen.add(value)
+            todo = np.array(duplicated, dtype=np.intp)
+
+            if todo.size:
+                # Redraw duplicated emails with a random number in the local part.
+                suffix = rng.integers(10**digits, size=todo.size).astype(str)
+                local[todo] = rng.choice(fmp.user_names(), size=todo.size)
+                redrawn = np.strings.add(np.strings.add(local[todo], suffix), "@")
+                redrawn = np.strings.add(redrawn, domains[todo])
+                res = res.astype(np.promote_types(res.dtype, redrawn.dtype))
+                res[todo] = redrawn
+                digits += 1
+
+    return res
+
+
+def name(genderval=None, countryval=None, rng=None):
     """Generate a random name.
 
-    This function uses Faker to generate a random name. Depending on the ``countryval``
-    and ``genderval`` parameters, the name is generated according to the locale and by
-    calling the appropriate method from ``Faker``. Otherwise, the name with the default
-    ``Faker`` locale is returned.
+    The name is drawn from the pool of validated names generated by Faker (see
+    ``fm.pools.names``). Depending on the ``countryval`` and ``genderval`` parameters,
+    the pool for the country's locale and the gender is used. Otherwise, the name is
+    drawn from the pool of the default ``Faker`` locale.
+
+    Each pool has ``fm.pools.NAME_POOL_SIZE`` names, so names repeat after that many
+    draws from the same pool. Larger pools give more distinct names, but they take
+    longer to generate the first time they are used (they are cached on disk).
 
     Parameters
     ----------
@@ -299,6 +446,11 @@ def name(genderval=None, countryval=None):
 
         Country.
 
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     str
@@ -318,44 +470,90 @@ def name(genderval=None, countryval=None):
 
     """
     locale = fmu.COUNTRY_LOCALE.get(countryval, None)
-    fake = Faker(locale)
+    pool = fmp.names(locale, genderval)
+    return str(pool[fmu.get_rng(rng).integers(len(pool))])
 
-    # Romanized is available only for some countries.
-    if hasattr(fake, "romanized_name"):
-        res = fake.romanized_name()
-    else:
-        # Depending on the gender, we call the appropriate method from Faker.
-        method = f"name_{genderval}" if genderval is not None else "name"
-
-        # Not all countries have names for different genders.
-        try:
-            res = getattr(fake, method)()
-        except AttributeError:
-            res = fake.name()
-
-        # Remove suffixes and prefixes - Mr, PhD, words with dots and all caps.
-        # This is not exhaustive and some names might still contain some of these.
-        pattern = r"\b(?:[A-Z]+\b|PhD|Dr\(a\)|,|Dr|Mr|Mrs|Ms|Miss|\w*\.\w*)"
-        res = re.sub(pattern, "", res).strip()
-
-    if fmiv.name(res, allow_special_characters=False):
-        return res
-    else:
-        # If the name is not valid, then we generate a new one with default faker until
-        # it passes validation.
-        while not fmiv.name(res, allow_special_characters=False):
-            res = Faker().name()
 
-        return res
+def names(genders, countries, rng=None):
+    """Generate a name for each pair of gender and country.
+
+    A vectorised version of ``name``. Rows are grouped by the locale of their country
+    and gender, names of each group are drawn from its name pool in one batch and
+    scattered back to the original order. Therefore, each name is consistent with its
+    row's country and gender.
+
+    Parameters
+    ----------
+    genders: Iterable[str]
+
+        Genders.
+
+    countries: Iterable[str]
+
+        Countries. There must be as many countries as genders.
+
+    rng: np.random.Generator, int, optional
 
+        Random number generator or a seed. If not provided, the default generator is
+        used.
 
-def mark(mean=65.0, std=6.0, pfail=0.02, pnan=0.0):
+    Returns
+    -------
+    np.ndarray
+
+        Object array of names.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.names(["male", "female"], ["Germany", "Japan"])  # doctest: +SKIP
+    array(['Lukas Schmidt', 'Yumiko Sato'], dtype=object)
+
+    """
+    rng = fmu.get_rng(rng)
+
+    res = np.empty(len(genders), dtype=object)
+    for rows, pool in _name_pools(genders, countries):
+        res[rows] = pool[rng.integers(len(pool), size=len(rows))].tolist()
+
+    return res
+
+
+def _name_pools(genders, countries):
+    """Group rows by (locale, gender) and yield each group's rows and name pool."""
+    genders = np.asarray(genders, dtype=str)
+    countries = np.asarray(countries, dtype=str)
+    if genders.shape != countries.shape:
+        raise ValueError("There must be as many countries as genders.")
+    if not len(genders):
+        return
+
+    # Countries sharing a locale share a name pool, so rows are grouped by the codes
+    # of (locale, gender) pairs.
+    unique_countries, country_codes = np.unique(countries, return_inverse=True)
+    unique_genders, gender_codes = np.unique(genders, return_inverse=True)
+    country_locales = [fmu.COUNTRY_LOCALE.get(c) for c in unique_countries.tolist()]
+    unique_locales = list(dict.fromkeys(country_locales))
+    locale_codes = np.array([unique_locales.index(loc) for loc in country_locales])
+    groups = locale_codes[country_codes] * len(unique_genders) + gender_codes
+
+    order = np.argsort(groups, kind="stable")
+    keys, starts = np.unique(groups[order], return_index=True)
+    for key, rows in zip(keys, np.split(order, starts[1:]), strict=True):
+        locale_code, gender_code = divmod(int(key), len(unique_genders))
+        yield rows, fmp.names(unique_locales[locale_code], unique_genders[gender_code])
+
+
+def mark(mean=65.0, std=6.0, pfail=0.02, pnan=0.0, distribution=None, rng=None):
     """Generate a random mark.
 
     A mark between 0 and 100 is generated from a normal distribution with the given
-    ``mean`` and standard deviation ``std``. There is fail probability ``pfail`` that
-    the mark will be 0. Similarly, the probability that mark will be ``np.nan`` is
-    ``pnan. Resulting mark is rounded to two decimal places.
+    ``mean`` and standard deviation ``std``, truncated to [0, 100]. Alternatively, any
+    distribution from ``fm.distributions`` can be passed as ``distribution``. There is
+    fail probability ``pfail`` that the mark will be 0. Similarly, the probability that
+    mark will be ``np.nan`` is ``pnan``. Resulting mark is rounded to two decimal
+    places.
 
     Mark 0 can be interpreted as the student not submitting the assignment, whereas
     ``np.nan`` can be interpreted as the mark not being available, e.g. skipped exam due
@@ -379,6 +577,15 @@ def mark(mean=65.0, std=6.0, pfail=0.02, pnan=0.0):
 
         Probability that the mark will be ``np.nan``.
 
+    distribution: fm.distributions.TruncatedNormal, NormalMixture, Beta, Empirical
+
+        Distribution of marks. If provided, ``mean`` and ``std`` are ignored.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     float
@@ -390,35 +597,106 @@ def mark(mean=65.0, std=6.0, pfail=0.02, pnan=0.0):
     >>> import fakeitmakeit as fm
     ...
     >>> fm.mark(mean=65, std=10)  # doctest: +SKIP
-    71
+    71.0
     >>> fm.mark(mean=65, std=10, pfail=1, pnan=0)
     0.0
     >>> fm.mark(mean=65, std=10, pfail=0, pnan=1)
     nan
 
     """
-    rng = np.random.default_rng()
-
-    if rng.random() < pfail:
-        # Return 0 with a probability of pfail.
-        return 0.0
-    elif rng.random() < pnan:
-        # Return np.nan with a probability of pfail.
-        return np.nan
-    else:
-        # Generate a random number from a normal distribution with the given
-        # mean and standard deviation.
-        number = rng.normal(loc=mean, scale=std)
-        # Clip the number to be be between 0 and 100.
-        number = np.clip(number, 0, 100)
-        # Round the number to two decimal places
-        return round(number, 2)
+    return float(
+        marks(
+            1,
+            mean=mean,
+            std=std,
+            pfail=pfail,
+            pnan=pnan,
+            distribution=distribution,
+            rng=rng,
+        )[0]
+    )
+
+
+def marks(n, mean=65.0, std=6.0, pfail=0.02, pnan=0.0, distribution=None, rng=None):
+    """Generate ``n`` random marks.
+
+    A vectorised version of ``mark``. Marks are drawn from ``distribution`` in one
+    batch. Then, each mark is set to 0 with probability ``pfail`` and, if it is not
+    set to 0, to ``np.nan`` with probability ``pnan``.
+
+    Parameters
+    ----------
+    n: int
+
+        Number of marks.
 
+    mean: float
+
+        Mean.
 
-def feedback():
+    std: float
+
+        Standard deviation.
+
+    pfail: float
+
+        Probability that a mark will be 0.
+
+    pnan: float
+
+        Probability that a mark will be ``np.nan``.
+
+    distribution: fm.distributions.TruncatedNormal, NormalMixture, Beta, Empirical
+
+        Distribution of marks. If not provided, a normal distribution with ``mean`` and
+        ``std`` truncated to [0, 100] is used.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    Returns
+    -------
+    np.ndarray
+
+        Array of marks from [0, 100] range or ``np.nan``.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.marks(3, mean=65, std=10)  # doctest: +SKIP
+    array([71.52, 58.04, 63.87])
+    >>> dist = fm.distributions.NormalMixture(means=(45, 75), stds=(8, 6))
+    >>> fm.marks(3, distribution=dist, pfail=0.1)  # doctest: +SKIP
+    array([77.21,  0.  , 70.08])
+
+    """
+    rng = fmu.get_rng(rng)
+    if distribution is None:
+        distribution = fmd.TruncatedNormal(mean=mean, std=std)
+
+    res = np.round(distribution.sample(n, rng=rng), 2)
+    fail = rng.random(n) < pfail
+    res[fail] = 0.0
+    res[~fail & (rng.random(n) < pnan)] = np.nan
+
+    return res
+
+
+def feedback(rng=None):
     """Generate a random feedback.
 
-    The feedback is generated by Faker and consists of one paragraph.
+    The feedback consists of one paragraph assembled from the sentence pool
+    (``fm.pools.sentences()``). To generate many feedbacks, use ``feedback_batch``.
+
+    Parameters
+    ----------
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
 
     Returns
     -------
@@ -434,12 +712,115 @@ def feedback():
     ...
 
     """
-    return "\n\n".join(Faker().paragraphs(nb=1))
+    return feedback_batch(1, rng=rng)[0]
+
+
+def feedback_batch(n, min_sentences=1, max_sentences=4, rng=None):
+    """Generate ``n`` random feedbacks.
+
+    Each feedback is one paragraph of between ``min_sentences`` and ``max_sentences``
+    sentences drawn from the sentence pool (``fm.pools.sentences()``). All sentence
+    indices are drawn at once and all paragraphs are assembled with a single join.
+
+    Parameters
+    ----------
+    n: int
+
+        Number of feedbacks.
 
+    min_sentences: int, optional
 
-def student():
+        Minimum number of sentences in a feedback. It must be at least 1.
+
+    max_sentences: int, optional
+
+        Maximum number of sentences in a feedback.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    Returns
+    -------
+    np.ndarray
+
+        Object array of randomly generated feedbacks.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.feedback_batch(2)  # doctest: +SKIP
+    array(['Ability maybe hold. Yes test sure.', 'Behind gas.'], dtype=object)
+
+    """
+    if not 1 <= min_sentences <= max_sentences:
+        raise ValueError(
+            f"Invalid number of sentences: {min_sentences=}, {max_sentences=}."
+        )
+
+    rng = fmu.get_rng(rng)
+    corpus = fmp.sentences()
+
+    # Number of sentences in each feedback and indices of all sentences.
+    counts = rng.integers(min_sentences, max_sentences + 1, size=n)
+    chosen = corpus[rng.integers(len(corpus), size=counts.sum())]
+
+    # Interleave sentences with separators. Sentences within a feedback are separated
+    # by a space, whereas feedbacks are separated by a newline.
+    parts = np.full(2 * len(chosen), " ", dtype=object)
+    parts[0::2] = chosen
+    parts[2 * np.cumsum(counts) - 1] = "\n"
+
+    res = np.empty(n, dtype=object)
+    res[:] = "".join(parts.tolist()).split("\n")[:n]
+    return res
+
+
+def student(
+    emailval=None,
+    personal_emailval=None,
+    genderval=None,
+    countryval=None,
+    nameval=None,
+    rng=None,
+):
     """Generate a random student.
 
+    Emails can be passed via ``emailval`` and ``personal_emailval``, e.g. when they
+    were generated for the whole cohort in advance using ``emails``. Similarly, gender,
+    country and name can be passed via ``genderval``, ``countryval`` and ``nameval``,
+    e.g. when they were generated using ``names``. Otherwise, they are generated
+    randomly.
+
+    Parameters
+    ----------
+    emailval: str, optional
+
+        University email.
+
+    personal_emailval: str, optional
+
+        Personal email.
+
+    genderval: str, optional
+
+        Gender.
+
+    countryval: str, optional
+
+        Country.
+
+    nameval: str, optional
+
+        Name consistent with ``genderval`` and ``countryval``.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
     Returns
     -------
     Student
@@ -454,80 +835,407 @@ def student():
     Student(cid=...)
 
     """
-    # (Intermediate) values required for other fields.
-    genderval = gender(distribution=fmu.cohort_bias.gender)
-    courseval = course(distribution=fmu.cohort_bias.course)
-    countryval = country(bias=fmu.cohort_bias.country_bias)
-    first_name, *_, last_name = name(genderval=genderval, countryval=countryval).split()
-    usernameval = username(nameval=f"{first_name} {last_name}")
+    rng = fmu.get_rng(rng)
+
+    # (Intermediate) values required for other fields. Gender, course and country are
+    # sampled jointly, consistent with the given values.
+    given = {}
+    if genderval:
+        given["gender"] = [genderval]
+    if countryval:
+        given["nationality"] = [countryval]
+    bias = fmu.cohort_bias.sample(1, rng=rng, given=given)
+    genderval = str(bias["gender"][0])
+    courseval = str(bias["course"][0])
+    countryval = str(bias["nationality"][0])
+    nameval = nameval or name(genderval=genderval, countryval=countryval, rng=rng)
+    first_name, *_, last_name = nameval.split()
+    usernameval = username(nameval=f"{first_name} {last_name}", rng=rng)
 
     return fmu.Student(
-        cid=cid(),
+        cid=cid(rng=rng),
         gender=genderval,
         course=courseval,
         nationality=countryval,
         first_name=first_name,
         last_name=last_name,
-        title=title(genderval=genderval),
+        title=title(genderval=genderval, rng=rng),
         username=usernameval,
-        email=email(domainval="imperial.ac.uk"),
-        personal_email=email(),
+        email=emailval or email(domainval="imperial.ac.uk", rng=rng),
+        personal_email=personal_emailval or email(rng=rng),
         github=f"{courseval}-{usernameval}",
         fee_status="home" if countryval == "United Kingdom" else "overseas",
         enrollment_status="enrolled",
-        tutor=name(),
+        tutor=name(rng=rng),
     )
 
 
-def cohort(n):
+def cohort(
+    n,
+    rng=None,
+    threads=None,
+    backend="pandas",
+    columns=None,
+    n_tutors=None,
+    tutor_load=None,
+):
     """Generate a cohort of students.
 
+    Usernames and CIDs of students are unique. Cohorts are reproducible if a seed is
+    passed via ``rng`` (and the same number of ``threads`` and ``columns`` are used).
+    Names and tutors are drawn from pools of ``fm.pools.NAME_POOL_SIZE`` names per
+    locale and gender (see ``name``), so large cohorts have repeated names.
+    Students can be generated in several threads, which is faster on free-threaded
+    (no-GIL) builds of Python (see ``fm.Schema.generate``).
+
+    If ``columns`` are given, only them and the fields they depend on are generated,
+    e.g. usernames need names (see ``fm.Schema.select``). Expensive fields, such as
+    emails, are skipped unless they are selected.
+
+    If ``n_tutors`` is given, a department of ``n_tutors`` distinct tutors is drawn
+    once and students are assigned to them with vectorised draws, optionally balanced
+    by ``tutor_load``. The ``tutor`` column is then categorical.
+
     Parameters
     ----------
     n: int
 
         Number of students.
 
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    threads: int, optional
+
+        Number of threads. If not provided, students are generated in the calling
+        thread.
+
+    backend: str
+
+        Library of the returned dataframe: ``"pandas"`` (indexed by username),
+        ``"polars"`` or ``"pyarrow"`` (with the ``username`` column first).
+        Categorical columns are categorical or dictionary-encoded. ``"numpy"``
+        returns a structured array with fixed-width UTF-8 bytes fields and
+        categorical codes (see ``fm.schema.frame``).
+
+    columns: Iterable[str], optional
+
+        Columns of the cohort. The cohort is always indexed by ``username``. If not
+        provided, all columns are generated.
+
+    n_tutors: int, optional
+
+        Number of tutors. If not provided, each student's tutor is drawn from the
+        pool of names independently.
+
+    tutor_load: str, Sequence[float], optional
+
+        ``"balanced"`` to assign the same number of students (up to one, or up to
+        ``threads`` if ``threads`` is given) to each tutor, or relative loads of the
+        ``n_tutors`` tutors. If not provided, tutors are drawn uniformly.
+
     Returns
     -------
-    pd.DataFrame
+    pd.DataFrame, pl.DataFrame, pa.Table, np.ndarray
 
         A cohort dataframe.
 
+    Raises
+    ------
+    ValueError
+
+        If a column is not a column of the cohort, ``n_tutors`` is not between 1 and
+        the number of available tutor names or ``tutor_load`` is invalid.
+
     Examples
     --------
     >>> import fakeitmakeit as fm
     ...
     >>> fm.cohort(n=30)  # doctest: +SKIP
     ...
+    >>> fm.cohort(n=30, rng=42).equals(fm.cohort(n=30, rng=42))
+    True
+    >>> fm.cohort(n=30, rng=42, threads=4).equals(fm.cohort(n=30, rng=42, threads=4))
+    True
+    >>> fm.cohort(n=30, columns=["course"]).columns.tolist()
+    ['course']
+    >>> df = fm.cohort(n=30, n_tutors=3, tutor_load="balanced")
+    >>> df["tutor"].value_counts().tolist()
+    [10, 10, 10]
+
+    """
+    import fakeitmakeit.schema as fms
+
+    rng = fmu.get_rng(rng)
+
+    schema = fms.COHORT_SCHEMA
+    if n_tutors is not None:
+        tutors = _tutors(n_tutors, rng)
+        load = _tutor_load(tutor_load, n_tutors)
+        schema = schema.add(
+            fms.Column(
+                "tutor",
+                fms._tutor_column(tutors, load),
+                dtype="category",
+                categories=tuple(tutors),
+            )
+        )
+    elif tutor_load is not None:
+        raise ValueError("Tutor load requires the number of tutors.")
+    if columns is not None:
+        schema = schema.select(*columns)
+    return schema.generate(n, rng=rng, threads=threads, backend=backend)
+
+
+def _tutors(n_tutors, rng):
+    """Draw ``n_tutors`` distinct tutor names from the pool of names."""
+    pool = np.unique(fmp.names())
+    if not 1 <= n_tutors <= len(pool):
+        raise ValueError(
+            f"Number of tutors must be between 1 and {len(pool)}, not {n_tutors}."
+        )
+    return rng.choice(pool, size=n_tutors, replace=False).astype(object)
+
+
+def _tutor_load(tutor_load, n_tutors):
+    """Validate ``tutor_load`` and normalise relative loads to probabilities."""
+    if tutor_load is None or tutor_load == "balanced":
+        return tutor_load
+    elif isinstance(tutor_load, str):
+        raise ValueError(f"Unsupported tutor load {tutor_load!r}.")
+
+    load = np.asarray(tutor_load, dtype=float)
+    if load.shape != (n_tutors,) or (load < 0).any() or not load.sum() > 0:
+        raise ValueError(
+            f"Tutor load must be {n_tutors} non-negative values with a positive sum."
+        )
+    return load / load.sum()
+
+
+def extend_cohort(df, k, rng=None):
+    """Add ``k`` new students to a cohort.
+
+    New students are generated as in ``cohort``, but their usernames, CIDs and emails
+    are different from all usernames, CIDs and emails already in ``df``. Categories of
+    categorical columns are unioned, so they remain categorical. ``df`` is not
+    modified.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+
+        A cohort dataframe, e.g. generated with ``cohort``.
+
+    k: int
+
+        Number of new students.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    Returns
+    -------
+    pd.DataFrame
+
+        A cohort dataframe with ``len(df) + k`` students.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> df = fm.cohort(n=30)
+    >>> df = fm.extend_cohort(df, k=10)
+    >>> len(df)
+    40
+    >>> df.index.is_unique
+    True
 
     """
-    students = [student() for _ in range(n)]
-    return (
-        pd.DataFrame(
-            {
-                col.name: [getattr(student, col.name) for student in students]
-                for col in fields(fmu.Student)
-            }
+    import pandas as pd
+
+    import fakeitmakeit.schema as fms
+
+    if df.index.name != "username" or "cid" not in df.columns:
+        raise ValueError("Cohort must be indexed by username and have a cid column.")
+
+    taken = {
+        "username": df.index,
+        "cid": df["cid"],
+        **{col: set(df[col]) for col in fms._TAKEN_COLUMNS if col in df.columns},
+    }
+    new = fms._taking(fms.COHORT_SCHEMA, taken).generate(k, rng=rng, taken=taken)
+
+    # Categories of both cohorts are unioned so that concatenated columns remain
+    # categorical.
+    dtypes = {
+        col: pd.CategoricalDtype(
+            df[col].cat.categories.append(new[col].cat.categories).unique()
         )
-        .set_index("username", verify_integrity=True)
-        .astype(
-            {
-                "course": "category",
-                "gender": "category",
-                "title": "category",
-                "nationality": "category",
-                "fee_status": "category",
-                "enrollment_status": "category",
-            }
+        for col in new.select_dtypes("category").columns
+        if isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+    return pd.concat([df.astype(dtypes), new.astype(dtypes)], verify_integrity=True)
+
+
+def student_at(seed, i):
+    """Generate the ``i``-th student of the dataset with ``seed``.
+
+    The student is a pure function of ``seed`` and ``i``. Students are generated in
+    blocks of ``SLICE_BLOCK`` students, whose randomness comes from a counter-based
+    Philox generator keyed on ``(seed, block)``, so any student can be generated by
+    generating only its block. CID and username are derived from keyed permutations
+    of ``i``, so they are unique among all students of the dataset with the same
+    ``seed``. Generating many students one by one is therefore slow, whereas
+    ``cohort_slice`` generates each of their blocks once.
+
+    Parameters
+    ----------
+    seed: int
+
+        Seed of the dataset, ``0 <= seed < 2**64``.
+
+    i: int
+
+        Index of the student, ``0 <= i < MAX_STUDENTS``.
+
+    Returns
+    -------
+    Student
+
+        Student dataclass.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.student_at(42, 1000)
+    Student(cid=...)
+    >>> fm.student_at(42, 1000) == fm.student_at(42, 1000)
+    True
+
+    """
+    values = _slice(seed, i, i + 1)
+    return fmu.Student(
+        **{f.name: values[f.name][0] for f in dataclasses.fields(fmu.Student)}
+    )
+
+
+def cohort_slice(seed, start, stop):
+    """Generate students ``start`` to ``stop`` of the dataset with ``seed``.
+
+    Students are the same as the ones generated with ``student_at``, so slices of the
+    same dataset can be generated independently, e.g. on different machines, and
+    concatenated. Usernames and CIDs are unique across all slices with the same
+    ``seed``. Columns are generated block by block (see ``student_at``), so slices
+    are almost as fast as ``cohort`` (see ``benchmarks/bench_slice.py``).
+
+    Parameters
+    ----------
+    seed: int
+
+        Seed of the dataset, ``0 <= seed < 2**64``.
+
+    start: int
+
+        Index of the first student.
+
+    stop: int
+
+        Index after the last student.
+
+    Returns
+    -------
+    pd.DataFrame
+
+        A cohort dataframe.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    >>> import pandas as pd
+    ...
+    >>> df = fm.cohort_slice(42, 0, 20)
+    >>> shards = [fm.cohort_slice(42, 0, 10), fm.cohort_slice(42, 10, 20)]
+    >>> df.index.equals(pd.concat(shards).index)
+    True
+
+    """
+    import fakeitmakeit.schema as fms
+
+    return fms.COHORT_SCHEMA._frame(_slice(seed, start, stop), backend="pandas")
+
+
+def _slice(seed, start, stop):
+    """Columns of students ``start`` to ``stop`` of the dataset with ``seed``."""
+    import fakeitmakeit.schema as fms
+
+    indices = np.arange(start, max(start, stop))
+    if not 0 <= seed < 2**64:
+        raise ValueError(f"Invalid seed: {seed=}.")
+    if ((indices < 0) | (indices >= MAX_STUDENTS)).any():
+        raise ValueError(f"Student indices must be in range({MAX_STUDENTS}).")
+
+    # Blocks containing the students, at least one so that columns are not empty.
+    first = start // SLICE_BLOCK
+    last = (start + max(len(indices), 1) - 1) // SLICE_BLOCK
+    blocks = [
+        fms.COHORT_SCHEMA._columns(
+            SLICE_BLOCK,
+            np.random.Generator(np.random.Philox(key=[block, seed])),
+            {},
+            fms._run,
         )
+        for block in range(first, last + 1)
+    ]
+    offset = start - first * SLICE_BLOCK
+    res = {
+        f.name: np.concatenate([block[f.name] for block in blocks])[
+            offset : offset + len(indices)
+        ]
+        for f in dataclasses.fields(fmu.Student)
+    }
+
+    # Keys of CID and username permutations.
+    cid_key, username_key = np.random.SeedSequence(seed).generate_state(2, np.uint64)
+    cids = fmu.permute(indices, MAX_STUDENTS, int(cid_key)).tolist()
+    codes = fmu.permute(indices, USERNAME_CODES, int(username_key)).tolist()
+
+    res["cid"] = np.array(
+        [f"0{1 + v // 1_000_000}{v % 1_000_000:06d}" for v in cids], dtype=object
+    )
+    # The middle letter is optional and the number never starts with zero.
+    res["username"] = np.array(
+        [
+            f"{first_name[0]}{('', *string.ascii_lowercase)[code % 27]}"
+            f"{last_name[0]}{10 + code // 27}".casefold()
+            for first_name, last_name, code in zip(
+                res["first_name"], res["last_name"], codes, strict=True
+            )
+        ],
+        dtype=object,
     )
+    res["github"] = res["course"] + "-" + res["username"]
 
+    return res
 
-def assignment(usernames, mean=65, std=6, pfail=0.02, pnan=0.0):
+
+def assignment(
+    usernames,
+    mean=65,
+    std=6,
+    pfail=0.02,
+    pnan=0.0,
+    distribution=None,
+    rng=None,
+    backend="pandas",
+):
     """Generate an assignment.
 
-    For each username, a mark is generated using the ``mark`` function.
+    For each username, a mark is generated using the ``marks`` function.
 
     Parameters
     ----------
@@ -551,9 +1259,25 @@ def assignment(usernames, mean=65, std=6, pfail=0.02, pnan=0.0):
 
         Probability that the mark will be ``np.nan``.
 
+    distribution: fm.distributions.TruncatedNormal, NormalMixture, Beta, Empirical
+
+        Distribution of marks. If provided, ``mean`` and ``std`` are ignored.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    backend: str
+
+        Library of the returned assignment: ``"pandas"`` (a series indexed by
+        username), ``"polars"`` or ``"pyarrow"`` (a dataframe with ``username`` and
+        ``mark`` columns, where missing marks are null) or ``"numpy"`` (a structured
+        array with ``username`` and ``mark`` fields).
+
     Returns
     -------
-    pd.Series
+    pd.Series, pl.DataFrame, pa.Table, np.ndarray
 
         An assignment.
 
@@ -566,16 +1290,122 @@ def assignment(usernames, mean=65, std=6, pfail=0.02, pnan=0.0):
     abc123     67.9
     xyz321    73.08
     Name: mark, dtype: Float64
+    >>> fm.assignment(["abc123", "xyz321"], backend="polars")  # doctest: +SKIP
+    shape: (2, 2)
+    ...
 
     """
+    rng = fmu.get_rng(rng)
+
     usernames = list(usernames)
     invalid = [u for u in usernames if not fmiv.username(u)]
     if invalid:
         raise ValueError(f"Invalid usernames: {invalid}.")
 
+    values = marks(
+        len(usernames),
+        mean=mean,
+        std=std,
+        pfail=pfail,
+        pnan=pnan,
+        distribution=distribution,
+        rng=rng,
+    )
+
+    if backend != "pandas":
+        import fakeitmakeit.schema as fms
+
+        data = {"username": np.array(usernames, dtype=object), "mark": values}
+        return fms.frame(data, backend=backend)
+
+    import pandas as pd
+
     return pd.Series(
-        data=[mark(mean=mean, std=std, pfail=pfail, pnan=pnan) for _ in usernames],
+        data=values,
         index=pd.Index(usernames, name="username"),
         name="mark",
         dtype=np.float64,  # allow missing values
     )
+
+
+def gradebook(
+    usernames, n=5, mean=65, std=6, pfail=0.02, pnan=0.0, distribution=None, rng=None
+):
+    """Generate a gradebook.
+
+    A gradebook is a dataframe with one column per assignment. Columns are named
+    ``assignment1``, ``assignment2``, etc. and each of them is generated using the
+    ``assignment`` function.
+
+    Parameters
+    ----------
+    usernames: Iterable[str]
+
+        Iterable of usernames.
+
+    n: int
+
+        Number of assignments.
+
+    mean: float
+
+        Mean.
+
+    std: float
+
+        Standard deviation.
+
+    pfail: float
+
+        Probability that the mark will be 0.
+
+    pnan: float
+
+        Probability that the mark will be ``np.nan``.
+
+    distribution: fm.distributions.TruncatedNormal, NormalMixture, Beta, Empirical
+
+        Distribution of marks. If provided, ``mean`` and ``std`` are ignored.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    Returns
+    -------
+    pd.DataFrame
+
+        A gradebook.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.gradebook(["abc123", "xyz321"], n=2)  # doctest: +SKIP
+              assignment1  assignment2
+    username
+    abc123          67.90        61.13
+    xyz321          73.08        70.52
+
+    """
+    import pandas as pd
+
+    rng = fmu.get_rng(rng)
+    usernames = list(usernames)
+
+    return pd.DataFrame(
+        {
+            f"assignment{i}": assignment(
+                usernames,
+                mean=mean,
+                std=std,
+                pfail=pfail,
+                pnan=pnan,
+                distribution=distribution,
+                rng=rng,
+            )
+            for i in range(1, n + 1)
+        },
+        index=pd.Index(usernames, name="username"),
+    )
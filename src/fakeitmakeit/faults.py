@@ -0,0 +1,149 @@
+import numpy as np
+
+import fakeitmakeit.util as fmu
+
+# Kinds of faults and the columns they are injected into. Faults of kinds with
+# column ``None`` are injected into the index or the values of an assignment.
+KINDS = {
+    "email": "email",
+    "name": "first_name",
+    "country": "nationality",
+    "duplicate": None,
+    "mark": None,
+}
+
+# Countries which are not valid nationalities.
+UNKNOWN_COUNTRIES = ("Atlantis", "Narnia", "Neverland", "Wakanda")
+
+
+def corrupt(df, rate, kinds=None, rng=None):
+    """Inject invalid values into a cohort or an assignment.
+
+    Faults are injected into ``round(rate * len(df))`` randomly chosen rows, each of
+    which gets exactly one fault of a randomly chosen kind, so that it violates
+    exactly one of the rules checked by ``fm.isvalid.cohort`` or
+    ``fm.isvalid.assignment``:
+
+    - ``"email"``: ``@`` of ``email`` is replaced by ``" at "``.
+    - ``"name"``: ``first_name`` is lowercased.
+    - ``"country"``: ``nationality`` is replaced by an unknown country.
+    - ``"duplicate"``: username is replaced by the username of a row without faults.
+    - ``"mark"``: mark of an assignment is replaced by a value outside [0, 100].
+
+    Rows are chosen and faults are injected with vectorised operations on all rows
+    of the same kind at once, so large cohorts can be corrupted quickly.
+
+    Parameters
+    ----------
+    df: pd.DataFrame, pd.Series
+
+        Cohort generated by ``fm.cohort`` or assignment generated by
+        ``fm.assignment``. It is not modified.
+
+    rate: float
+
+        Fraction of rows with a fault, between 0 and 1.
+
+    kinds: Iterable[str], optional
+
+        Kinds of faults. Defaults to all kinds applicable to ``df``: ``"email"``,
+        ``"name"``, ``"country"`` and ``"duplicate"`` for cohorts and ``"mark"`` and
+        ``"duplicate"`` for assignments.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    Returns
+    -------
+    tuple[pd.DataFrame | pd.Series, pd.DataFrame]
+
+        Corrupted copy of ``df`` and the ground-truth mask, a boolean dataframe with
+        the index of the copy and one column per kind. It is ``True`` where a fault of
+        that kind was injected. Rows whose usernames were copied by ``"duplicate"``
+        faults are not marked.
+
+    Raises
+    ------
+    ValueError
+
+        If ``rate`` is not between 0 and 1, a kind is unknown or not applicable to
+        ``df``, or there are not enough rows without faults to copy usernames from.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> df, mask = fm.corrupt(fm.cohort(100, rng=0), rate=0.1, rng=0)
+    >>> int(mask.to_numpy().sum())
+    10
+    >>> fm.isvalid.cohort(df[~mask.any(axis=1).to_numpy()])
+    True
+
+    """
+    import pandas as pd
+
+    if not 0 <= rate <= 1:
+        raise ValueError(f"Rate {rate} is not between 0 and 1.")
+
+    is_series = isinstance(df, pd.Series)
+    applicable = [
+        kind
+        for kind, column in KINDS.items()
+        if kind == "duplicate"
+        or (kind == "mark" and is_series)
+        or (not is_series and column in df.columns)
+    ]
+    kinds = applicable if kinds is None else list(kinds)
+    invalid = [kind for kind in kinds if kind not in applicable]
+    if invalid:
+        raise ValueError(f"Fault kinds {invalid} are not applicable.")
+
+    rng = fmu.get_rng(rng)
+    n = len(df)
+    rows = rng.choice(n, size=round(rate * n), replace=False)
+    chosen = np.asarray(kinds)[rng.integers(len(kinds), size=len(rows))]
+
+    res = df.copy()
+    mask = np.zeros((n, len(kinds)), dtype=bool)
+    for i, kind in enumerate(kinds):
+        selected = np.sort(rows[chosen == kind])
+        mask[selected, i] = True
+        if kind == "duplicate":
+            clean = np.setdiff1d(np.arange(n), rows, assume_unique=True)
+            if len(clean) < len(selected):
+                raise ValueError("Not enough rows without faults to copy usernames.")
+            index = res.index.to_numpy(dtype=object, copy=True)
+            index[selected] = index[rng.choice(clean, len(selected), replace=False)]
+            res.index = pd.Index(index, name=res.index.name)
+        elif kind == "mark":
+            values = rng.uniform(1, 100, size=len(selected))
+            res.iloc[selected] = np.where(
+                rng.random(len(selected)) < 0.5, -values, 100 + values
+            )
+        else:
+            column = KINDS[kind]
+            values = res[column].iloc[selected].astype(object)
+            if kind == "email":
+                values = values.str.replace("@", " at ", n=1, regex=False)
+            elif kind == "name":
+                values = values.str.lower()
+            else:
+                values = np.asarray(UNKNOWN_COUNTRIES, dtype=object)[
+                    rng.integers(len(UNKNOWN_COUNTRIES), size=len(selected))
+                ]
+            _assign(res, column, selected, values)
+
+    return res, pd.DataFrame(mask, index=res.index, columns=kinds)
+
+
+def _assign(df, column, rows, values):
+    """Assign ``values`` to ``rows`` of ``column``, adding missing categories."""
+    import pandas as pd
+
+    values = np.asarray(values, dtype=object)
+    if isinstance(df[column].dtype, pd.CategoricalDtype):
+        missing = pd.unique(values[~np.isin(values, df[column].cat.categories)])
+        df[column] = df[column].cat.add_categories(missing)
+    df.iloc[rows, df.columns.get_loc(column)] = values
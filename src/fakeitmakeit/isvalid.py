@@ -1,12 +1,49 @@
+import collections
 import logging
+import math
 import numbers
 import re
 
-import numpy as np
-import pandas as pd
-
 import fakeitmakeit.util as fmu
 
+# Regular expressions of valid values. Values must match them fully.
+EMAIL_RE = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+USERNAME_RE = r"[a-z]{1,3}[1-9][0-9]{1,4}"
+CID_RE = r"0[0-9]{7}"
+TITLE_RE = r"(Mr|Ms|Mrs|Mx|Miss|Dr)"
+COURSE_RE = r"(acse|edsml|gems|ready)"
+GENDER_RE = r"(male|female|nonbinary)"
+FEE_STATUS_RE = r"(home|overseas|(home - elq))"
+
+# Names are words separated by spaces or hyphens. Words in brackets are allowed, too.
+_WORD_RE = r"[A-Z\u00C0-\u017F][a-z\u00C0-\u017F]"
+_ASCII_WORD_RE = r"[A-Z][a-z]"
+NAME_RE = rf"({_WORD_RE}*)([-\s](({_WORD_RE}*)|\({_WORD_RE}*\)))*"
+ASCII_NAME_RE = (
+    rf"({_ASCII_WORD_RE}*)([-\s](({_ASCII_WORD_RE}*)|\({_ASCII_WORD_RE}*\)))*"
+)
+
+# Regular expressions used to validate values of each data type in Arrow data.
+_PATTERNS = {
+    "username": USERNAME_RE,
+    "cid": CID_RE,
+    "name": NAME_RE,
+    "email": EMAIL_RE,
+    "title": TITLE_RE,
+    "course": COURSE_RE,
+    "gender": GENDER_RE,
+    "fee_status": FEE_STATUS_RE,
+}
+
+# Cohort columns which are not validated.
+_UNCHECKED_COLUMNS = {
+    "username",
+    "github",
+    "github_old",
+    "enrollment_status",
+    "comment",
+}
+
 
 def email(value):
     """Check if ``value`` is a valid email.
@@ -33,8 +70,7 @@ def email(value):
     False
 
     """
-    email_re = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-    return bool(re.fullmatch(email_re, value))
+    return bool(re.fullmatch(EMAIL_RE, value))
 
 
 def username(value):
@@ -63,8 +99,7 @@ def username(value):
 
     """
     # We allow 1-3 lowercase letters followed by 1-5 numbers - first number is never 0.
-    username_re = r"[a-z]{1,3}[1-9][0-9]{1,4}"
-    return bool(re.fullmatch(username_re, value))
+    return bool(re.fullmatch(USERNAME_RE, value))
 
 
 def cid(value):
@@ -92,8 +127,7 @@ def cid(value):
     False
 
     """
-    cid_re = r"0[0-9]{7}"
-    return bool(re.fullmatch(cid_re, value))
+    return bool(re.fullmatch(CID_RE, value))
 
 
 def name(value, allow_special_characters=True):
@@ -129,12 +163,7 @@ def name(value, allow_special_characters=True):
     False
 
     """
-    if allow_special_characters:
-        word = r"[A-Z\u00C0-\u017F][a-z\u00C0-\u017F]"
-    else:
-        word = r"[A-Z][a-z]"
-
-    name_re = rf"({word}*)([-\s](({word}*)|\({word}*\)))*"
+    name_re = NAME_RE if allow_special_characters else ASCII_NAME_RE
     return bool(re.fullmatch(name_re, value))
 
 
@@ -165,8 +194,7 @@ def title(value):
     False
 
     """
-    title_re = r"(Mr|Ms|Mrs|Mx|Miss|Dr)"
-    return bool(re.fullmatch(title_re, value))
+    return bool(re.fullmatch(TITLE_RE, value))
 
 
 def course(value):
@@ -194,8 +222,7 @@ def course(value):
     False
 
     """
-    course_re = r"(acse|edsml|gems|ready)"
-    return bool(re.fullmatch(course_re, value))
+    return bool(re.fullmatch(COURSE_RE, value))
 
 
 def gender(value):
@@ -223,8 +250,7 @@ def gender(value):
     False
 
     """
-    gender_re = r"(male|female|nonbinary)"
-    return bool(re.fullmatch(gender_re, value))
+    return bool(re.fullmatch(GENDER_RE, value))
 
 
 def fee_status(value):
@@ -254,8 +280,7 @@ def fee_status(value):
     False
 
     """
-    fee_status_re = r"(home|overseas|(home - elq))"
-    return bool(re.fullmatch(fee_status_re, value))
+    return bool(re.fullmatch(FEE_STATUS_RE, value))
 
 
 def country(value):
@@ -283,7 +308,12 @@ def country(value):
     False
 
     """
-    allowed_countries = set(fmu.COUNTRIES.keys()) | {
+    return value in _countries()
+
+
+def _countries():
+    """Return valid countries, including common alternative names."""
+    return set(fmu.COUNTRIES.keys()) | {
         "Taiwan",
         "Syria",
         "Columbia",
@@ -292,7 +322,6 @@ def country(value):
         "Russia",
         "Palestine",
     }
-    return value in allowed_countries
 
 
 def mark(value):
@@ -334,7 +363,7 @@ def mark(value):
     if not isinstance(value, numbers.Real):
         logging.warning(f"Invalid type {type(value)=}.")
         return False
-    elif not np.isnan(value) and not 0 <= value <= 100:
+    elif not math.isnan(value) and not 0 <= value <= 100:
         logging.warning(f"{value=} is not in [0, 100] range.")
         return False
     else:
@@ -353,9 +382,16 @@ def assignment(value, valid_usernames=None):
     5. Data values must be valid marks (``float`` in [0, 100] range or np.nan).
     6. If ``valid_usernames`` is provided, all usernames in index must be in it.
 
+    Arrow data (and polars dataframes, which are converted to Arrow without
+    copying), e.g. an assignment written to Parquet by pandas, must have a
+    ``username`` column and one numerical column of marks. It is validated with
+    ``pyarrow.compute`` batch by batch, so large Parquet files are never fully loaded
+    into memory.
+
     Parameters
     ----------
-    value: pd.Series
+    value: pd.Series, pyarrow.Table, pyarrow.RecordBatch, pyarrow.RecordBatchReader,
+        pyarrow.parquet.ParquetFile, pl.DataFrame
 
         Assignment. Index values are usernames and data are numerical marks.
 
@@ -382,8 +418,16 @@ def assignment(value, valid_usernames=None):
     ... )
     >>> fm.isvalid.assignment(value)
     True
+    >>> import pyarrow.parquet as pq  # doctest: +SKIP
+    >>> fm.isvalid.assignment(pq.ParquetFile("assignment.parquet"))  # doctest: +SKIP
+    True
 
     """
+    if _is_arrow(value):
+        return _arrow_assignment(_batches(value), valid_usernames)
+
+    import pandas as pd
+
     # Check that value is a pd.Series.
     if not isinstance(value, pd.Series):
         logging.warning(f"Invalid type {type(value)=} - pd.Series expected.")
@@ -415,11 +459,7 @@ def assignment(value, valid_usernames=None):
         return False
 
     if valid_usernames is not None:
-        valid_usernames = set(valid_usernames)
-        invalid = [u for u in valid_usernames if not username(u)]
-        if invalid:
-            raise ValueError(f"Invalid usernames in valid_username: {invalid}.")
-
+        valid_usernames = _valid_usernames(valid_usernames)
         valid = value.index.isin(valid_usernames)
         if not valid.all():
             logging.warning(f"Invalid usernames in index: {value.index[~valid]}.")
@@ -431,9 +471,15 @@ def assignment(value, valid_usernames=None):
 def cohort(value):
     """Check if ``value`` is a valid cohort.
 
+    Arrow data (and polars dataframes, which are converted to Arrow without
+    copying), e.g. a cohort written to Parquet by pandas, must have a ``username``
+    column. It is validated with ``pyarrow.compute`` batch by batch, so large Parquet
+    files are never fully loaded into memory.
+
     Parameters
     ----------
-    value: pd.DataFrame
+    value: pd.DataFrame, pyarrow.Table, pyarrow.RecordBatch, pyarrow.RecordBatchReader,
+        pyarrow.parquet.ParquetFile, pl.DataFrame
 
         Cohort.
 
@@ -443,7 +489,20 @@ def cohort(value):
 
         ``True`` if valid, otherwise ``False``.
 
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.isvalid.cohort(fm.cohort(10))
+    True
+    >>> import pyarrow.parquet as pq  # doctest: +SKIP
+    >>> fm.isvalid.cohort(pq.ParquetFile("cohort.parquet"))  # doctest: +SKIP
+    True
+
     """
+    if _is_arrow(value):
+        return _arrow_cohort(_batches(value))
+
     # Check that indicies are valid usernames.
     if not value.index.map(username).all():
         invalid = value.index[~value.index.map(username)]
@@ -464,27 +523,162 @@ def cohort(value):
         return False
 
     # Check other columns.
-    for col in set(value.columns) - {
-        "username",
-        "github",
-        "github_old",
-        "enrollment_status",
-        "comment",
-    }:
-        if "name" in col or col == "tutor":
-            data_type = "name"
-        elif "email" in col:
-            data_type = "email"
-        elif col == "nationality":
-            data_type = "country"
-        else:
-            data_type = col
-
-        # print(col, data_type)
-
-        validation_function = globals()[f"{data_type}"]
-        if not value[col].map(validation_function).all():
-            invalid = value[col][~value[col].map(validation_function)]
+    for col in set(value.columns) - _UNCHECKED_COLUMNS:
+        validation_function = globals()[_data_type(col)]
+        # Mapping categorical columns can give categorical results, which cannot be
+        # reduced with all, so values are mapped as objects.
+        valid = value[col].astype(object).map(validation_function).astype(bool)
+        if not valid.all():
+            invalid = value[col][~valid]
             logging.warning(f'Errors in column "{col}": {invalid.tolist()}.')
             return False
     return True
+
+
+def _data_type(column):
+    """Return the data type of cohort ``column`` (its validation function name)."""
+    if "name" in column or column == "tutor":
+        return "name"
+    elif "email" in column:
+        return "email"
+    elif column == "nationality":
+        return "country"
+    else:
+        return column
+
+
+def _valid_usernames(values):
+    """Set of ``values``, raising ``ValueError`` if any of them is invalid."""
+    values = set(values)
+    invalid = [u for u in values if not username(u)]
+    if invalid:
+        raise ValueError(f"Invalid usernames in valid_username: {invalid}.")
+    return values
+
+
+def _is_arrow(value):
+    """Check if ``value`` is a pyarrow or polars object without importing them."""
+    return type(value).__module__.split(".")[0] in {"pyarrow", "polars"}
+
+
+def _batches(value):
+    """Iterate over record batches of a pyarrow table, batch, reader or Parquet file."""
+    if type(value).__module__.startswith("polars"):
+        return value.to_arrow().to_batches()
+    elif hasattr(value, "iter_batches"):
+        # Parquet files are read one batch at a time.
+        return value.iter_batches()
+    elif hasattr(value, "to_batches"):
+        return value.to_batches()
+    elif hasattr(value, "read_next_batch"):
+        return value
+    else:
+        return [value]
+
+
+def _arrow_valid(data_type, array):
+    """Boolean pyarrow array, ``True`` where values of ``array`` are valid."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if pa.types.is_dictionary(array.type):
+        # Only the dictionary is validated, e.g. categories of categorical columns.
+        valid = _arrow_valid(data_type, array.dictionary).take(array.indices)
+        return valid if data_type == "mark" else valid.fill_null(False)
+
+    if data_type == "mark":
+        if not (pa.types.is_integer(array.type) or pa.types.is_floating(array.type)):
+            return pa.array([False] * len(array))
+        values = pc.cast(array, pa.float64())
+        in_range = pc.and_(pc.greater_equal(values, 0), pc.less_equal(values, 100))
+        # Missing marks (NaN or null) are valid.
+        return pc.or_(pc.is_nan(values), in_range).fill_null(True)
+
+    if not (pa.types.is_string(array.type) or pa.types.is_large_string(array.type)):
+        return pa.array([False] * len(array))
+    elif data_type == "country":
+        valid = pc.is_in(array, value_set=pa.array(sorted(_countries())))
+    else:
+        # Arrow uses RE2, which writes Unicode code points as \x{...}.
+        pattern = re.sub(r"\\u([0-9A-Fa-f]{4})", r"\\x{\1}", _PATTERNS[data_type])
+        valid = pc.match_substring_regex(array, f"^(?:{pattern})$")
+    return valid.fill_null(False)
+
+
+def _arrow_invalid(data_type, array):
+    """Invalid values of ``array`` or an empty list if all are valid."""
+    import pyarrow.compute as pc
+
+    return array.filter(pc.invert(_arrow_valid(data_type, array))).to_pylist()
+
+
+def _arrow_usernames(batch, seen):
+    """Check usernames of ``batch`` and add them to ``seen`` usernames."""
+    if "username" not in batch.schema.names:
+        logging.warning("Missing 'username' column.")
+        return False
+
+    usernames = batch.column("username")
+    if invalid := _arrow_invalid("username", usernames):
+        logging.warning(f"Invalid usernames: {invalid}")
+        return False
+
+    values = usernames.to_pylist()
+    new = set(values)
+    if len(new) < len(values) or not seen.isdisjoint(new):
+        duplicated = [u for u, n in collections.Counter(values).items() if n > 1]
+        duplicated += sorted(seen & new)
+        logging.warning(f"There are duplicate usernames: {duplicated}.")
+        return False
+    seen |= new
+
+    return True
+
+
+def _arrow_cohort(batches):
+    """Check if Arrow ``batches`` are a valid cohort (see ``cohort``)."""
+    seen = set()
+    for batch in batches:
+        if not _arrow_usernames(batch, seen):
+            return False
+
+        for col in set(batch.schema.names) - _UNCHECKED_COLUMNS:
+            if invalid := _arrow_invalid(_data_type(col), batch.column(col)):
+                logging.warning(f'Errors in column "{col}": {invalid}.')
+                return False
+
+    return True
+
+
+def _arrow_assignment(batches, valid_usernames=None):
+    """Check if Arrow ``batches`` are a valid assignment (see ``assignment``)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if valid_usernames is not None:
+        valid_usernames = pa.array(sorted(_valid_usernames(valid_usernames)))
+
+    seen = set()
+    for batch in batches:
+        if not _arrow_usernames(batch, seen):
+            return False
+
+        columns = [name for name in batch.schema.names if name != "username"]
+        if len(columns) != 1:
+            logging.warning(
+                f"Invalid columns {columns} - one column of marks expected."
+            )
+            return False
+        if invalid := _arrow_invalid("mark", batch.column(columns[0])):
+            logging.warning(f"Invalid marks: {invalid}.")
+            return False
+
+        if valid_usernames is not None:
+            usernames = batch.column("username")
+            valid = pc.is_in(usernames, value_set=valid_usernames)
+            if not pc.all(valid).as_py():
+                invalid = usernames.filter(pc.invert(valid)).to_pylist()
+                logging.warning(f"Invalid usernames in index: {invalid}.")
+                return False
+
+    return True
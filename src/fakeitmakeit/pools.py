@@ -0,0 +1,435 @@
+import functools
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import pathlib
+import re
+import tempfile
+import threading
+
+import numpy as np
+
+import fakeitmakeit.isvalid as fmiv
+import fakeitmakeit.util as fmu
+
+# Pool sizes. Pools are generated once per process and reused by batch generators.
+# Name pools bound the number of distinct names per locale and gender, but larger
+# pools take longer to generate before they are cached.
+NAME_POOL_SIZE = 2000
+USER_NAME_POOL_SIZE = 2000
+DOMAIN_POOL_SIZE = 200
+SENTENCE_POOL_SIZE = 5000
+
+# Pools are generated with a seeded Faker instance so they are the same in every
+# process and reproducible.
+POOL_SEED = 0
+
+# Version of the on-disk cache format. Increase it whenever the way pools are
+# generated changes so that the stale pools are not used.
+CACHE_VERSION = 7
+
+# Names which do not pass validation are replaced by names from the default Faker
+# locale. At most NAME_RETRIES replacement names are tried for each rejected name.
+NAME_RETRIES = 100
+
+# If more than REJECTION_THRESHOLD of the first REJECTION_MIN_SAMPLES names of a locale
+# are rejected, the remaining names of the pool are generated by the default locale
+# directly.
+REJECTION_THRESHOLD = 0.9
+REJECTION_MIN_SAMPLES = 20
+
+# The constants above are read when ``cache_key`` is first computed and pools are
+# memoised with ``functools.cache``, so changes made after the first pool was loaded
+# in the process have no effect. Set them before generating any data, or clear the
+# memoised values with ``cache_clear`` of ``cache_key`` and the pool functions, e.g.
+# ``fm.pools.names.cache_clear()``.
+
+# Rejection statistics of name pools generated in this process.
+_rejections = {}
+
+
+def cache_dir():
+    """Directory of the on-disk pool cache.
+
+    The directory can be set with the ``FAKEITMAKEIT_CACHE_DIR`` environment variable.
+    Otherwise, ``fakeitmakeit`` directory in ``XDG_CACHE_HOME`` (``~/.cache`` by
+    default) is used.
+
+    Returns
+    -------
+    pathlib.Path
+
+        Cache directory.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.pools.cache_dir()  # doctest: +SKIP
+    PosixPath('/home/user/.cache/fakeitmakeit')
+
+    """
+    if path := os.environ.get("FAKEITMAKEIT_CACHE_DIR"):
+        return pathlib.Path(path)
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(xdg_cache_home) / "fakeitmakeit"
+
+
+@functools.cache
+def cache_key():
+    """Key of the on-disk pool cache.
+
+    The key is a hash of everything the pools depend on: cache format version, Faker
+    version, country-locale mapping, pool sizes, seed and rejection parameters. Pools
+    are stored in a separate subdirectory for each key, so changing any of them
+    invalidates the cache.
+
+    Returns
+    -------
+    str
+
+        Cache key.
+
+    """
+    state = {
+        "cache_version": CACHE_VERSION,
+        "faker": importlib.metadata.version("faker"),
+        "country_locale": fmu.COUNTRY_LOCALE,
+        "sizes": [NAME_POOL_SIZE, USER_NAME_POOL_SIZE, DOMAIN_POOL_SIZE],
+        "seed": POOL_SEED,
+        "rejection": [NAME_RETRIES, REJECTION_THRESHOLD, REJECTION_MIN_SAMPLES],
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()[:16]
+
+
+# Faker instances of the current thread and the lock serialising pool generation.
+_local = threading.local()
+_lock = threading.Lock()
+
+
+def _cached(name, generate):
+    """Load pool ``name`` from the on-disk cache.
+
+    If the pool is not in the cache, it is generated by calling ``generate`` and
+    saved. Pools are memory-mapped read-only, so that all processes using the same
+    pool share its pages. If the cache is not writable, the generated pool is returned
+    without caching. Pools are generated by one thread at a time, so threads asking
+    for the same missing pool generate it once.
+
+    """
+    path = cache_dir() / f"pools-{cache_key()}" / f"{name}.npy"
+    with _lock:
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            # The pool is missing or corrupted.
+            return _save(name, path, generate())
+
+
+def _save(name, path, pool):
+    """Save ``pool`` to ``path`` and return it memory-mapped."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and rename it so that other processes never read
+        # a partially written pool.
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as f:
+            np.save(f, pool)
+        os.replace(f.name, path)
+    except OSError as e:
+        logging.warning(f"Pool {name!r} could not be cached: {e}")
+        return pool
+
+    return np.load(path, mmap_mode="r")
+
+
+@functools.cache
+def names(locale=None, gender=None):
+    """Pool of validated names.
+
+    Names are generated by Faker for the given ``locale`` and ``gender``. Romanized
+    names are used if the locale has them. Otherwise, if the locale does not have names
+    for the given gender, names of any gender are generated. Suffixes and prefixes,
+    e.g. Mr or PhD, are removed and names are transliterated to ASCII (see
+    ``fm.util.transliterate``). Names which do not pass ``fm.isvalid.name`` without
+    special characters are replaced by names of the same gender from the default Faker
+    locale, seeded differently for each pool. Locales whose names are mostly rejected
+    are routed to the default locale directly (see ``rejection_stats``).
+
+    Parameters
+    ----------
+    locale: str, optional
+
+        Faker locale. If not provided, the default Faker locale is used.
+
+    gender: str, optional
+
+        Gender.
+
+    Returns
+    -------
+    np.ndarray
+
+        Array of names.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.pools.names("de_DE", "female")  # doctest: +SKIP
+    memmap(['Anna Schmidt', ...], dtype='<U26')
+
+    """
+    return _cached(_pool_name(locale, gender), lambda: _generate_names(locale, gender))
+
+
+def _generate_names(locale, gender):
+    """Generate a pool of ``NAME_POOL_SIZE`` validated names."""
+    fake = _faker(locale)
+    fake.seed_instance(POOL_SEED)
+    fallback = _faker(None)
+    # Each pool has its own fallback names, so that pools of rejected locales differ.
+    fallback.seed_instance(_pool_seed(locale, gender))
+
+    # Romanized is available only for some countries.
+    romanized = hasattr(fake, "romanized_name")
+    # Depending on the gender, we call the appropriate method from Faker.
+    method = f"name_{gender}" if gender is not None else "name"
+
+    stats = {"attempts": 0, "rejected": 0, "routed": 0, "retries": 0}
+    pool = []
+    for _ in range(NAME_POOL_SIZE):
+        if (
+            stats["attempts"] >= REJECTION_MIN_SAMPLES
+            and stats["rejected"] > REJECTION_THRESHOLD * stats["attempts"]
+        ):
+            # Most names of the locale are rejected, so the locale is skipped.
+            stats["routed"] += 1
+            res = None
+        elif romanized:
+            res = fake.romanized_name()
+        else:
+            # Not all countries have names for different genders.
+            try:
+                res = getattr(fake, method)()
+            except AttributeError:
+                res = fake.name()
+            res = _strip_titles(res)
+
+        if res is not None:
+            # Names are transliterated to ASCII, so that names with diacritics and
+            # in other scripts are kept instead of rejected.
+            res = fmu.transliterate(res)
+            stats["attempts"] += 1
+            stats["rejected"] += not _valid(res)
+
+        # If the name is not valid, then we generate a new one with default faker until
+        # it passes validation.
+        retries = 0
+        while res is None or not _valid(res):
+            if retries == NAME_RETRIES:
+                raise RuntimeError(
+                    f"No valid name for {locale=} after {NAME_RETRIES} retries."
+                )
+            retries += 1
+            res = _strip_titles(getattr(fallback, method)())
+        stats["retries"] += retries
+
+        pool.append(res)
+
+    name = _pool_name(locale, gender)
+    _rejections[name] = {"locale": locale or "default", "gender": gender, **stats}
+    _save_stats(name, _rejections[name])
+
+    return np.array(pool)
+
+
+def _valid(name):
+    """Whether ``name`` is valid and has both first and last names."""
+    # Stripping titles can leave a single name, e.g. of a king "Hannah VI".
+    return len(name.split()) > 1 and fmiv.name(name, allow_special_characters=False)
+
+
+def _strip_titles(name):
+    """Remove suffixes and prefixes - Mr, PhD, words with dots and all caps."""
+    # This is not exhaustive and some names might still contain some of these.
+    pattern = r"\b(?:[A-Z]+\b|PhD|Dr\(a\)|,|Dr|Mr|Mrs|Ms|Miss|\w*\.\w*)"
+    return re.sub(pattern, "", name).strip()
+
+
+def _pool_seed(locale, gender):
+    """Seed of the fallback names of the pool of names for ``locale`` and ``gender``."""
+    state = json.dumps([POOL_SEED, locale, gender]).encode()
+    return int.from_bytes(hashlib.sha256(state).digest()[:8], "little")
+
+
+def _pool_name(locale, gender):
+    """Name of the cached pool of names for ``locale`` and ``gender``."""
+    return f"names-{locale or 'default'}-{gender or 'any'}"
+
+
+def _save_stats(name, stats):
+    """Save rejection statistics of pool ``name`` next to the cached pool."""
+    path = cache_dir() / f"pools-{cache_key()}" / f"{name}.json"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(stats))
+    except OSError as e:
+        logging.warning(f"Rejection statistics of {name!r} could not be cached: {e}")
+
+
+def rejection_stats():
+    """Name rejection statistics per locale.
+
+    Statistics of all name pools generated in this process or stored in the on-disk
+    cache are summed over genders for each locale:
+
+    - ``attempts``: names generated by the locale,
+    - ``rejected``: names which did not pass validation,
+    - ``routed``: names generated by the default locale directly, because the locale's
+      rejection rate exceeded ``REJECTION_THRESHOLD``,
+    - ``retries``: names generated by the default locale to replace rejected names,
+    - ``rate``: ``rejected / attempts``.
+
+    Returns
+    -------
+    dict
+
+        Keys are locales and values are dictionaries of statistics.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> _ = fm.pools.names("he_IL", "female")
+    >>> fm.pools.rejection_stats()["he_IL"]  # doctest: +SKIP
+    {'attempts': 20, 'rejected': 20, 'routed': 280, 'retries': 310, 'rate': 1.0}
+
+    """
+    pools = {}
+    for path in (cache_dir() / f"pools-{cache_key()}").glob("names-*.json"):
+        try:
+            pools[path.stem] = json.loads(path.read_text())
+        except (OSError, ValueError):
+            # The statistics are missing or corrupted.
+            continue
+    pools |= _rejections
+
+    res = {}
+    keys = ["attempts", "rejected", "routed", "retries"]
+    for stats in pools.values():
+        total = res.setdefault(stats["locale"], dict.fromkeys(keys, 0))
+        for key in keys:
+            total[key] += stats[key]
+    for total in res.values():
+        total["rate"] = total["rejected"] / max(total["attempts"], 1)
+
+    return dict(sorted(res.items()))
+
+
+def _faker(locale):
+    """Faker instance for ``locale`` shared by pool generators of the current thread.
+
+    Creating Faker instances is expensive, so one instance per locale and thread is
+    reused. Faker instances are not thread-safe, so threads do not share them. It has
+    to be seeded with ``seed_instance`` before a pool is generated.
+
+    """
+    from faker import Faker
+
+    if not hasattr(_local, "fakers"):
+        _local.fakers = {}
+    if locale not in _local.fakers:
+        _local.fakers[locale] = Faker(locale)
+    return _local.fakers[locale]
+
+
+@functools.cache
+def user_names():
+    """Pool of user names.
+
+    User names are generated by Faker and can be used as local parts of emails. Only
+    unique user names that form a valid email are kept. The pool is stored in the
+    on-disk cache (see ``cache_dir``).
+
+    Returns
+    -------
+    np.ndarray
+
+        Array of unique user names.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.pools.user_names()  # doctest: +SKIP
+    array(['aaron08', 'aaron10', ...], dtype='<U19')
+
+    """
+    return _cached("user_names", _generate_user_names)
+
+
+def _generate_user_names():
+    """Generate a pool of unique user names."""
+    fake = _faker(None)
+    fake.seed_instance(POOL_SEED)
+    pool = {fake.user_name() for _ in range(USER_NAME_POOL_SIZE)}
+    return np.array(sorted(u for u in pool if fmiv.email(f"{u}@example.com")))
+
+
+@functools.cache
+def domains():
+    """Pool of email domains.
+
+    The pool is stored in the on-disk cache (see ``cache_dir``).
+
+    Returns
+    -------
+    np.ndarray
+
+        Array of unique domain names.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.pools.domains()  # doctest: +SKIP
+    array(['abbott.com', 'acosta.biz', ...], dtype='<U23')
+
+    """
+    return _cached("domains", _generate_domains)
+
+
+def _generate_domains():
+    """Generate a pool of unique domain names."""
+    fake = _faker(None)
+    fake.seed_instance(POOL_SEED)
+    pool = {fake.domain_name() for _ in range(DOMAIN_POOL_SIZE)}
+    return np.array(sorted(d for d in pool if fmiv.email(f"user@{d}")))
+
+
+@functools.cache
+def sentences():
+    """Pool of sentences.
+
+    Sentences are generated by Faker and used as a corpus for feedback text. Unlike
+    other pools, sentences are not stored in the on-disk cache.
+
+    Returns
+    -------
+    np.ndarray
+
+        Object array of sentences.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.pools.sentences()  # doctest: +SKIP
+    array(['Ability maybe hold.', ...], dtype=object)
+
+    """
+    fake = _faker(None)
+    fake.seed_instance(POOL_SEED)
+    return np.array(fake.sentences(nb=SENTENCE_POOL_SIZE), dtype=object)
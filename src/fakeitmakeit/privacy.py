@@ -0,0 +1,298 @@
+import hashlib
+
+import numpy as np
+
+import fakeitmakeit.factory as fmf
+import fakeitmakeit.isvalid as fmiv
+import fakeitmakeit.pools as fmp
+import fakeitmakeit.util as fmu
+
+# Maximum number of memoised hashes. The memo table is cleared when it is full.
+MEMO_SIZE = 1_000_000
+
+# Regular expressions validating the columns with identities of students.
+IDENTITY_COLUMNS = {
+    "cid": fmiv.CID_RE,
+    "first_name": fmiv.NAME_RE,
+    "last_name": fmiv.NAME_RE,
+    "email": fmiv.EMAIL_RE,
+    "personal_email": fmiv.EMAIL_RE,
+    "tutor": fmiv.NAME_RE,
+}
+
+# Memo table of keyed hashes: (key, field, value) -> hash. It holds the original
+# values, so it is cleared with ``clear``.
+_memo = {}
+
+
+def pseudonymise(df, key):
+    """Replace identities of students in a real cohort with fake ones.
+
+    Replacement values are derived from keyed hashes of the original values, so they
+    are consistent across dataframes pseudonymised with the same ``key``: the same
+    real username is always mapped to the same fake username, CID, name and emails.
+    Without the key, the original values cannot be recovered.
+
+    - Usernames and CIDs are mapped by keyed permutations, so they remain unique and
+      keep their format, e.g. the number of letters and digits of usernames.
+    - Names are drawn from name pools of students' nationality and gender (if the
+      cohort has ``nationality`` and ``gender`` columns).
+    - Tutors are mapped to names of the default name pool selected by their keyed
+      hashes, so a tutor has the same fake name in every dataframe. If two tutors
+      select the same name, the tutor with the larger hash takes the next free name
+      instead, so different tutors never share a fake name, but the fake name of
+      that tutor depends on which other tutors are in the dataframe.
+    - University emails keep their domain and use fake usernames, personal emails use
+      pooled user names and domains. ``github`` is built from the course (if the
+      cohort has a ``course`` column) and the fake username.
+
+    Other columns are not modified. Hashes are memoised, so repeated values cost a
+    single lookup. The memo table holds the original values until ``clear`` is
+    called.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+
+        A cohort dataframe indexed by username. Identity columns which are present
+        (``cid``, ``first_name``, ``last_name``, ``email``, ``personal_email`` and
+        ``tutor``) are validated with ``fm.isvalid``.
+
+    key: str, bytes
+
+        Secret key.
+
+    Returns
+    -------
+    pd.DataFrame
+
+        Pseudonymised cohort.
+
+    Raises
+    ------
+    ValueError
+
+        If the cohort is not indexed by valid usernames, identity columns contain
+        invalid values or there are more tutors than names in the default name pool.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> df = fm.cohort(n=10)
+    >>> res = fm.pseudonymise(df, key="secret")
+    >>> res.index.equals(fm.pseudonymise(df, key="secret").index)
+    True
+    >>> res["course"].tolist() == df["course"].tolist()
+    True
+
+    """
+    import pandas as pd
+
+    key = hashlib.sha256(key.encode() if isinstance(key, str) else key).digest()
+
+    if df.index.name != "username":
+        raise ValueError("Cohort must be indexed by username.")
+    _validate("username", df.index, fmiv.USERNAME_RE)
+    for col, pattern in IDENTITY_COLUMNS.items():
+        if col in df.columns:
+            _validate(col, df[col], pattern)
+
+    usernames = df.index.to_numpy(dtype=object)
+    fake_usernames = _map(usernames, lambda v: _permute_usernames(v, key))
+    hashes = _hashes(key, "username", usernames)
+
+    res = df.copy()
+    res.index = pd.Index(fake_usernames, name="username")
+
+    if "cid" in df.columns:
+        res["cid"] = _map(
+            df["cid"].to_numpy(dtype=object), lambda v: _permute_cids(v, key)
+        )
+
+    if {"first_name", "last_name"} & set(df.columns):
+        names = _names(df, hashes)
+        if "first_name" in df.columns:
+            res["first_name"] = [name.split()[0] for name in names]
+        if "last_name" in df.columns:
+            res["last_name"] = [name.split()[-1] for name in names]
+
+    if "email" in df.columns:
+        res["email"] = [
+            f"{username}@{email.rsplit('@', 1)[1]}"
+            for username, email in zip(fake_usernames, df["email"], strict=True)
+        ]
+
+    if "personal_email" in df.columns:
+        user_names, domains = fmp.user_names(), fmp.domains()
+        # Independent bits of the hash select the user name and the domain.
+        user_name = user_names[(hashes >> np.uint64(16)) % np.uint64(len(user_names))]
+        domain = domains[(hashes >> np.uint64(40)) % np.uint64(len(domains))]
+        res["personal_email"] = [
+            f"{u}.{username}@{d}"
+            for u, username, d in zip(
+                user_name.tolist(), fake_usernames, domain.tolist(), strict=True
+            )
+        ]
+
+    if "github" in df.columns:
+        # GitHub handles are derived from fake usernames, so that no part of the real
+        # handle is kept.
+        res["github"] = (
+            fake_usernames
+            if "course" not in df.columns
+            else [
+                f"{course}-{username}"
+                for course, username in zip(df["course"], fake_usernames, strict=True)
+            ]
+        )
+
+    if "tutor" in df.columns:
+        res["tutor"] = _map(
+            df["tutor"].to_numpy(dtype=object), lambda v: _permute_tutors(v, key)
+        )
+
+    return res
+
+
+def clear():
+    """Clear memoised hashes and the original values they were computed from.
+
+    ``pseudonymise`` memoises hashes of real identities in memory. Clearing the memo
+    table removes the identities from it once they are no longer pseudonymised.
+
+    """
+    _memo.clear()
+
+
+def _names(df, hashes):
+    """Fake names selected from name pools by ``hashes``."""
+    if {"gender", "nationality"} <= set(df.columns):
+        groups = fmf._name_pools(df["gender"], df["nationality"])
+    else:
+        groups = [(np.arange(len(df)), fmp.names())]
+
+    res = np.empty(len(df), dtype=object)
+    for rows, pool in groups:
+        res[rows] = pool[hashes[rows] % np.uint64(len(pool))].tolist()
+    return res
+
+
+def _validate(name, values, pattern):
+    """Raise ``ValueError`` if any of ``values`` of column ``name`` is invalid.
+
+    Values are valid if they fully match ``pattern`` from ``fm.isvalid``.
+
+    """
+    import pandas as pd
+
+    unique = pd.Series(pd.unique(np.asarray(values, dtype=object)), dtype=object)
+    invalid = unique[~unique.str.fullmatch(pattern).fillna(False).astype(bool)]
+    if len(invalid):
+        raise ValueError(f"Invalid values in column {name!r}: {invalid[:10].tolist()}.")
+
+
+def _map(values, function):
+    """Apply vectorised ``function`` to unique ``values`` and map results back."""
+    import pandas as pd
+
+    codes, unique = pd.factorize(values)
+    return np.asarray(function(np.asarray(unique, dtype=object)), dtype=object)[codes]
+
+
+def _hashes(key, field, values):
+    """Keyed 64-bit hashes of ``values`` of ``field``."""
+    if len(_memo) + len(values) > MEMO_SIZE:
+        _memo.clear()
+
+    res = np.empty(len(values), dtype=np.uint64)
+    for i, value in enumerate(values):
+        if (h := _memo.get((key, field, value))) is None:
+            digest = hashlib.blake2b(
+                f"{field}:{value}".encode(), key=key, digest_size=8
+            ).digest()
+            h = _memo[key, field, value] = int.from_bytes(digest, "little")
+        res[i] = h
+    return res
+
+
+def _key(key, field):
+    """Key of the permutation of ``field`` derived from the secret ``key``."""
+    digest = hashlib.blake2b(field.encode(), key=key, digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _permute_usernames(usernames, key):
+    """Map usernames to fake usernames with the same number of letters and digits."""
+    import pandas as pd
+
+    parts = pd.Series(usernames, dtype=object).str.extract(r"([a-z]+)([0-9]+)")
+    letters = parts[0].to_numpy(dtype=str)
+    numbers = parts[1].to_numpy(dtype=str)
+    n_letters = np.strings.str_len(letters)
+    n_digits = np.strings.str_len(numbers)
+    # Letters a-z are digits 0-25 of base-26 numbers.
+    chars = np.array(letters, dtype="S3").view(np.uint8).reshape(-1, 3) - ord("a")
+    numbers = numbers.astype(np.int64)
+
+    res = np.empty(len(usernames), dtype=object)
+    for n_l, n_d in set(zip(n_letters.tolist(), n_digits.tolist(), strict=True)):
+        rows = (n_letters == n_l) & (n_digits == n_d)
+
+        # Usernames with n_l letters and n_d digits (the first digit is never zero)
+        # are numbered and the numbers are permuted.
+        n_numbers = 9 * 10 ** (n_d - 1)
+        values = numbers[rows] - 10 ** (n_d - 1)
+        for i in range(n_l):
+            values += chars[rows, i].astype(np.int64) * 26 ** (n_l - 1 - i) * n_numbers
+        values = fmu.permute(
+            values, 26**n_l * n_numbers, _key(key, f"username-{n_l}-{n_d}")
+        ).astype(np.int64)
+
+        values, fake_numbers = np.divmod(values, n_numbers)
+        fake_chars = np.empty((len(values), n_l), dtype=np.uint8)
+        for i in reversed(range(n_l)):
+            values, fake_chars[:, i] = np.divmod(values, 26)
+        fake_letters = (fake_chars + ord("a")).view(f"S{n_l}").ravel().astype(str)
+        res[rows] = np.strings.add(
+            fake_letters, (fake_numbers + 10 ** (n_d - 1)).astype(str)
+        ).tolist()
+
+    return res
+
+
+def _permute_tutors(tutors, key):
+    """Map unique ``tutors`` to distinct names of the default name pool."""
+    pool = fmp.names()
+    if len(tutors) > len(pool):
+        raise ValueError(f"There are more than {len(pool)} tutors.")
+
+    # Each tutor takes the pool index of its own keyed hash. Tutors are placed in
+    # order of their hashes and a tutor whose index is already taken takes the next
+    # free index, so only colliding tutors depend on the other tutors.
+    hashes = _hashes(key, "tutor", tutors)
+    taken = set()
+    res = np.empty(len(tutors), dtype=np.int64)
+    for i in np.argsort(hashes, kind="stable").tolist():
+        index = int(hashes[i] % np.uint64(len(pool)))
+        while index in taken:
+            index = (index + 1) % len(pool)
+        taken.add(index)
+        res[i] = index
+    return pool[res].tolist()
+
+
+def _permute_cids(cids, key):
+    """Map CIDs to fake CIDs with the same first two digits."""
+    import pandas as pd
+
+    cids = pd.Series(cids, dtype=object)
+    prefixes = cids.str[:2].to_numpy(dtype=str)
+    values = cids.str[2:].to_numpy(dtype=str).astype(np.int64)
+
+    res = np.empty(len(cids), dtype=object)
+    for prefix in set(prefixes.tolist()):
+        rows = prefixes == prefix
+        fake = fmu.permute(values[rows], 1_000_000, _key(key, f"cid-{prefix}"))
+        res[rows] = [f"{prefix}{v:06d}" for v in fake.tolist()]
+    return res
@@ -0,0 +1,263 @@
+import os
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+import fakeitmakeit as fm
+
+# Default parameters of generated datasets.
+DEFAULTS = {"n": 100, "seed": 0, "assignments": 5}
+
+# Maximum time (in seconds) a worker waits for another worker to generate a dataset
+# before generating it itself.
+LOCK_TIMEOUT = 600
+
+
+def pytest_configure(config):
+    """Register the ``fakeitmakeit`` marker."""
+    config.addinivalue_line(
+        "markers",
+        "fakeitmakeit(n=100, seed=0, assignments=5): parameters of datasets returned "
+        "by fake_cohort and fake_gradebook fixtures.",
+    )
+
+
+class DatasetCache:
+    """File-backed cache of generated datasets.
+
+    Each dataset is generated only once and pickled to ``path``. Other processes, e.g.
+    pytest-xdist workers, using the same ``path`` load the pickled dataset instead of
+    generating it. While one process generates a dataset, the others wait for it. A
+    process holds a lock file containing its PID while generating, so that the lock of
+    a crashed process is taken over by the next waiting process.
+
+    Parameters
+    ----------
+    path: pathlib.Path
+
+        Cache directory.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    >>> from fakeitmakeit.pytest_plugin import DatasetCache
+    ...
+    >>> cache = DatasetCache(tmp_path)  # doctest: +SKIP
+    >>> cache.get("cohort", fm.cohort, n=10, rng=0)  # doctest: +SKIP
+    ...
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._datasets = {}
+
+    def get(self, name, generate, **params):
+        """Get dataset ``name`` generated by calling ``generate(**params)``.
+
+        Parameters
+        ----------
+        name: str
+
+            Dataset name.
+
+        generate: callable
+
+            Function generating the dataset.
+
+        **params
+
+            Parameters passed to ``generate``. They are part of the cache key.
+
+        Returns
+        -------
+        object
+
+            Dataset.
+
+        """
+        key = "-".join([name, *(f"{k}={v}" for k, v in sorted(params.items()))])
+        if key not in self._datasets:
+            self._datasets[key] = self._load(key, lambda: generate(**params))
+        return self._datasets[key]
+
+    def _load(self, key, generate):
+        path = self.path / f"{key}.pickle"
+        lock = self.path / f"{key}.lock"
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        # Only the process which holds the lock generates the dataset.
+        while not (acquired := _acquire(lock)):
+            if path.exists():
+                return pickle.loads(path.read_bytes())
+            if time.monotonic() > deadline:
+                break
+            time.sleep(0.05)
+
+        try:
+            if path.exists():
+                # Generated by the process which held the lock before.
+                return pickle.loads(path.read_bytes())
+
+            dataset = generate()
+
+            # Write to a temporary file and rename it so that other processes never
+            # read a partially written dataset.
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(pickle.dumps(dataset, protocol=pickle.HIGHEST_PROTOCOL))
+            os.replace(tmp, path)
+        finally:
+            if acquired:
+                lock.unlink(missing_ok=True)
+
+        return dataset
+
+
+def view(df):
+    """Copy of ``df`` whose modification does not modify ``df``.
+
+    With pandas copy-on-write (default from pandas 3.0), a shallow copy is returned and
+    data is copied only when it is modified, so the copy is cheap. Otherwise (default
+    in pandas 2.x), all data is copied.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+
+        Dataframe.
+
+    Returns
+    -------
+    pd.DataFrame
+
+        Copy of the dataframe.
+
+    """
+    import pandas as pd
+
+    copy_on_write = (
+        int(pd.__version__.split(".")[0]) >= 3 or pd.options.mode.copy_on_write is True
+    )
+    return df.copy(deep=not copy_on_write)
+
+
+def _acquire(lock):
+    """Create ``lock`` file containing the PID of this process.
+
+    A lock held by a process which no longer exists, e.g. a crashed worker, is
+    removed, so that it is acquired by the next attempt. Returns ``True`` if the lock
+    was acquired.
+
+    """
+    try:
+        fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            pid = int(lock.read_text())
+        except (FileNotFoundError, ValueError):
+            # Released or its PID is not written yet.
+            return False
+        if not _alive(pid):
+            lock.unlink(missing_ok=True)
+        return False
+
+    with os.fdopen(fd, "w") as f:
+        f.write(str(os.getpid()))
+    return True
+
+
+def _alive(pid):
+    """Whether the process ``pid`` exists."""
+    if os.name != "posix":
+        # Signal 0 terminates the process on Windows.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Owned by another user.
+        return True
+    return True
+
+
+def _params(request):
+    """Dataset parameters from the ``fakeitmakeit`` marker or indirect parameter."""
+    params = dict(DEFAULTS)
+    if marker := request.node.get_closest_marker("fakeitmakeit"):
+        params |= marker.kwargs
+    params |= getattr(request, "param", {})
+    return params
+
+
+def _cohort(cache, n, seed):
+    return cache.get("cohort", fm.cohort, n=n, rng=seed)
+
+
+def _gradebook(cache, n, seed, assignments):
+    # Marks are generated with a separate random number generator so that they are
+    # not correlated with cohort data.
+    return cache.get(
+        "gradebook",
+        lambda n, seed, assignments: fm.gradebook(
+            _cohort(cache, n, seed).index,
+            n=assignments,
+            rng=np.random.default_rng([seed, 1]),
+        ),
+        n=n,
+        seed=seed,
+        assignments=assignments,
+    )
+
+
+@pytest.fixture(scope="session")
+def fakeitmakeit_cache(tmp_path_factory):
+    """Cache of datasets generated during the test session.
+
+    The cache is stored in the base temporary directory of the session, which is
+    shared by all pytest-xdist workers.
+
+    """
+    root = tmp_path_factory.getbasetemp()
+    if "PYTEST_XDIST_WORKER" in os.environ:
+        # Workers' base temporary directories are in the directory of the session.
+        root = root.parent
+
+    path = root / "fakeitmakeit"
+    path.mkdir(exist_ok=True)
+    return DatasetCache(path)
+
+
+@pytest.fixture
+def fake_cohort(request, fakeitmakeit_cache):
+    """Cohort generated with ``fm.cohort``.
+
+    The number of students ``n`` and ``seed`` are set with the ``fakeitmakeit`` marker
+    or indirect parametrisation, e.g.
+    ``@pytest.mark.fakeitmakeit(n=50, seed=1)`` or
+    ``@pytest.mark.parametrize("fake_cohort", [{"n": 50}], indirect=True)``.
+
+    The cohort is generated once per test session and every test gets its own copy
+    (see ``view``), so that modifying it does not affect other tests.
+
+    """
+    params = _params(request)
+    return view(_cohort(fakeitmakeit_cache, params["n"], params["seed"]))
+
+
+@pytest.fixture
+def fake_gradebook(request, fakeitmakeit_cache):
+    """Gradebook generated with ``fm.gradebook`` for ``fake_cohort`` students.
+
+    The number of students ``n``, ``seed`` and the number of ``assignments`` are set
+    with the ``fakeitmakeit`` marker or indirect parametrisation (see ``fake_cohort``).
+    For the same ``n`` and ``seed``, gradebook index matches the cohort index.
+
+    """
+    params = _params(request)
+    return view(
+        _gradebook(
+            fakeitmakeit_cache, params["n"], params["seed"], params["assignments"]
+        )
+    )
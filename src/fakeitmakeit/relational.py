@@ -0,0 +1,168 @@
+import pathlib
+
+import numpy as np
+
+import fakeitmakeit.factory as fmf
+import fakeitmakeit.util as fmu
+
+# ECTS credits of modules and the number of terms in an academic year.
+CREDITS = (5.0, 7.5, 10.0, 15.0)
+TERMS = 3
+
+
+def dataset(
+    n_students,
+    modules=10,
+    assignments_per_module=3,
+    distribution=None,
+    rng=None,
+    path=None,
+    file_format="csv",
+):
+    """Generate a relational dataset of students, modules and their marks.
+
+    The dataset consists of five consistent tables:
+
+    - ``students``: a cohort generated with ``fm.cohort``, indexed by ``username``.
+    - ``modules``: modules indexed by ``module`` code, e.g. ``ACSE01``, with their
+      ``course``, ``term`` and ``credits``. Modules are assigned to courses in turns.
+    - ``enrollments``: pairs of ``username`` and ``module``. Each student is enrolled
+      in all modules of their course.
+    - ``assignments``: assignments indexed by ``assignment`` code, e.g. ``ACSE01-2``,
+      with their ``module``, ``number`` and ``weight`` in the module.
+    - ``marks``: ``username``, ``assignment`` and ``mark`` of each assignment of each
+      enrollment, generated with ``fm.marks``.
+
+    Each table is generated in one vectorised pass.
+
+    Parameters
+    ----------
+    n_students: int
+
+        Number of students.
+
+    modules: int
+
+        Number of modules, at least the number of courses (``fm.util.COURSES``), so
+        that each course has a module.
+
+    assignments_per_module: int
+
+        Number of assignments of each module.
+
+    distribution: fm.distributions.TruncatedNormal, NormalMixture, Beta, Empirical
+
+        Distribution of marks. If not provided, the default distribution of
+        ``fm.marks`` is used.
+
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    path: str, os.PathLike, optional
+
+        Directory to which the tables are written as ``<table>.<file_format>``
+        files. If not provided, the tables are only returned.
+
+    file_format: str
+
+        Format of the written files, ``"csv"`` or ``"parquet"`` (requires
+        ``pyarrow``).
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+
+        Tables by their names.
+
+    Raises
+    ------
+    ValueError
+
+        If ``file_format`` is not supported or there are fewer modules than courses.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> tables = fm.dataset(100, modules=6, assignments_per_module=2, rng=0)
+    >>> list(tables)
+    ['students', 'modules', 'enrollments', 'assignments', 'marks']
+    >>> tables["enrollments"]["username"].isin(tables["students"].index).all()
+    np.True_
+    >>> tables["marks"]["assignment"].isin(tables["assignments"].index).all()
+    np.True_
+
+    """
+    import pandas as pd
+
+    if file_format not in {"csv", "parquet"}:
+        raise ValueError(f"Unsupported file format {file_format!r}.")
+    if modules < len(fmu.COURSES):
+        raise ValueError(
+            f"Number of modules must be at least {len(fmu.COURSES)}, not {modules}."
+        )
+
+    rng = fmu.get_rng(rng)
+
+    students = fmf.cohort(n_students, rng=rng)
+
+    courses = np.array(list(fmu.COURSES), dtype=object)[
+        np.arange(modules) % len(fmu.COURSES)
+    ]
+    numbers = np.arange(modules) // len(fmu.COURSES) + 1
+    module_table = pd.DataFrame(
+        {
+            "module": [
+                f"{c.upper()}{k:02d}"
+                for c, k in zip(courses, numbers.tolist(), strict=True)
+            ],
+            "course": courses,
+            "term": rng.integers(1, TERMS + 1, size=modules),
+            "credits": np.array(CREDITS)[rng.integers(len(CREDITS), size=modules)],
+        }
+    ).set_index("module")
+
+    enrollments = (
+        students["course"]
+        .astype(object)
+        .reset_index()
+        .merge(module_table["course"].reset_index(), on="course")[
+            ["username", "module"]
+        ]
+    )
+
+    assignments = pd.DataFrame(
+        {
+            "module": np.repeat(module_table.index.to_numpy(), assignments_per_module),
+            "number": np.tile(np.arange(1, assignments_per_module + 1), modules),
+        }
+    )
+    assignments.index = pd.Index(
+        assignments["module"] + "-" + assignments["number"].astype(str),
+        name="assignment",
+    )
+    assignments["weight"] = 1 / assignments_per_module
+
+    marks = enrollments.merge(assignments["module"].reset_index(), on="module").drop(
+        columns="module"
+    )
+    marks["mark"] = fmf.marks(len(marks), distribution=distribution, rng=rng)
+
+    res = {
+        "students": students,
+        "modules": module_table,
+        "enrollments": enrollments,
+        "assignments": assignments,
+        "marks": marks,
+    }
+
+    if path is not None:
+        path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name, table in res.items():
+            write = getattr(table, f"to_{file_format}")
+            write(path / f"{name}.{file_format}", index=table.index.name is not None)
+
+    return res
@@ -0,0 +1,892 @@
+import functools
+import graphlib
+import itertools
+import string
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+import fakeitmakeit.pools as fmp
+import fakeitmakeit.util as fmu
+
+# Maximum number of times values of a unique column are redrawn before giving up.
+MAX_REDRAWS = 100
+
+# Libraries in which generated dataframes can be built.
+BACKENDS = ("pandas", "polars", "pyarrow", "numpy")
+
+# Unique columns whose generators accept the values the generated values must differ
+# from (see ``_taking``).
+_TAKEN_COLUMNS = ("email", "personal_email")
+
+# Sizes in bytes of UTF-8 encoded names and emails in structured arrays.
+NAME_WIDTH = 64
+EMAIL_WIDTH = 128
+
+
+@dataclass(frozen=True)
+class Column:
+    """A column of a generated dataframe.
+
+    Values of the whole column are generated at once by calling
+    ``generate(n, rng=rng, **dependencies)``, where ``dependencies`` are arrays of
+    already generated values of the columns in ``depends_on``. The generator returns
+    an array-like of ``n`` values.
+
+    Parameters
+    ----------
+    name: str
+
+        Column name.
+
+    generate: callable
+
+        Batch generator.
+
+    depends_on: tuple[str]
+
+        Names of the columns passed to ``generate``.
+
+    dtype: str, optional
+
+        Data type of the column in the dataframe, e.g. ``"category"``.
+
+    categories: tuple[str], callable, optional
+
+        All labels of a categorical column, or a function returning them, so that
+        they can be loaded lazily. The ``"numpy"`` backend stores codes into these
+        labels, so that codes of different dataframes match.
+
+    width: int, optional
+
+        Size in bytes of UTF-8 encoded values of a string column stored by the
+        ``"numpy"`` backend, so that fields of different dataframes match.
+
+    unique: bool
+
+        If ``True``, duplicate values are redrawn until all values are unique.
+
+    keep: bool
+
+        If ``False``, the column is generated only if other columns depend on it and it
+        is not included in the dataframe.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.Column("year", lambda n, rng: rng.integers(1, 5, size=n))
+    Column(name='year', ...)
+
+    """
+
+    name: str
+    generate: Callable
+    depends_on: tuple = ()
+    dtype: str | None = None
+    categories: tuple | Callable | None = None
+    width: int | None = None
+    unique: bool = False
+    keep: bool = True
+
+
+@dataclass(frozen=True)
+class Schema:
+    """A declarative description of a generated dataframe.
+
+    The schema is compiled once into a plan: the columns needed for the kept columns,
+    ordered so that each column is generated after the columns it depends on. Columns
+    are then generated whole columns at a time.
+
+    Parameters
+    ----------
+    columns: tuple[Column]
+
+        Columns in the order in which they appear in the dataframe.
+
+    index: str, optional
+
+        Name of the column used as the index. Index values must be unique.
+
+    Raises
+    ------
+    ValueError
+
+        If column names are not unique, a column depends on an unknown column, there
+        are circular dependencies or the index is not a kept column.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> schema = fm.schema.COHORT_SCHEMA.add(
+    ...     fm.Column("year", lambda n, rng: rng.integers(1, 5, size=n))
+    ... ).drop("tutor", "personal_email")
+    >>> df = schema.generate(n=10)
+    >>> "year" in df.columns and "tutor" not in df.columns
+    True
+
+    """
+
+    columns: tuple
+    index: str | None = None
+
+    def __post_init__(self):
+        """Validate the schema and compile its plan."""
+        names = [column.name for column in self.columns]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Column names are not unique: {names}.")
+        for column in self.columns:
+            if missing := set(column.depends_on) - set(names):
+                raise ValueError(f"{column.name!r} depends on unknown {missing}.")
+        if self.index is not None and self.index not in self.kept():
+            raise ValueError(f"Index {self.index!r} is not a kept column.")
+        # Compile the plan to detect circular dependencies early.
+        self.plan
+
+    def kept(self):
+        """Names of the columns included in the dataframe.
+
+        Returns
+        -------
+        list[str]
+
+            Column names.
+
+        """
+        return [column.name for column in self.columns if column.keep]
+
+    @functools.cached_property
+    def plan(self):
+        """Columns to generate in the order in which they are generated.
+
+        Only the kept columns and the columns they (indirectly) depend on are
+        generated.
+
+        Returns
+        -------
+        tuple[Column]
+
+            Ordered columns.
+
+        """
+        columns = {column.name: column for column in self.columns}
+
+        # Columns needed for the kept columns.
+        needed, stack = set(), self.kept()
+        while stack:
+            if (name := stack.pop()) not in needed:
+                needed.add(name)
+                stack.extend(columns[name].depends_on)
+
+        sorter = graphlib.TopologicalSorter(
+            {name: columns[name].depends_on for name in columns if name in needed}
+        )
+        try:
+            return tuple(columns[name] for name in sorter.static_order())
+        except graphlib.CycleError as e:
+            raise ValueError(f"Circular dependencies: {e.args[1]}.") from None
+
+    def add(self, *columns):
+        """Return a schema with additional ``columns``.
+
+        Parameters
+        ----------
+        *columns: Column
+
+            New columns. A column with the name of an existing column replaces it.
+
+        Returns
+        -------
+        Schema
+
+            New schema.
+
+        """
+        new = {column.name: column for column in columns}
+        existing = [new.pop(column.name, column) for column in self.columns]
+        return replace(self, columns=(*existing, *new.values()))
+
+    def drop(self, *names):
+        """Return a schema without columns ``names``.
+
+        Dropped columns other columns depend on are still generated, but they are not
+        included in the dataframe.
+
+        Parameters
+        ----------
+        *names: str
+
+            Names of the dropped columns.
+
+        Returns
+        -------
+        Schema
+
+            New schema.
+
+        """
+        if unknown := set(names) - {column.name for column in self.columns}:
+            raise ValueError(f"Unknown columns {unknown}.")
+        columns = tuple(
+            replace(column, keep=False) if column.name in names else column
+            for column in self.columns
+        )
+        index = None if self.index in names else self.index
+        return replace(self, columns=columns, index=index)
+
+    def categories(self):
+        """Lookup tables of labels of kept categorical columns with fixed categories.
+
+        Codes of these columns in structured arrays built by the ``"numpy"`` backend
+        index the lookup tables. Unlike ``categories``, lookup tables do not depend on
+        the metadata of structured arrays, which is lost e.g. by ``np.save``.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+
+            Arrays of labels indexed by codes by column names.
+
+        Examples
+        --------
+        >>> import fakeitmakeit as fm
+        ...
+        >>> fm.schema.COHORT_SCHEMA.categories()["course"]
+        array(['acse', 'edsml', 'gems'], dtype=object)
+
+        """
+        return {
+            column.name: np.array(_labels(column.categories), dtype=object)
+            for column in self.columns
+            if column.keep and column.categories is not None
+        }
+
+    def select(self, *names):
+        """Return a schema with only columns ``names`` and the index kept.
+
+        Other columns are generated only if the kept columns (indirectly) depend on
+        them, so selecting cheap columns skips expensive ones. Columns stay in the
+        order of the schema.
+
+        Parameters
+        ----------
+        *names: str
+
+            Names of the kept columns.
+
+        Returns
+        -------
+        Schema
+
+            New schema.
+
+        Examples
+        --------
+        >>> import fakeitmakeit as fm
+        ...
+        >>> schema = fm.schema.COHORT_SCHEMA.select("course")
+        >>> schema.kept()
+        ['course', 'username']
+        >>> "email" in [column.name for column in schema.plan]
+        False
+
+        """
+        if unknown := set(names) - {column.name for column in self.columns}:
+            raise ValueError(f"Unknown columns {unknown}.")
+        columns = tuple(
+            replace(column, keep=column.name in names or column.name == self.index)
+            for column in self.columns
+        )
+        return replace(self, columns=columns)
+
+    def generate(self, n, rng=None, taken=None, threads=None, backend="pandas"):
+        """Generate a dataframe with ``n`` rows.
+
+        If ``threads`` is given, rows are split into ``threads`` chunks and each column
+        is generated chunk by chunk in a pool of threads, with an independent random
+        number generator spawned from ``rng`` for each chunk. Unique columns are
+        generated whole in the calling thread, because generators such as
+        ``fm.emails`` make values unique only within a batch. Generation scales with
+        the number of threads only on free-threaded (no-GIL) builds of Python. The
+        dataframe is reproducible for the same seed and number of threads, but it
+        depends on the number of threads.
+
+        The dataframe is built from the generated arrays by the ``backend`` library
+        (see ``frame``).
+
+        Parameters
+        ----------
+        n: int
+
+            Number of rows.
+
+        rng: np.random.Generator, int, optional
+
+            Random number generator or a seed. If not provided, the default generator
+            is used.
+
+        taken: dict, optional
+
+            Keys are names of unique columns and values are iterables of values the
+            generated values must differ from, e.g. usernames of existing students.
+
+        threads: int, optional
+
+            Number of threads. If not provided, the dataframe is generated in the
+            calling thread.
+
+        backend: str
+
+            ``"pandas"``, ``"polars"``, ``"pyarrow"`` or ``"numpy"``.
+
+        Returns
+        -------
+        pd.DataFrame, pl.DataFrame, pa.Table, np.ndarray
+
+            Generated dataframe.
+
+        Raises
+        ------
+        ValueError
+
+            If ``threads`` is not positive or ``backend`` is not supported.
+
+        """
+        if threads is not None and threads < 1:
+            raise ValueError(f"Number of threads must be positive, not {threads}.")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported backend {backend!r}.")
+
+        rng = fmu.get_rng(rng)
+        taken = taken or {}
+
+        if threads is None:
+            columns = self._columns(n, rng, taken, _run)
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                run = functools.partial(
+                    _run_chunks,
+                    executor=executor,
+                    bounds=np.linspace(0, n, threads + 1).astype(int),
+                    rngs=rng.spawn(threads),
+                )
+                columns = self._columns(n, rng, taken, run)
+
+        return self._frame(columns, backend)
+
+    def _frame(self, columns, backend):
+        """Dataframe of kept ``columns`` of generated values (see ``frame``)."""
+        kept = [column for column in self.columns if column.keep]
+        return frame(
+            {column.name: columns[column.name] for column in kept},
+            dtypes={column.name: column.dtype for column in kept if column.dtype},
+            index=self.index,
+            backend=backend,
+            categories={
+                name: tuple(labels) for name, labels in self.categories().items()
+            },
+            widths={column.name: column.width for column in kept if column.width},
+        )
+
+    def _columns(self, n, rng, taken, run):
+        """Values of the columns in the plan generated by ``run``."""
+        values = {}
+        for column in self.plan:
+            dependencies = {name: values[name] for name in column.depends_on}
+            res = run(column, n, rng, dependencies)
+            if column.unique:
+                _deduplicate(column, res, dependencies, taken.get(column.name, ()), rng)
+            values[column.name] = res
+        return values
+
+
+def _taking(schema, taken):
+    """Return ``schema`` whose columns in ``_TAKEN_COLUMNS`` avoid ``taken`` values.
+
+    Redrawn emails collide with the taken ones when the pool of local parts is
+    exhausted, so email generators are passed the taken values to generate distinct
+    emails in the first place. ``taken`` is not copied, so values added to it later
+    are taken too.
+
+    """
+    return schema.add(
+        *(
+            replace(
+                column,
+                generate=functools.partial(column.generate, taken=taken[column.name]),
+            )
+            for column in schema.columns
+            if column.name in _TAKEN_COLUMNS and column.name in taken
+        )
+    )
+
+
+def _run(column, n, rng, dependencies):
+    """Generate ``n`` values of ``column`` at once."""
+    return _array(column.generate(n, rng=rng, **dependencies))
+
+
+def _run_chunks(column, n, rng, dependencies, executor, bounds, rngs):
+    """Generate ``n`` values of ``column`` in chunks between ``bounds`` in threads.
+
+    Chunk ``i`` is generated with ``rngs[i]``. Unique columns are generated at once
+    with ``rng``.
+
+    """
+    if column.unique:
+        return _run(column, n, rng, dependencies)
+
+    futures = [
+        executor.submit(
+            _run,
+            column,
+            stop - start,
+            chunk_rng,
+            {name: value[start:stop] for name, value in dependencies.items()},
+        )
+        for (start, stop), chunk_rng in zip(
+            itertools.pairwise(bounds.tolist()), rngs, strict=True
+        )
+    ]
+    return np.concatenate([future.result() for future in futures])
+
+
+def frame(
+    data, dtypes=None, index=None, backend="pandas", categories=None, widths=None
+):
+    """Build a dataframe from arrays of generated values.
+
+    Columns with ``"category"`` data type are categorical in pandas and polars and
+    dictionary-encoded in Arrow. Polars dataframes are converted from Arrow tables
+    without copying. Polars and Arrow have no index, so the ``index`` column is the
+    first column. The ``"polars"`` and ``"pyarrow"`` backends require the ``arrow``
+    extra.
+
+    The ``"numpy"`` backend writes columns into a preallocated structured array, the
+    ``index`` column first, so that each row has the same size and slices are views.
+    Strings are stored UTF-8 encoded in fixed-width bytes fields ``widths`` bytes wide
+    (by default, as wide as the longest value of the column). Categorical columns are
+    stored as the smallest unsigned integer codes into ``categories`` (by default,
+    the sorted values of the column). Labels are also kept in the metadata of the
+    field data type (see ``categories``). With fixed categories and widths, arrays of
+    different dataframes have the same data type and can be concatenated.
+
+    Parameters
+    ----------
+    data: dict[str, np.ndarray]
+
+        Arrays of values by column names.
+
+    dtypes: dict[str, str], optional
+
+        Data types of columns, e.g. ``"category"`` or ``"int32"``.
+
+    index: str, optional
+
+        Name of the column with unique values used as the index.
+
+    backend: str
+
+        ``"pandas"``, ``"polars"``, ``"pyarrow"`` or ``"numpy"``.
+
+    categories: dict[str, tuple[str]], optional
+
+        All labels of categorical columns by column names, used by the ``"numpy"``
+        backend.
+
+    widths: dict[str, int], optional
+
+        Sizes in bytes of UTF-8 encoded values of string columns by column names, used
+        by the ``"numpy"`` backend.
+
+    Returns
+    -------
+    pd.DataFrame, pl.DataFrame, pa.Table, np.ndarray
+
+        Dataframe.
+
+    Raises
+    ------
+    ValueError
+
+        If ``index`` values are not unique, ``backend`` is not supported, values are
+        not in ``categories`` or are wider than ``widths``.
+
+    ImportError
+
+        If the library of ``backend`` is not installed.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import fakeitmakeit as fm
+    ...
+    >>> data = {"id": np.array(["a", "b"]), "course": np.array(["acse", "gems"])}
+    >>> fm.schema.frame(
+    ...     data, {"course": "category"}, index="id", backend="pyarrow"
+    ... )  # doctest: +SKIP
+    pyarrow.Table
+    id: string
+    course: dictionary<values=string, indices=int32, ordered=0>
+    ...
+
+    """
+    dtypes = dtypes or {}
+
+    if backend == "pandas":
+        import pandas as pd
+
+        df = pd.DataFrame(data).astype(dtypes)
+        if index is not None:
+            df = df.set_index(index, verify_integrity=True)
+        return df
+    elif backend not in BACKENDS:
+        raise ValueError(f"Unsupported backend {backend!r}.")
+
+    names = list(data)
+    if index is not None:
+        names = [index, *(name for name in names if name != index)]
+
+    if backend == "numpy":
+        return _structured(
+            {name: data[name] for name in names},
+            dtypes,
+            index,
+            categories or {},
+            widths or {},
+        )
+
+    pa = fmu.optional_import("pyarrow")
+    pc = fmu.optional_import("pyarrow.compute")
+
+    arrays = []
+    for name in names:
+        array = pa.array(data[name], from_pandas=True)
+        if dtypes.get(name) == "category":
+            array = array.dictionary_encode()
+        elif name in dtypes:
+            array = array.cast(pa.from_numpy_dtype(np.dtype(dtypes[name])))
+        arrays.append(array)
+
+    table = pa.table(arrays, names=names)
+    if index is not None and pc.count_distinct(table[index]).as_py() < len(table):
+        raise ValueError(f"Index {index!r} has duplicate values.")
+
+    if backend == "polars":
+        return fmu.optional_import("polars").from_arrow(table)
+    return table
+
+
+def categories(array):
+    """Lookup tables of labels of categorical fields of a structured array.
+
+    Labels are read from the metadata of field data types, which is lost e.g. by
+    ``np.save``. Lookup tables of schemas are available with ``Schema.categories``.
+
+    Parameters
+    ----------
+    array: np.ndarray
+
+        Structured array built by ``frame`` with the ``"numpy"`` backend.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+
+        Arrays of labels indexed by codes by field names.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> cohort = fm.cohort(10, rng=0, backend="numpy")
+    >>> labels = fm.schema.categories(cohort)["course"]
+    >>> set(labels[cohort["course"]]) <= {"acse", "edsml", "gems"}
+    True
+
+    """
+    return {
+        name: np.array(dtype.metadata["categories"], dtype=object)
+        for name, (dtype, *_) in array.dtype.fields.items()
+        if dtype.metadata and "categories" in dtype.metadata
+    }
+
+
+def _structured(data, dtypes, index, categories, widths):
+    """Build a structured array from ``data`` (see ``frame``)."""
+    fields = []
+    for name, column in data.items():
+        values = np.asarray(column)
+        if dtypes.get(name) == "category":
+            labels, values = _codes(name, values, categories.get(name))
+            dtype = np.dtype(
+                np.min_scalar_type(max(len(labels) - 1, 0)),
+                metadata={"categories": tuple(labels.tolist())},
+            )
+        elif name in dtypes:
+            dtype = np.dtype(dtypes[name])
+        elif values.dtype.kind in "OU":
+            # Encoded strings are as wide as the longest value.
+            values = np.strings.encode(values.astype(str), "utf-8")
+            dtype = values.dtype
+            if (width := widths.get(name)) is not None:
+                if dtype.itemsize > width:
+                    raise ValueError(
+                        f"Values of {name!r} are wider than {width} bytes."
+                    )
+                dtype = np.dtype(f"S{width}")
+        else:
+            dtype = values.dtype
+        fields.append((name, dtype, values))
+
+    res = np.empty(len(fields[0][2]) if fields else 0, dtype=[f[:2] for f in fields])
+    for name, _, values in fields:
+        res[name] = values
+
+    if index is not None and len(np.unique(res[index])) < len(res):
+        raise ValueError(f"Index {index!r} has duplicate values.")
+    return res
+
+
+def _codes(name, values, labels=None):
+    """Labels and codes of ``values`` of categorical column ``name``.
+
+    If ``labels`` are not given, they are the sorted unique values.
+
+    """
+    uniques, inverse = np.unique(values, return_inverse=True)
+    if labels is None:
+        return uniques, inverse
+
+    lookup = {label: code for code, label in enumerate(labels)}
+    if missing := set(uniques.tolist()) - lookup.keys():
+        raise ValueError(f"Values {missing} of {name!r} are not in its categories.")
+    codes = np.array([lookup[value] for value in uniques.tolist()], dtype=np.intp)
+    return np.asarray(labels), codes[inverse]
+
+
+def _labels(categories):
+    """Labels of ``categories``, calling it if it is a function."""
+    return tuple(categories() if callable(categories) else categories)
+
+
+def _array(values):
+    """Convert generated values to an array, strings to an object array.
+
+    Strings are stored as objects, so that redrawn values are never truncated.
+
+    """
+    values = np.asarray(values)
+    return values.astype(object) if values.dtype.kind == "U" else values
+
+
+def _deduplicate(column, values, dependencies, taken, rng):
+    """Redraw duplicates and values in ``taken`` in place until all are unique."""
+    seen = set(taken)
+    duplicates = []
+    for i, value in enumerate(values.tolist()):
+        if value in seen:
+            duplicates.append(i)
+        else:
+            seen.add(value)
+
+    for _ in range(MAX_REDRAWS):
+        if not duplicates:
+            return
+        rows = np.array(duplicates)
+        redrawn = column.generate(
+            len(rows),
+            rng=rng,
+            **{name: value[rows] for name, value in dependencies.items()},
+        )
+        duplicates = []
+        for i, value in zip(rows.tolist(), _array(redrawn).tolist(), strict=True):
+            if value in seen:
+                duplicates.append(i)
+            else:
+                seen.add(value)
+                values[i] = value
+
+    raise ValueError(f"Unique values of {column.name!r} could not be generated.")
+
+
+def _cid(n, rng):
+    """Generate ``n`` CIDs (see ``fm.cid``)."""
+    second = rng.integers(1, 3, size=n).tolist()
+    rest = rng.integers(0, 1_000_000, size=n).tolist()
+    return [f"0{a}{b:06d}" for a, b in zip(second, rest, strict=True)]
+
+
+def _bias(n, rng):
+    """Generate ``n`` rows of columns in ``fm.util.BIAS_COLUMNS`` of the cohort.
+
+    Columns are sampled jointly from ``fm.util.cohort_bias``, so that they follow its
+    conditional probability tables.
+
+    """
+    res = fmu.cohort_bias.sample(n, rng=rng)
+    return np.stack([res[column] for column in fmu.BIAS_COLUMNS], axis=1)
+
+
+def _bias_column(column):
+    """Return a generator extracting ``column`` from rows generated by ``_bias``."""
+    i = fmu.BIAS_COLUMNS.index(column)
+    return lambda n, rng, bias: bias[:, i]
+
+
+def _name(n, rng, gender, nationality):
+    """Generate names consistent with genders and nationalities (see ``fm.names``)."""
+    import fakeitmakeit.factory as fmf
+
+    return fmf.names(gender, nationality, rng=rng)
+
+
+def _title(n, rng, gender):
+    """Generate titles consistent with genders (see ``fm.title``)."""
+    res = np.full(n, "Mx", dtype=object)
+    res[gender == "male"] = "Mr"
+    female = gender == "female"
+    res[female] = np.array(["Ms", "Mrs", "Miss"], dtype=object)[
+        rng.integers(3, size=np.count_nonzero(female))
+    ]
+    return res
+
+
+def _username(n, rng, first_name, last_name):
+    """Generate usernames from names (see ``fm.username``)."""
+    # The middle letter is present in half of usernames and the number has 2-4 digits
+    # without a leading zero.
+    middle = np.array(["", *string.ascii_lowercase], dtype=object)[
+        np.where(rng.integers(2, size=n) == 1, rng.integers(1, 27, size=n), 0)
+    ]
+    digits = rng.integers(2, 5, size=n)
+    numbers = rng.integers(10 ** (digits - 1), 10**digits)
+    return [
+        f"{first[0]}{letter}{last[0]}{number}".casefold()
+        for first, letter, last, number in zip(
+            first_name, middle, last_name, numbers.tolist(), strict=True
+        )
+    ]
+
+
+def _email(n, rng, taken=None):
+    """Generate ``n`` university emails which are not in ``taken``."""
+    import fakeitmakeit.factory as fmf
+
+    return fmf.emails(n, domain="imperial.ac.uk", rng=rng, taken=taken)
+
+
+def _personal_email(n, rng, taken=None):
+    """Generate ``n`` personal emails which are not in ``taken``."""
+    import fakeitmakeit.factory as fmf
+
+    return fmf.emails(n, rng=rng, taken=taken)
+
+
+def _tutor(n, rng):
+    """Generate ``n`` tutor names."""
+    pool = fmp.names()
+    return pool[rng.integers(len(pool), size=n)]
+
+
+def _tutor_column(tutors, load=None):
+    """Return a generator assigning ``tutors`` to students.
+
+    Tutors are drawn uniformly if ``load`` is ``None``, with probabilities ``load``
+    if it is an array, or so that each tutor has the same number of students (up to
+    one) if it is ``"balanced"``.
+
+    """
+    tutors = np.asarray(tutors, dtype=object)
+
+    def generate(n, rng):
+        if load is None:
+            codes = rng.integers(len(tutors), size=n)
+        elif isinstance(load, str):
+            codes = rng.permutation(np.resize(np.arange(len(tutors)), n))
+        else:
+            codes = rng.choice(len(tutors), size=n, p=load)
+        return tutors[codes]
+
+    return generate
+
+
+# Schema of cohorts generated by ``fm.cohort``.
+COHORT_SCHEMA = Schema(
+    columns=(
+        Column("cid", _cid, width=8, unique=True),
+        Column("bias", _bias, keep=False),
+        Column(
+            "gender",
+            _bias_column("gender"),
+            ("bias",),
+            dtype="category",
+            categories=tuple(fmu.GENDERS),
+        ),
+        Column(
+            "nationality",
+            _bias_column("nationality"),
+            ("bias",),
+            dtype="category",
+            categories=lambda: tuple(fmu.COUNTRIES),
+        ),
+        Column("name", _name, ("gender", "nationality"), keep=False),
+        Column(
+            "first_name",
+            lambda n, rng, name: [v.split()[0] for v in name],
+            ("name",),
+            width=NAME_WIDTH,
+        ),
+        Column(
+            "last_name",
+            lambda n, rng, name: [v.split()[-1] for v in name],
+            ("name",),
+            width=NAME_WIDTH,
+        ),
+        Column(
+            "title",
+            _title,
+            ("gender",),
+            dtype="category",
+            categories=tuple(fmu.TITLES),
+        ),
+        Column(
+            "course",
+            _bias_column("course"),
+            ("bias",),
+            dtype="category",
+            categories=tuple(fmu.COURSES),
+        ),
+        Column(
+            "username", _username, ("first_name", "last_name"), width=16, unique=True
+        ),
+        Column("email", _email, width=EMAIL_WIDTH, unique=True),
+        Column("personal_email", _personal_email, width=EMAIL_WIDTH, unique=True),
+        Column(
+            "github",
+            lambda n, rng, course, username: course + "-" + username,
+            ("course", "username"),
+            width=32,
+        ),
+        Column(
+            "fee_status",
+            lambda n, rng, nationality: np.where(
+                nationality == "United Kingdom", "home", "overseas"
+            ),
+            ("nationality",),
+            dtype="category",
+            categories=("home", "overseas"),
+        ),
+        Column(
+            "enrollment_status",
+            lambda n, rng: np.full(n, "enrolled", dtype=object),
+            dtype="category",
+            categories=("enrolled",),
+        ),
+        Column("tutor", _tutor, width=2 * NAME_WIDTH),
+    ),
+    index="username",
+)
@@ -0,0 +1,249 @@
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Offsets of arrays in the shared memory block are aligned to this number of bytes.
+ALIGNMENT = 64
+
+# Shared memory blocks attached in this process. Blocks are kept open until they are
+# detached with ``detach_cohort``, because dataframes built on top of them might be in
+# use.
+_attached = {}
+
+
+@dataclass(frozen=True)
+class SharedColumn:
+    """A dataclass describing a column stored in shared memory."""
+
+    name: str
+    kind: str  # "numeric", "category" or "string"
+    dtype: str
+    offset: int
+    length: int
+    categories: tuple = ()
+    ordered: bool = False
+
+
+@dataclass(frozen=True)
+class SharedCohort:
+    """A handle of a cohort stored in shared memory.
+
+    The handle is small and can be pickled and sent to other processes, which rebuild
+    the cohort with ``attach_cohort``. The process which created the handle with
+    ``share_cohort`` should call ``unlink`` when the cohort is not needed anymore. The
+    handle can also be used as a context manager which unlinks the shared memory on
+    exit.
+
+    """
+
+    name: str
+    index: SharedColumn
+    columns: tuple
+
+    def unlink(self):
+        """Free the shared memory block.
+
+        Dataframes attached to the block in other processes remain valid until those
+        processes exit, but new ones cannot be attached.
+
+        """
+        if (shm := _attached.get(self.name)) is None:
+            # Tracked, so that unlinking unregisters the block from the resource
+            # tracker of the process which created it.
+            shm = shared_memory.SharedMemory(name=self.name)
+        shm.unlink()
+
+        try:
+            shm.close()
+        except BufferError:
+            # Dataframes attached in this process still use the block.
+            pass
+        else:
+            _attached.pop(self.name, None)
+
+    def __enter__(self):
+        """Enter the context."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Unlink the shared memory block on exit."""
+        self.unlink()
+
+
+def _to_array(name, values):
+    """Convert column ``values`` to an array and its ``SharedColumn`` description."""
+    import pandas as pd
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        array = pd.Categorical(values).codes
+        column = SharedColumn(
+            name=name,
+            kind="category",
+            dtype=array.dtype.str,
+            offset=0,
+            length=len(array),
+            categories=tuple(values.dtype.categories),
+            ordered=bool(values.dtype.ordered),
+        )
+    elif isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufmM":
+        array = np.asarray(values)
+        column = SharedColumn(name, "numeric", array.dtype.str, 0, len(array))
+    elif pd.api.types.infer_dtype(values, skipna=False) in ("string", "empty"):
+        array = np.asarray(values, dtype=str)
+        column = SharedColumn(name, "string", array.dtype.str, 0, len(array))
+    else:
+        raise TypeError(f"Column {name!r} with dtype {values.dtype} cannot be shared.")
+
+    return array, column
+
+
+def share_cohort(df):
+    """Place a cohort in shared memory.
+
+    Index and columns are copied into one shared memory block. Numeric columns are
+    stored as they are, categorical columns as their codes (categories are stored in
+    the handle) and string columns as fixed-width unicode arrays. The returned handle
+    is passed to ``attach_cohort`` in other processes.
+
+    Although the function is meant for cohorts generated with ``fm.cohort``, it works
+    with any dataframe with numeric, categorical and string columns, e.g. gradebooks.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+
+        Cohort.
+
+    Returns
+    -------
+    SharedCohort
+
+        Handle of the shared cohort.
+
+    Raises
+    ------
+    TypeError
+
+        If a column has a dtype which cannot be shared.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> df = fm.cohort(n=10)
+    >>> with fm.share_cohort(df) as handle:
+    ...     fm.attach_cohort(handle).equals(df)
+    True
+
+    """
+    arrays, columns = [], []
+    offset = 0
+    for name, values in [(df.index.name, df.index), *df.items()]:
+        array, column = _to_array(name, values)
+        arrays.append(array)
+        columns.append(SharedColumn(**(vars(column) | {"offset": offset})))
+        # Align the offset of the next array.
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for array, column in zip(arrays, columns, strict=True):
+        np.ndarray(array.shape, array.dtype, shm.buf, column.offset)[:] = array
+    _attached[shm.name] = shm
+
+    return SharedCohort(name=shm.name, index=columns[0], columns=tuple(columns[1:]))
+
+
+def attach_cohort(handle):
+    """Rebuild a cohort placed in shared memory with ``share_cohort``.
+
+    Numeric columns and codes of categorical columns are read-only views of the
+    shared memory, i.e. they are not copied. String columns and index are copied into
+    Python strings. To modify read-only columns, copy the dataframe first.
+
+    The shared memory block stays attached to this process (and all dataframes
+    attached to it share it) until it is detached with ``detach_cohort``.
+
+    Parameters
+    ----------
+    handle: SharedCohort
+
+        Handle of the shared cohort.
+
+    Returns
+    -------
+    pd.DataFrame
+
+        Cohort.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> handle = fm.share_cohort(fm.cohort(n=10))
+    >>> fm.attach_cohort(handle)  # doctest: +SKIP
+    ...
+    >>> fm.detach_cohort(handle)
+    >>> handle.unlink()
+
+    """
+    import pandas as pd
+
+    if (shm := _attached.get(handle.name)) is None:
+        shm = _attached[handle.name] = shared_memory.SharedMemory(
+            name=handle.name, track=False
+        )
+
+    def values(column):
+        # Unlike np.ndarray, np.frombuffer holds the buffer, so the block cannot be
+        # closed while arrays use it.
+        array = np.frombuffer(shm.buf, column.dtype, column.length, column.offset)
+        array.flags.writeable = False
+        if column.kind == "category":
+            dtype = pd.CategoricalDtype(list(column.categories), column.ordered)
+            return pd.Categorical.from_codes(array, dtype=dtype, validate=False)
+        elif column.kind == "string":
+            return array.astype(object)
+        else:
+            return array
+
+    return pd.DataFrame(
+        {column.name: values(column) for column in handle.columns},
+        index=pd.Index(values(handle.index), name=handle.index.name),
+        copy=False,
+    )
+
+
+def detach_cohort(handle):
+    """Close the shared memory block of a cohort attached in this process.
+
+    Dataframes attached with ``attach_cohort`` (and arrays taken from them) must not
+    be in use anymore. The block itself is freed only when it is unlinked (see
+    ``SharedCohort.unlink``). Detaching a cohort which is not attached does nothing.
+
+    Parameters
+    ----------
+    handle: SharedCohort
+
+        Handle of the shared cohort.
+
+    Raises
+    ------
+    BufferError
+
+        If dataframes attached in this process still use the block.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> with fm.share_cohort(fm.cohort(n=10)) as handle:
+    ...     n = len(fm.attach_cohort(handle))
+    ...     fm.detach_cohort(handle)
+    >>> n
+    10
+
+    """
+    if (shm := _attached.get(handle.name)) is not None:
+        shm.close()
+        del _attached[handle.name]
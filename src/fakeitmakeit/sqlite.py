@@ -0,0 +1,173 @@
+import sqlite3
+
+import numpy as np
+
+import fakeitmakeit.factory as fmf
+import fakeitmakeit.schema as fms
+import fakeitmakeit.util as fmu
+
+# Number of students inserted in one transaction.
+CHUNK_SIZE = 100_000
+
+# Columns of the students table in the order of ``fm.cohort`` columns.
+STUDENT_COLUMNS = (
+    "username",
+    "cid",
+    "gender",
+    "nationality",
+    "first_name",
+    "last_name",
+    "title",
+    "course",
+    "email",
+    "personal_email",
+    "github",
+    "fee_status",
+    "enrollment_status",
+    "tutor",
+)
+
+# Tables are created without constraints, which are added as indexes after the load.
+_TABLES = (
+    "CREATE TABLE students ("
+    + ", ".join(f"{column} TEXT NOT NULL" for column in STUDENT_COLUMNS)
+    + ")",
+    "CREATE TABLE marks ("
+    "username TEXT NOT NULL REFERENCES students (username), "
+    "assignment INTEGER NOT NULL, "
+    "mark REAL)",
+)
+_INDEXES = (
+    "CREATE UNIQUE INDEX students_username ON students (username)",
+    "CREATE UNIQUE INDEX students_cid ON students (cid)",
+    "CREATE UNIQUE INDEX marks_username_assignment ON marks (username, assignment)",
+)
+
+
+def load_sqlite(
+    path, n_students, n_assignments=5, seed=None, distribution=None, chunk_size=None
+):
+    """Generate a cohort with marks and load it into an SQLite database.
+
+    Students are generated as in ``fm.cohort`` and loaded into the ``students`` table
+    with one row per student. Marks of ``n_assignments`` assignments are generated as
+    in ``fm.gradebook`` and loaded into the normalised ``marks`` table with columns
+    ``username``, ``assignment`` (numbered from 1) and ``mark`` (``NULL`` for missing
+    marks).
+
+    Students and their marks are generated and inserted in chunks of ``chunk_size``
+    students, one transaction per chunk, so that the dataframes of students and
+    marks are bounded by ``chunk_size``. Values of unique columns (usernames, CIDs
+    and emails) of each chunk differ from the values in previous chunks, which are
+    kept in sets, so that memory use still grows linearly with ``n_students``, but
+    much more slowly than for the full dataframes. Rows are inserted with
+    ``executemany`` from column lists into tables without constraints. The database
+    uses write-ahead logging (WAL) and unique indexes on ``students(username)``,
+    ``students(cid)`` and ``marks(username, assignment)`` are built after the load,
+    which is much faster than maintaining them during inserts.
+
+    Parameters
+    ----------
+    path: str, os.PathLike
+
+        Path to the database. The database must not contain ``students`` and
+        ``marks`` tables.
+
+    n_students: int
+
+        Number of students.
+
+    n_assignments: int
+
+        Number of assignments.
+
+    seed: int, optional
+
+        Seed of the random number generator. For the same seed and ``chunk_size``,
+        the database is the same. If all students fit in one chunk, the ``students``
+        table contains the cohort generated by ``fm.cohort(n_students, rng=seed)``.
+
+    distribution: fm.distributions.TruncatedNormal, NormalMixture, Beta, Empirical
+
+        Distribution of marks. If not provided, the default distribution of
+        ``fm.marks`` is used.
+
+    chunk_size: int, optional
+
+        Number of students inserted in one transaction. Defaults to ``CHUNK_SIZE``.
+
+    Raises
+    ------
+    sqlite3.OperationalError
+
+        If the database already contains ``students`` or ``marks`` tables.
+
+    Examples
+    --------
+    >>> import sqlite3
+    >>> import tempfile
+    >>> import fakeitmakeit as fm
+    ...
+    >>> with tempfile.TemporaryDirectory() as tmp:
+    ...     fm.load_sqlite(f"{tmp}/cohort.db", n_students=100, n_assignments=3, seed=0)
+    ...     con = sqlite3.connect(f"{tmp}/cohort.db")
+    ...     con.execute("SELECT COUNT(*) FROM marks").fetchone()
+    ...     con.close()
+    (300,)
+
+    """
+    rng = fmu.get_rng(seed)
+    chunk_size = chunk_size or CHUNK_SIZE
+
+    # Values of unique columns in the chunks generated so far.
+    taken = {
+        column.name: set() for column in fms.COHORT_SCHEMA.columns if column.unique
+    }
+    schema = fms._taking(fms.COHORT_SCHEMA, taken)
+
+    con = sqlite3.connect(path, isolation_level=None)
+    try:
+        con.execute("PRAGMA journal_mode = WAL")
+        con.execute("PRAGMA synchronous = NORMAL")
+        for table in _TABLES:
+            con.execute(table)
+
+        insert_student = (
+            f"INSERT INTO students VALUES ({', '.join('?' * len(STUDENT_COLUMNS))})"
+        )
+        for start in range(0, n_students, chunk_size):
+            n = min(chunk_size, n_students - start)
+            cohort = schema.generate(n, rng=rng, taken=taken).reset_index()
+            marks = fmf.marks(
+                n * n_assignments, distribution=distribution, rng=rng
+            ).reshape(n, n_assignments)
+            columns = {column: cohort[column].tolist() for column in STUDENT_COLUMNS}
+
+            con.execute("BEGIN")
+            con.executemany(insert_student, zip(*columns.values(), strict=True))
+            con.executemany(
+                "INSERT INTO marks VALUES (?, ?, ?)",
+                _marks(columns["username"], marks),
+            )
+            con.execute("COMMIT")
+
+            for name, values in taken.items():
+                values.update(columns[name])
+
+        for index in _INDEXES:
+            con.execute(index)
+    finally:
+        con.close()
+
+
+def _marks(usernames, marks):
+    """Rows ``(username, assignment, mark)`` of a 2D array of ``marks``."""
+    n_assignments = marks.shape[1]
+    values = marks.ravel().astype(object)
+    values[np.isnan(marks.ravel())] = None
+    return zip(
+        np.repeat(np.array(usernames, dtype=object), n_assignments).tolist(),
+        np.tile(np.arange(1, n_assignments + 1), len(usernames)).tolist(),
+        values.tolist(),
+        strict=True,
+    )
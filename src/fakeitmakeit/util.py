@@ -1,51 +1,327 @@
-import random
-from dataclasses import dataclass
+import graphlib
+import importlib
+import json
+import os
+import threading
+import unicodedata
+from dataclasses import asdict, dataclass, field
 
-import faker
-import pycountry
+import numpy as np
 
 # Distributions.
 GENDERS = {"male": 0.49, "female": 0.5, "nonbinary": 0.01}
 TITLES = ["Mr", "Ms", "Mrs", "Miss", "Mx"]
 COURSES = {"acse": 0.4, "edsml": 0.4, "gems": 0.2}
-COUNTRIES = {country.name: 1 for country in pycountry.countries}
 
 
-# Country-locale mapping.
-# Exposed as mapping instead of a function for performance reasons.
-COUNTRY_LOCALE = {}
-for country in COUNTRIES:
-    for locale in faker.config.AVAILABLE_LOCALES:
-        if pycountry.countries.get(name=country).alpha_2 in locale:
-            COUNTRY_LOCALE[country] = locale
-            break
+def _countries():
+    """Build ``COUNTRIES`` distribution."""
+    import pycountry
 
+    return {country.name: 1 for country in pycountry.countries}
 
-def discrete_draw(distribution):
+
+def _country_locale():
+    """Build ``COUNTRY_LOCALE`` mapping."""
+    import faker.config
+    import pycountry
+
+    # Exposed as mapping instead of a function for performance reasons.
+    country_locale = {}
+    for country in __getattr__("COUNTRIES"):
+        for locale in faker.config.AVAILABLE_LOCALES:
+            if pycountry.countries.get(name=country).alpha_2 in locale:
+                country_locale[country] = locale
+                break
+
+    return country_locale
+
+
+# Default random number generator, used when a generator is not passed explicitly.
+_RNG = np.random.default_rng()
+
+# Generators are not thread-safe, so threads other than the main thread get their own
+# default generators.
+_local = threading.local()
+
+
+def _reseed():
+    """Replace default generators with freshly seeded ones.
+
+    Forked processes inherit the state of default generators, so they are reseeded
+    in the child process. Otherwise, forked workers would generate the same data.
+
+    """
+    _RNG.bit_generator.state = np.random.default_rng().bit_generator.state
+    # Only the forking thread exists in the child process.
+    _local.__dict__.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed)
+
+# Country tables require pycountry and Faker, so they are built on first access.
+_LAZY = {"COUNTRIES": _countries, "COUNTRY_LOCALE": _country_locale}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = globals()[name] = _LAZY[name]()
+        return value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def optional_import(name):
+    """Import module ``name`` of an optional dependency.
+
+    Optional dependencies, ``pyarrow`` and ``polars``, are installed with the
+    ``arrow`` extra, e.g. ``pip install fakeitmakeit[arrow]``.
+
+    Parameters
+    ----------
+    name: str
+
+        Module name, e.g. ``"pyarrow.compute"``.
+
+    Returns
+    -------
+    module
+
+        Imported module.
+
+    Raises
+    ------
+    ImportError
+
+        If the optional dependency is not installed.
+
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        package = name.split(".")[0]
+        raise ImportError(
+            f"{package!r} is required, install it with the 'arrow' extra: "
+            "pip install 'fakeitmakeit[arrow]'."
+        ) from e
+
+
+def get_rng(rng=None):
+    """Get a random number generator.
+
+    Parameters
+    ----------
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator of
+        the current thread is returned.
+
+    Returns
+    -------
+    np.random.Generator
+
+        Random number generator.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    >>> fm.util.get_rng(42).integers(10)
+    np.int64(0)
+
+    """
+    if rng is not None:
+        return np.random.default_rng(rng)
+    elif threading.current_thread() is threading.main_thread():
+        return _RNG
+    elif (res := getattr(_local, "rng", None)) is None:
+        res = _local.rng = np.random.default_rng()
+    return res
+
+
+def permute(values, n, key):
+    """Keyed pseudo-random permutation of ``range(n)``.
+
+    Each value in ``range(n)`` is mapped to a unique value in ``range(n)``. The mapping
+    is a 4-round Feistel network with cycle walking, whose round function is a hash of
+    the ``key``, so different keys give different permutations. It is a pure function
+    of its arguments and it is vectorized over ``values``.
+
+    Parameters
+    ----------
+    values: array_like
+
+        Values in ``range(n)``.
+
+    n: int
+
+        Size of the permuted range.
+
+    key: int
+
+        Key of the permutation, ``0 <= key < 2**64``.
+
+    Returns
+    -------
+    np.ndarray
+
+        Permuted values.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    >>> fm.util.permute([0, 1, 2], n=10, key=42)  # doctest: +SKIP
+    array([7, 2, 9], dtype=uint64)
+    >>> sorted(fm.util.permute(range(10), n=10, key=42).tolist())
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+    """
+    res = np.array(values, dtype=np.uint64, ndmin=1)
+    if ((res >= n) | (np.asarray(values) < 0)).any():
+        raise ValueError(f"Values must be in range({n}).")
+
+    # Both halves of the Feistel network have the same number of bits.
+    half = max(1, (int(n) - 1).bit_length() + 1) // 2
+    mask = np.uint64((1 << half) - 1)
+
+    # Apply the permutation of range(2**(2*half)) until the values are in range(n).
+    todo = np.ones(res.shape, dtype=bool)
+    while todo.any():
+        left, right = res[todo] >> np.uint64(half), res[todo] & mask
+        for round_ in range(4):
+            left, right = right, left ^ (_mix(right, key, round_) & mask)
+        res[todo] = (left << np.uint64(half)) | right
+        todo = res >= n
+
+    return res
+
+
+def _mix(values, key, round_):
+    """Hash of ``values`` combined with ``key`` and ``round_`` (SplitMix64)."""
+    seed = (key * 0x9E3779B97F4A7C15 + (round_ + 1) * 0xBF58476D1CE4E5B9) % 2**64
+    z = values ^ np.uint64(seed)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def discrete_draw(distribution, rng=None, size=None):
     """Draw a value from a discrete distribution.
 
+    If ``size`` is provided, an array of ``size`` values is drawn at once.
+
     Parameters
     ----------
     distribution: dict
 
         Dictionary with keys being possible outputs and values their probabilities.
 
+    rng: np.random.Generator, int, optional
+
+        Random number generator or a seed. If not provided, the default generator is
+        used.
+
+    size: int, optional
+
+        Number of values to draw.
+
     Returns
     -------
-    str
+    str, np.ndarray
 
-        Randomly selected value.
+        Randomly selected value or an object array of ``size`` values.
 
     Examples
     --------
     >>> import fakeitmakeit as fm
     >>> fm.util.discrete_draw({"a": 0.5, "b": 0.5})  # doctest: +SKIP
     'a'
+    >>> fm.util.discrete_draw({"a": 0.5, "b": 0.5}, size=3)  # doctest: +SKIP
+    array(['b', 'a', 'a'], dtype=object)
 
     """
     values = list(distribution.keys())
-    probabilities = list(distribution.values())
-    return random.choices(values, weights=probabilities, k=1)[0]
+    cumulative = np.cumsum(list(distribution.values()), dtype=float)
+    u = get_rng(rng).random(size) * cumulative[-1]
+    if size is None:
+        return values[np.searchsorted(cumulative, u, side="right")]
+    return np.array(values, dtype=object)[np.searchsorted(cumulative, u, side="right")]
+
+
+def _letters(lowercase, replacements):
+    """Map ``lowercase`` letters and their uppercase versions to ``replacements``."""
+    res = dict(zip(lowercase, replacements, strict=True))
+    return res | {
+        c.upper(): r.capitalize()
+        for c, r in res.items()
+        if len(c.upper()) == 1 and not c.upper().isascii()
+    }
+
+
+# ASCII replacements of letters which are not letters with diacritics. Letters with
+# diacritics, e.g. "é", are transliterated by removing the diacritics.
+TRANSLITERATION = (
+    _letters(
+        "ßæœøłđðþıəħŋ",
+        ("ss", "ae", "oe", "o", "l", "d", "d", "th", "i", "e", "h", "ng"),
+    )
+    | _letters(
+        "абвгґдеёєжзиіїйклмнопрстуфхцчшщъыьэюя",
+        (
+            "a", "b", "v", "g", "g", "d", "e", "yo", "ye", "zh", "z", "i", "i", "yi",
+            "y", "k", "l", "m", "n", "o", "p", "r", "s", "t", "u", "f", "kh", "ts",
+            "ch", "sh", "shch", "", "y", "", "e", "yu", "ya",
+        ),
+    )
+    | _letters(
+        "αβγδεζηθικλμνξοπρσςτυφχψω",
+        (
+            "a", "v", "g", "d", "e", "z", "i", "th", "i", "k", "l", "m", "n", "x",
+            "o", "p", "r", "s", "s", "t", "y", "f", "ch", "ps", "o",
+        ),
+    )
+)  # fmt: skip
+_TRANSLITERATION_TABLE = str.maketrans(TRANSLITERATION)
+
+
+def transliterate(value):
+    """Transliterate ``value`` to ASCII where possible.
+
+    Letters in ``TRANSLITERATION`` are replaced by their ASCII replacements and
+    diacritics are removed from the other letters. Characters which cannot be
+    transliterated, e.g. Chinese characters, are kept.
+
+    Parameters
+    ----------
+    value: str
+
+        Value to transliterate.
+
+    Returns
+    -------
+    str
+
+        Transliterated value.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.util.transliterate("Zoë Müller")
+    'Zoe Muller'
+    >>> fm.util.transliterate("Łukasz Wąż")
+    'Lukasz Waz'
+    >>> fm.util.transliterate("Анна Иванова")
+    'Anna Ivanova'
+
+    """
+    # Letters are replaced before and after diacritics are removed, so that e.g. "й"
+    # is replaced as a whole and accented Greek letters as their base letters.
+    value = value.translate(_TRANSLITERATION_TABLE)
+    value = "".join(
+        c for c in unicodedata.normalize("NFKD", value) if not unicodedata.combining(c)
+    )
+    return value.translate(_TRANSLITERATION_TABLE)
 
 
 @dataclass
@@ -68,13 +344,355 @@ class Student:
     tutor: str
 
 
+# Columns of a cohort sampled from cohort-specific distributions.
+BIAS_COLUMNS = ("gender", "course", "nationality")
+
+
+@dataclass(frozen=True)
+class ConditionalTable:
+    """A conditional probability table of a cohort column given another column.
+
+    Parameters
+    ----------
+    given: str
+
+        Name of the parent column, e.g. ``"nationality"``.
+
+    table: dict
+
+        Keys are values of the parent column and values are distributions of the
+        column (dictionaries of relative probabilities) given the parent value.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> fm.util.ConditionalTable("course", {"gems": {"male": 1, "female": 1}})
+    ConditionalTable(given='course', table={'gems': {'male': 1, 'female': 1}})
+
+    """
+
+    given: str
+    table: dict
+
+    def __post_init__(self):
+        """Track changes of the table (see ``_Tracked``)."""
+        object.__setattr__(self, "table", _track(self.table))
+
+
+class _Tracked(dict):
+    """A dictionary which counts changes of its contents.
+
+    Nested dictionaries are tracked too. ``CohortBias`` compiles its distributions
+    again only after they change, without comparing their contents on every call.
+
+    """
+
+    # Number of changes of all tracked dictionaries and fields.
+    changes = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for key, value in self.items():
+            super().__setitem__(key, _track(value))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, _track(value))
+        _Tracked.changes += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        _Tracked.changes += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args):
+        _Tracked.changes += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        _Tracked.changes += 1
+        return super().popitem()
+
+    def clear(self):
+        _Tracked.changes += 1
+        super().clear()
+
+
+def _track(value):
+    """Wrap dictionary ``value`` into ``_Tracked``."""
+    if isinstance(value, dict) and not isinstance(value, _Tracked):
+        return _Tracked(value)
+    return value
+
+
+@dataclass(frozen=True)
+class _CompiledTable:
+    """Distributions of a column compiled into one array of cumulative weights.
+
+    Row ``i`` of the table are normalised cumulative weights shifted by ``i``, so that
+    all rows are sampled with one ``searchsorted`` of ``row + uniform``.
+
+    """
+
+    values: np.ndarray
+    rows: dict
+    cumulative: np.ndarray
+
+    @classmethod
+    def compile(cls, distributions, parents=()):
+        """Compile a list of distributions, one per row, of ``parents`` values."""
+        values = list(dict.fromkeys(v for d in distributions for v in d))
+        weights = np.array(
+            [[d.get(v, 0) for v in values] for d in distributions], dtype=float
+        )
+        if (weights < 0).any() or not (weights.sum(axis=1) > 0).all():
+            raise ValueError("Weights must be non-negative with a positive sum.")
+        cumulative = np.cumsum(weights, axis=1)
+        cumulative = cumulative / cumulative[:, -1:] + np.arange(len(weights))[:, None]
+        cumulative[:, -1] = np.arange(1, len(weights) + 1)
+        rows = {parent: i for i, parent in enumerate(parents)}
+        return cls(np.array(values, dtype=object), rows, cumulative.ravel())
+
+    def sample(self, rows, rng):
+        """Sample a value from row ``rows[i]`` for each ``i``."""
+        i = np.searchsorted(self.cumulative, rows + rng.random(len(rows)), "right")
+        return self.values[i - rows * len(self.values)]
+
+
 @dataclass
 class CohortBias:
-    """A dataclass for grouping cohort-specific distributions."""
+    """A dataclass for grouping cohort-specific distributions.
+
+    ``gender`` and ``course`` are distributions of students' genders and courses and
+    ``country_bias`` are weights added to the uniform distribution of countries
+    (``COUNTRIES``). ``conditionals`` add joint structure: keys are columns in
+    ``BIAS_COLUMNS`` and values are ``ConditionalTable`` objects (or dictionaries
+    with their fields). A column with a conditional table is drawn after its parent
+    column, from the distribution given the parent value. Parent values which are not
+    in the table use the marginal distribution.
+
+    Distributions are compiled into cumulative weights on first use, so that columns
+    are sampled in one batch per column (see ``sample``). Fields are tracked, so they
+    are compiled again only after they are replaced or modified in place.
+
+    Examples
+    --------
+    >>> import fakeitmakeit as fm
+    ...
+    >>> bias = fm.util.CohortBias(
+    ...     gender={"male": 1, "female": 1},
+    ...     course={"acse": 1, "gems": 1},
+    ...     country_bias={},
+    ...     conditionals={
+    ...         "gender": {"given": "course", "table": {"gems": {"female": 1}}},
+    ...     },
+    ... )
+    >>> res = bias.sample(100, rng=0)
+    >>> set(res["gender"][res["course"] == "gems"])
+    {'female'}
+
+    """
 
     gender: dict
     course: dict
     country_bias: dict
+    conditionals: dict = field(default_factory=dict)
+
+    def __setattr__(self, name, value):
+        """Track changes of fields (see ``_Tracked``)."""
+        super().__setattr__(name, _track(value))
+        _Tracked.changes += 1
+
+    def __post_init__(self):
+        """Convert and validate conditional tables."""
+        self.conditionals = {
+            column: table
+            if isinstance(table, ConditionalTable)
+            else ConditionalTable(**table)
+            for column, table in self.conditionals.items()
+        }
+        for column, table in self.conditionals.items():
+            if column not in BIAS_COLUMNS or table.given not in BIAS_COLUMNS:
+                raise ValueError(f"Columns must be in {BIAS_COLUMNS}.")
+        # Compile the order of columns to detect circular dependencies early.
+        self.order()
+
+    def order(self):
+        """Columns in the order in which they are sampled.
+
+        Returns
+        -------
+        tuple[str]
+
+            Columns in ``BIAS_COLUMNS``, each after its parent column.
+
+        Raises
+        ------
+        ValueError
+
+            If conditional tables have circular dependencies.
+
+        """
+        sorter = graphlib.TopologicalSorter(
+            {
+                column: [self.conditionals[column].given]
+                if column in self.conditionals
+                else []
+                for column in BIAS_COLUMNS
+            }
+        )
+        try:
+            return tuple(sorter.static_order())
+        except graphlib.CycleError as e:
+            raise ValueError(f"Circular conditionals: {e.args[1]}.") from None
+
+    def marginals(self):
+        """Marginal distributions of the columns in ``BIAS_COLUMNS``.
+
+        Returns
+        -------
+        dict[str, dict]
+
+            Distributions by column names.
+
+        """
+        return {
+            "gender": self.gender,
+            "course": self.course,
+            "nationality": __getattr__("COUNTRIES") | self.country_bias,
+        }
+
+    def _compiled(self):
+        """Order of columns and their compiled distributions (see ``_CompiledTable``).
+
+        They are reused until any tracked field changes (see ``_Tracked``).
+
+        """
+        cached = self.__dict__.get("_compiled_cache")
+        if cached is None or cached[0] != _Tracked.changes:
+            cached = self.__dict__["_compiled_cache"] = (
+                _Tracked.changes,
+                self.order(),
+                self._compile(self.marginals()),
+            )
+        return cached[1:]
+
+    def _compile(self, marginals):
+        """Compile ``marginals`` and conditional tables."""
+        res = {}
+        for column, marginal in marginals.items():
+            if (conditional := self.conditionals.get(column)) is None:
+                res[column] = _CompiledTable.compile([marginal])
+            else:
+                # The marginal distribution is the last row.
+                res[column] = _CompiledTable.compile(
+                    [*conditional.table.values(), marginal], parents=conditional.table
+                )
+        return res
+
+    def sample(self, n, rng=None, given=None):
+        """Sample ``n`` values of each column in ``BIAS_COLUMNS``.
+
+        Columns are sampled in one batch each: parent columns first and then the
+        columns conditional on them, with the distribution of each row selected by
+        the parent value.
+
+        Parameters
+        ----------
+        n: int
+
+            Number of values.
+
+        rng: np.random.Generator, int, optional
+
+            Random number generator or a seed. If not provided, the default generator
+            is used.
+
+        given: dict, optional
+
+            Known values of some columns, which are not sampled but other columns are
+            conditional on them.
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+
+            Object arrays of values by column names.
+
+        """
+        rng = get_rng(rng)
+        res = {
+            column: np.asarray(values, dtype=object)
+            for column, values in (given or {}).items()
+        }
+
+        order, compiled = self._compiled()
+        for column in order:
+            if column in res:
+                continue
+            table = compiled[column]
+            rows = np.zeros(n, dtype=np.intp)
+            if column in self.conditionals:
+                parents, inverse = np.unique(
+                    res[self.conditionals[column].given], return_inverse=True
+                )
+                # Parent values which are not in the table use the marginal row.
+                default = len(table.rows)
+                rows = np.array(
+                    [table.rows.get(p, default) for p in parents.tolist()],
+                    dtype=np.intp,
+                )[inverse]
+            res[column] = table.sample(rows, rng)
+
+        return res
+
+    @classmethod
+    def from_json(cls, path):
+        """Load a cohort bias profile from a JSON file.
+
+        The file contains an object with ``gender``, ``course``, ``country_bias``
+        and (optionally) ``conditionals`` fields (see ``to_json``).
+
+        Parameters
+        ----------
+        path: str, os.PathLike
+
+            Path to the JSON file.
+
+        Returns
+        -------
+        CohortBias
+
+            Cohort bias.
+
+        """
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def to_json(self, path):
+        """Save the cohort bias profile to a JSON file.
+
+        Parameters
+        ----------
+        path: str, os.PathLike
+
+            Path to the JSON file.
+
+        """
+        with open(path, "w") as f:
+            json.dump(asdict(self), f, indent=2)
 
 
 cohort_bias = CohortBias(
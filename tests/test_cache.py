@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fakeitmakeit as fm
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("FAKEITMAKEIT_CACHE_DIR", str(tmp_path))
+    return tmp_path / "datasets"
+
+
+class TestCached:
+    def test_hit(self, cache):
+        # Check that the cached cohort is the same as the generated one.
+        cohort = fm.cached(fm.cohort)
+        res = cohort(50, rng=0)
+        assert len(list(cache.glob("*.arrow"))) == 1
+        pd.testing.assert_frame_equal(cohort(50, rng=0), res)
+        pd.testing.assert_frame_equal(res, fm.cohort(50, rng=0))
+
+    def test_arguments(self, cache):
+        # Check that calls with different arguments are cached separately.
+        assignment = fm.cached(fm.assignment)
+        usernames = ["abc123", "xyz321"]
+        res = assignment(usernames, rng=0)
+        assert not res.equals(assignment(usernames, mean=80, rng=0))
+        assert not res.equals(assignment(usernames, rng=1))
+        assert len(list(cache.glob("*.arrow"))) == 3
+        pd.testing.assert_series_equal(assignment(usernames, rng=0), res)
+
+    def test_unseeded(self, cache):
+        # Check that calls without a seed are not cached.
+        fm.cached(fm.cohort)(10)
+        fm.cached(fm.cohort)(10, rng=fm.util.get_rng(0))
+        assert not list(cache.glob("*.arrow"))
+
+    def test_distribution(self, cache):
+        # Check that distributions are part of the key.
+        gradebook = fm.cached(fm.gradebook)
+        res = gradebook(["abc123"], distribution=fm.distributions.Beta(2, 2), rng=0)
+        other = gradebook(["abc123"], distribution=fm.distributions.Beta(5, 2), rng=0)
+        assert not res.equals(other)
+
+    def test_cohort_bias(self, cache, monkeypatch):
+        # Check that a changed cohort bias is not served from the cache.
+        cohort = fm.cached(fm.cohort)
+        cohort(50, rng=0)
+        bias = fm.util.CohortBias(
+            gender={"female": 1}, course={"gems": 1}, country_bias={}
+        )
+        monkeypatch.setattr(fm.util, "cohort_bias", bias)
+        res = cohort(50, rng=0)
+        assert len(list(cache.glob("*.arrow"))) == 2
+        assert set(res["gender"]) == {"female"}
+
+    def test_long_arguments(self, cache):
+        # Check that arguments with truncated representations are hashed exactly.
+        usernames = pd.Index(fm.cohort(300, rng=0).index, name="username")
+        reordered = usernames[np.r_[0:100, 199:99:-1, 200:300]]
+        gradebook = fm.cached(fm.gradebook)
+        gradebook(usernames, n=2, rng=0)
+        res = gradebook(reordered, n=2, rng=0)
+        assert res.index.equals(reordered)
+        assert len(list(cache.glob("*.arrow"))) == 2
+
+    def test_empirical(self, cache):
+        # Check that distributions are hashed by all their values.
+        values = np.linspace(0, 100, 2001)
+        other = values.copy()
+        other[1000] += 0.01
+        gradebook = fm.cached(fm.gradebook)
+        gradebook(["abc123"], distribution=fm.distributions.Empirical(values), rng=0)
+        gradebook(["abc123"], distribution=fm.distributions.Empirical(other), rng=0)
+        assert len(list(cache.glob("*.arrow"))) == 2
+
+    def test_uncacheable(self, cache):
+        # Check that arguments which cannot be hashed exactly are not cached.
+        res = fm.cached(fm.gradebook)(iter(["abc123", "xyz321"]), n=1, rng=0)
+        assert res.index.tolist() == ["abc123", "xyz321"]
+        assert not list(cache.glob("*.arrow"))
+
+    def test_pyarrow(self):
+        # Check that pyarrow tables are cached.
+        cohort = fm.cached(fm.cohort)
+        res = cohort(20, rng=0, backend="pyarrow")
+        assert isinstance(cohort(20, rng=0, backend="pyarrow"), pa.Table)
+        assert cohort(20, rng=0, backend="pyarrow").equals(res)
+
+    def test_corrupted(self, cache):
+        # Check that corrupted results are generated again.
+        cohort = fm.cached(fm.cohort)
+        cohort(10, rng=0)
+        (path,) = cache.glob("*.arrow")
+        path.write_bytes(b"corrupted")
+        pd.testing.assert_frame_equal(cohort(10, rng=0), fm.cohort(10, rng=0))
+
+    def test_eviction(self, cache):
+        # Check that the least recently used results are evicted.
+        cohort = fm.cached(fm.cohort)
+        cohort(10, rng=0)
+        (first,) = cache.glob("*.arrow")
+        size = first.stat().st_size
+
+        cohort = fm.cached(fm.cohort, max_size=int(2.5 * size))
+        cohort(10, rng=1)
+        # The first result is used again, so the second one is evicted.
+        cohort(10, rng=0)
+        cohort(10, rng=2)
+        assert first.exists()
+        assert len(list(cache.glob("*.arrow"))) == 2
+
+    def test_clear(self, cache):
+        # Check that clear removes all results.
+        fm.cached(fm.cohort)(10, rng=0)
+        fm.cache.clear()
+        assert not list(cache.glob("*.arrow"))
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+import fakeitmakeit.distributions as fmd
+
+DISTRIBUTIONS = [
+    fmd.TruncatedNormal(65, 10),
+    fmd.NormalMixture(means=(45, 75), stds=(8, 6)),
+    fmd.Beta(6.5, 3.5),
+    fmd.Empirical((30, 55, 65, 72, 95)),
+]
+
+
+@pytest.mark.parametrize("dist", DISTRIBUTIONS)
+class TestSample:
+    def test_range(self, dist):
+        # Check that all marks are between 0 and 100.
+        res = dist.sample(10_000, rng=0)
+        assert res.shape == (10_000,)
+        assert ((0 <= res) & (res <= 100)).all()
+
+    def test_rng(self, dist):
+        # Check that samples are reproducible.
+        assert (dist.sample(100, rng=1) == dist.sample(100, rng=1)).all()
+
+
+class TestTruncatedNormal:
+    def test_moments(self):
+        # Check that the mean and standard deviation are as expected.
+        res = fmd.TruncatedNormal(65, 10).sample(100_000, rng=0)
+        assert 64.5 <= res.mean() <= 65.5
+        assert 9.5 <= res.std() <= 10.5
+
+    def test_no_clipping(self):
+        # Check that there is no probability mass on the bounds.
+        res = fmd.TruncatedNormal(95, 10).sample(100_000, rng=0)
+        assert (res == 100).sum() == 0
+
+    @pytest.mark.parametrize("mean", [-50, 150])
+    def test_tail(self, mean):
+        # Check that the marks are in range when the mean is far outside it.
+        res = fmd.TruncatedNormal(mean, 5).sample(1000, rng=0)
+        assert ((0 <= res) & (res <= 100)).all()
+        assert (res < 5).all() if mean < 0 else (res > 95).all()
+
+    def test_invalid(self):
+        # Check the exception is raised for non-positive std.
+        with pytest.raises(ValueError):
+            fmd.TruncatedNormal(65, 0)
+
+
+class TestNormalMixture:
+    def test_bimodal(self):
+        # Check that marks are drawn from both components.
+        dist = fmd.NormalMixture(means=(30, 80), stds=(3, 3), weights=(1, 3))
+        res = dist.sample(10_000, rng=0)
+        assert 0.22 <= (res < 55).mean() <= 0.28
+
+    def test_invalid(self):
+        # Check the exception is raised for invalid parameters.
+        with pytest.raises(ValueError):
+            fmd.NormalMixture(means=(30, 80), stds=(3,))
+        with pytest.raises(ValueError):
+            fmd.NormalMixture(means=(30, 80), stds=(3, 3), weights=(0, 0))
+
+
+class TestBeta:
+    def test_from_mean_std(self):
+        # Check that the mean and standard deviation are as expected.
+        res = fmd.Beta.from_mean_std(65, 10).sample(100_000, rng=0)
+        assert 64.5 <= res.mean() <= 65.5
+        assert 9.5 <= res.std() <= 10.5
+
+    def test_invalid(self):
+        # Check the exception is raised for invalid parameters.
+        with pytest.raises(ValueError):
+            fmd.Beta(0, 1)
+        with pytest.raises(ValueError):
+            fmd.Beta.from_mean_std(65, 50)
+
+
+class TestEmpirical:
+    def test_from_histogram(self):
+        # Check that the fractions of marks in bins are as expected.
+        dist = fmd.Empirical.from_histogram((0, 40, 60, 100), (1, 0, 3))
+        res = dist.sample(10_000, rng=0)
+        assert ((40 < res) & (res < 60)).sum() == 0
+        assert 0.22 <= (res <= 40).mean() <= 0.28
+
+    def test_from_histogram_fractions(self):
+        # Check that fractions whose cumulative sum is rounded are accepted.
+        dist = fmd.Empirical.from_histogram(np.linspace(0, 100, 11), [0.1] * 10)
+        assert dist.probabilities[-1] == 1
+        assert 0.08 <= (dist.sample(10_000, rng=0) <= 10).mean() <= 0.12
+
+    def test_from_marks(self):
+        # Check that the quantiles of the sample are preserved.
+        marks = fmd.Beta(6.5, 3.5).sample(10_000, rng=0)
+        res = fmd.Empirical.from_marks([*marks, np.nan]).sample(10_000, rng=1)
+        assert abs(np.median(res) - np.median(marks)) < 1
+
+    def test_invalid(self):
+        # Check the exception is raised for invalid quantile tables.
+        with pytest.raises(ValueError):
+            fmd.Empirical((50, 40))
+        with pytest.raises(ValueError):
+            fmd.Empirical((0, 120))
+        with pytest.raises(ValueError):
+            fmd.Empirical((0, 50, 100), probabilities=(0, 0.5, 0.9))
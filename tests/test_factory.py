@@ -1,4 +1,5 @@
 import collections
+import concurrent.futures
 import re
 
 import numpy as np
@@ -238,6 +239,38 @@ class TestEmail:
         assert fm.isvalid.email(fm.email())
 
 
+class TestEmails:
+    def test_type(self):
+        # Check that emails are returned as an array of strings.
+        res = fm.emails(10)
+        assert isinstance(res, np.ndarray)
+        assert len(res) == 10
+        assert all(isinstance(value, str) for value in res)
+
+    def test_domain(self):
+        # Check that all emails contain domain if specified.
+        assert all(value.endswith("@gmail.com") for value in fm.emails(10, "gmail.com"))
+
+    def test_unique(self):
+        # Check that emails are unique even if there are more emails than user names.
+        n = 2 * len(fm.pools.user_names())
+        assert len(set(fm.emails(n, domain="imperial.ac.uk"))) == n
+
+    def test_taken(self):
+        # Check that emails differ from the taken ones, even if all user names are.
+        taken = set(fm.emails(2 * len(fm.pools.user_names()), domain="imperial.ac.uk"))
+        res = fm.emails(1000, domain="imperial.ac.uk", taken=taken)
+        assert len(set(res) - taken) == 1000
+
+    def test_rng(self):
+        # Check that emails are reproducible with a seed.
+        assert (fm.emails(100, rng=42) == fm.emails(100, rng=42)).all()
+
+    def test_valid(self):
+        # Check that all emails are valid.
+        assert all(map(fm.isvalid.email, fm.emails(1000, domain="imperial.ac.uk")))
+
+
 class TestName:
     def test_type(self):
         # Check that name is a string.
@@ -300,6 +333,30 @@ class TestName:
         assert fm.isvalid.name(fm.name())
 
 
+class TestNames:
+    def test_pools(self):
+        # Check that each name comes from the pool of its locale and gender.
+        genders = ["male", "female", "male", "nonbinary", "female"]
+        countries = ["Germany", "Japan", "Germany", "China", "Malta"]
+        res = fm.names(genders, countries, rng=0)
+        assert len(res) == 5
+        for nameval, genderval, countryval in zip(res, genders, countries):
+            locale = fm.util.COUNTRY_LOCALE.get(countryval)
+            assert nameval in fm.pools.names(locale, genderval)
+
+    def test_rng(self):
+        # Check that names are reproducible.
+        genders, countries = ["male"] * 10, ["France"] * 10
+        assert (
+            fm.names(genders, countries, rng=1) == fm.names(genders, countries, rng=1)
+        ).all()
+
+    def test_invalid(self):
+        # Check the exception is raised for different lengths.
+        with pytest.raises(ValueError):
+            fm.names(["male"], ["France", "Spain"])
+
+
 class TestMark:
     def test_type(self):
         # Check that mark is a float.
@@ -357,12 +414,60 @@ class TestMark:
         assert fm.isvalid.mark(fm.mark())
 
 
+class TestMarks:
+    def test_type(self):
+        # Check that marks are an array of valid marks rounded to two decimals.
+        marks = fm.marks(1000, pnan=0.1)
+        assert marks.shape == (1000,)
+        assert all(fm.isvalid.mark(m) for m in marks)
+        assert (np.nan_to_num(marks) == np.nan_to_num(marks).round(2)).all()
+
+    def test_masking(self):
+        # Check that pfail and pnan are respected for any distribution.
+        dist = fm.distributions.Beta(2, 2)
+        marks = fm.marks(10_000, pfail=0.2, pnan=0.25, distribution=dist)
+        assert 0.17 <= (marks == 0).mean() <= 0.23
+        assert 0.17 <= np.isnan(marks).mean() <= 0.23
+
+    def test_distribution(self):
+        # Check that the distribution is used instead of mean and std.
+        dist = fm.distributions.Empirical((90, 100))
+        assert 90 <= fm.mark(mean=10, pfail=0, distribution=dist) <= 100
+        marks = fm.gradebook(["abc123", "xyz321"], pfail=0, distribution=dist)
+        assert (marks >= 90).all(axis=None)
+
+
 class TestFeedback:
     def test_type(self):
         # Check that feedback is a string.
         assert isinstance(fm.feedback(), str)
 
 
+class TestFeedbackBatch:
+    def test_type(self):
+        # Check that feedbacks are returned as an array of strings.
+        res = fm.feedback_batch(10)
+        assert isinstance(res, np.ndarray)
+        assert len(res) == 10
+        assert all(isinstance(value, str) and value for value in res)
+
+    def test_num_sentences(self):
+        # Check that the number of sentences is within the limits.
+        res = fm.feedback_batch(100, min_sentences=2, max_sentences=3)
+        assert all(2 <= value.count(".") <= 3 for value in res)
+
+    def test_rng(self):
+        # Check that feedbacks are reproducible with a seed.
+        assert (fm.feedback_batch(10, rng=42) == fm.feedback_batch(10, rng=42)).all()
+
+    def test_invalid_num_sentences(self):
+        # Check the exception is raised.
+        with pytest.raises(ValueError):
+            fm.feedback_batch(10, min_sentences=0)
+        with pytest.raises(ValueError):
+            fm.feedback_batch(10, min_sentences=3, max_sentences=2)
+
+
 class TestStudent:
     def test_type(self):
         # Check that the output is a Student dataclass.
@@ -376,6 +481,76 @@ class TestStudent:
         # Check that the repr string makes sense.
         assert "Student" in repr(fm.student())
 
+    def test_threads(self):
+        # Check that students can be generated concurrently from several threads.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            res = list(executor.map(lambda _: fm.student(), range(100)))
+        assert all(fm.isvalid.cid(student.cid) for student in res)
+
+
+class TestStudentAt:
+    def test_type(self):
+        # Check that the output is a Student dataclass.
+        assert isinstance(fm.student_at(0, 0), fm.util.Student)
+
+    def test_pure(self):
+        # Check that the student depends only on seed and index.
+        assert fm.student_at(1, 123) == fm.student_at(1, 123)
+        assert fm.student_at(1, 123) != fm.student_at(2, 123)
+        assert fm.student_at(1, 123) != fm.student_at(1, 124)
+
+    def test_valid(self):
+        # Check that CID and username are valid.
+        res = fm.student_at(0, fm.factory.MAX_STUDENTS - 1)
+        assert fm.isvalid.cid(res.cid)
+        assert fm.isvalid.username(res.username)
+        assert res.github == f"{res.course}-{res.username}"
+
+    def test_invalid(self):
+        # Check the exception is raised for invalid indices and seeds.
+        with pytest.raises(ValueError):
+            fm.student_at(0, -1)
+        with pytest.raises(ValueError):
+            fm.student_at(0, fm.factory.MAX_STUDENTS)
+        with pytest.raises(ValueError):
+            fm.student_at(-1, 0)
+
+
+class TestCohortSlice:
+    def test_slices(self):
+        # Check that slices are the same as the cohort generated at once.
+        df = fm.cohort_slice(7, 0, 30)
+        pd.testing.assert_frame_equal(
+            df.iloc[10:25], fm.cohort_slice(7, 10, 25), check_categorical=False
+        )
+
+    def test_blocks(self):
+        # Check that slices across blocks are the same as students generated one by
+        # one.
+        block = fm.factory.SLICE_BLOCK
+        df = fm.cohort_slice(7, block - 5, block + 5)
+        pd.testing.assert_frame_equal(
+            df.iloc[3:7],
+            fm.cohort_slice(7, block - 2, block + 2),
+            check_categorical=False,
+        )
+        for i, username in enumerate(df.index, start=block - 5):
+            res = fm.student_at(7, i)
+            assert res.username == username
+            assert res.personal_email == df.loc[username, "personal_email"]
+
+    def test_unique(self):
+        # Check that usernames and CIDs are unique across slices.
+        df = pd.concat(
+            [fm.cohort_slice(0, 0, 500), fm.cohort_slice(0, 10**6, 10**6 + 500)]
+        )
+        assert df.index.is_unique
+        assert df["cid"].is_unique
+
+    def test_isvalid(self):
+        # Check that the slice is a valid cohort.
+        assert fm.isvalid.cohort(fm.cohort_slice(3, 100, 150))
+
 
 class TestCohort:
     def test_type(self, cohort):
@@ -408,6 +583,57 @@ class TestCohort:
         # Check that CIDs are as expected.
         assert cohort["cid"].map(fm.isvalid.cid).all()
 
+    def test_columns(self):
+        # Check that only the selected columns are included.
+        res = fm.cohort(n=50, rng=0, columns=["title", "course"])
+        assert res.index.name == "username"
+        assert list(res.columns) == ["title", "course"]
+        assert fm.isvalid.cohort(res)
+
+    def test_columns_backend(self):
+        # Check that the username column is included with other backends.
+        res = fm.cohort(n=10, rng=0, columns=["course"], backend="numpy")
+        assert res.dtype.names == ("username", "course")
+
+    def test_tutors(self):
+        # Check that students are assigned to a pool of distinct tutors.
+        res = fm.cohort(n=200, rng=0, n_tutors=5)
+        assert isinstance(res["tutor"].dtype, pd.CategoricalDtype)
+        assert res["tutor"].nunique() == 5
+        assert fm.isvalid.cohort(res)
+
+    def test_tutor_load_balanced(self):
+        # Check that balanced tutors have the same number of students up to one.
+        res = fm.cohort(n=101, rng=0, n_tutors=10, tutor_load="balanced")
+        assert sorted(res["tutor"].value_counts().tolist()) == [10] * 9 + [11]
+
+    def test_tutor_load(self):
+        # Check that tutors are assigned proportionally to their loads.
+        res = fm.cohort(n=2000, rng=0, n_tutors=2, tutor_load=[1, 3])
+        counts = res["tutor"].value_counts()
+        assert 0.7 <= counts.iloc[0] / len(res) <= 0.8
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"n_tutors": 0},
+            {"n_tutors": 10_000},
+            {"tutor_load": "balanced"},
+            {"n_tutors": 2, "tutor_load": "heavy"},
+            {"n_tutors": 2, "tutor_load": [1, 2, 3]},
+            {"n_tutors": 2, "tutor_load": [0, 0]},
+        ],
+    )
+    def test_tutors_invalid(self, kwargs):
+        # Check the exception is raised for invalid tutor arguments.
+        with pytest.raises(ValueError):
+            fm.cohort(n=10, **kwargs)
+
+    def test_columns_invalid(self):
+        # Check the exception is raised for unknown columns.
+        with pytest.raises(ValueError):
+            fm.cohort(n=10, columns=["shoe_size"])
+
     def test_email(self, cohort):
         # Check that emails are as expected.
         assert cohort["email"].map(fm.isvalid.email).all()
@@ -416,6 +642,11 @@ class TestCohort:
         # Check that emails are as expected.
         assert cohort["personal_email"].map(fm.isvalid.email).all()
 
+    def test_email_unique(self, cohort):
+        # Check that emails are unique.
+        assert cohort["email"].is_unique
+        assert cohort["personal_email"].is_unique
+
     def test_title(self, cohort):
         # Check that titles are as expected.
         assert cohort["title"].map(fm.isvalid.title).all()
@@ -440,6 +671,99 @@ class TestCohort:
         # Check that the output is a DataFrame.
         assert fm.isvalid.cohort(cohort)
 
+    @pytest.mark.parametrize("threads", [1, 3, 8])
+    def test_threads(self, threads):
+        # Check that cohorts generated in threads are valid and reproducible.
+        res = fm.cohort(n=500, rng=0, threads=threads)
+        assert res.equals(fm.cohort(n=500, rng=0, threads=threads))
+        assert len(res) == 500
+        assert res.index.is_unique
+        assert res["cid"].is_unique
+        assert res["email"].is_unique
+        assert fm.isvalid.cohort(res)
+
+
+class TestCohortBackend:
+    @pytest.mark.parametrize("backend", ["polars", "pyarrow"])
+    def test_backend(self, backend):
+        # Check that cohorts built by other libraries have the same values.
+        pytest.importorskip(backend)
+        pytest.importorskip("pyarrow")
+        res = fm.cohort(n=50, rng=0, backend=backend)
+        expected = fm.cohort(n=50, rng=0)
+        assert type(res).__module__.startswith(backend)
+        assert fm.isvalid.cohort(res)
+
+        table = res.to_arrow() if backend == "polars" else res
+        assert table.column_names[0] == "username"
+        assert table["username"].to_pylist() == expected.index.tolist()
+        assert table["tutor"].to_pylist() == expected["tutor"].tolist()
+
+    def test_categorical(self):
+        # Check that categorical columns are dictionary-encoded in Arrow.
+        pa = pytest.importorskip("pyarrow")
+        res = fm.cohort(n=50, rng=0, backend="pyarrow")
+        assert pa.types.is_dictionary(res.schema.field("course").type)
+        assert pa.types.is_string(res.schema.field("cid").type)
+
+    def test_numpy(self):
+        # Check that structured arrays have the values of the cohort.
+        res = fm.cohort(n=50, rng=0, backend="numpy")
+        expected = fm.cohort(n=50, rng=0)
+        labels = fm.schema.categories(res)
+        assert res.dtype.names[0] == "username"
+        assert np.strings.decode(res["username"]).tolist() == expected.index.tolist()
+        assert labels["course"][res["course"]].tolist() == expected["course"].tolist()
+        assert res.dtype["course"] == np.uint8
+
+    def test_numpy_concatenate(self):
+        # Check that arrays of different cohorts share data types and lookup tables.
+        small = fm.cohort(n=5, rng=0, backend="numpy")
+        large = fm.cohort(n=500, rng=1, backend="numpy")
+        assert small.dtype == large.dtype
+        res = np.concatenate([small, large])
+        labels = fm.schema.COHORT_SCHEMA.categories()
+        expected = fm.cohort(n=500, rng=1)
+        assert (
+            labels["gender"][res["gender"][5:]].tolist() == expected["gender"].tolist()
+        )
+
+    def test_invalid(self):
+        # Check the exception is raised for unsupported backends.
+        with pytest.raises(ValueError):
+            fm.cohort(n=5, backend="excel")
+
+
+class TestExtendCohort:
+    def test_extend(self, cohort):
+        # Check that new students are appended and the cohort is not modified.
+        n = len(cohort)
+        res = fm.extend_cohort(cohort, k=50, rng=0)
+        assert len(res) == n + 50
+        assert len(cohort) == n
+        assert res.iloc[:n].astype(str).equals(cohort.astype(str))
+
+    def test_unique(self):
+        # Check that usernames, CIDs and emails remain unique.
+        res = fm.extend_cohort(fm.cohort(n=1000, rng=0), k=1000, rng=1)
+        assert res.index.is_unique
+        for col in ["cid", "email", "personal_email"]:
+            assert res[col].is_unique
+
+    def test_categories(self):
+        # Check that categorical columns remain categorical with unioned categories.
+        df = fm.cohort(n=5, rng=2)
+        res = fm.extend_cohort(df, k=100, rng=3)
+        for col in ["course", "gender", "title", "nationality", "fee_status"]:
+            assert isinstance(res[col].dtype, pd.CategoricalDtype)
+            assert set(df[col].cat.categories) <= set(res[col].cat.categories)
+        assert fm.isvalid.cohort(res)
+
+    def test_invalid(self):
+        # Check the exception is raised for a dataframe which is not a cohort.
+        with pytest.raises(ValueError):
+            fm.extend_cohort(pd.DataFrame({"a": [1]}), k=1)
+
 
 class TestAssignment:
     def test_type(self, assignment):
@@ -469,3 +793,17 @@ class TestAssignment:
     def test_nan(self, assignment):
         # Ensure that there are np.nan values in the assignment.
         assert assignment.isna().sum() > 0
+
+    @pytest.mark.parametrize("backend", ["polars", "pyarrow"])
+    def test_backend(self, cohort, backend):
+        # Check that assignments are built by other libraries with the same marks.
+        pytest.importorskip(backend)
+        pytest.importorskip("pyarrow")
+        res = fm.assignment(cohort.index, pnan=0.1, rng=0, backend=backend)
+        expected = fm.assignment(cohort.index, pnan=0.1, rng=0)
+        assert type(res).__module__.startswith(backend)
+        assert fm.isvalid.assignment(res)
+
+        table = res.to_arrow() if backend == "polars" else res
+        assert table["username"].to_pylist() == expected.index.tolist()
+        assert table["mark"].is_null().to_pylist() == expected.isna().tolist()
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+import fakeitmakeit as fm
+
+
+@pytest.fixture(scope="module")
+def cohort():
+    return fm.cohort(500, rng=0)
+
+
+@pytest.fixture(scope="module")
+def assignment(cohort):
+    return fm.assignment(cohort.index, rng=0)
+
+
+class TestCorrupt:
+    def test_rate(self, cohort):
+        # Check that the expected number of rows have exactly one fault.
+        res, mask = fm.corrupt(cohort, rate=0.1, rng=0)
+        assert list(mask.columns) == ["email", "name", "country", "duplicate"]
+        assert mask.sum(axis=1).isin([0, 1]).all()
+        assert mask.to_numpy().sum() == 50
+        assert res.shape == cohort.shape
+
+    def test_not_modified(self, cohort):
+        # Check that the input is not modified.
+        expected = cohort.copy()
+        fm.corrupt(cohort, rate=0.5, rng=0)
+        pd.testing.assert_frame_equal(cohort, expected)
+
+    @pytest.mark.parametrize("kind", ["email", "name", "country", "duplicate"])
+    def test_cohort_kind(self, cohort, kind):
+        # Check that each kind of fault alone makes the cohort invalid.
+        res, mask = fm.corrupt(cohort, rate=0.05, kinds=[kind], rng=0)
+        assert mask[kind].sum() == 25
+        assert not fm.isvalid.cohort(res)
+        assert fm.isvalid.cohort(res[~mask[kind].to_numpy()])
+
+    @pytest.mark.parametrize("kind", ["mark", "duplicate"])
+    def test_assignment_kind(self, assignment, kind):
+        # Check that each kind of fault alone makes the assignment invalid.
+        res, mask = fm.corrupt(assignment, rate=0.05, kinds=[kind], rng=0)
+        assert not fm.isvalid.assignment(res)
+        assert fm.isvalid.assignment(res[~mask[kind].to_numpy()])
+
+    def test_faults(self, cohort, assignment):
+        # Check the injected values.
+        res, mask = fm.corrupt(cohort, rate=0.2, rng=0)
+        assert res.loc[mask["email"].to_numpy(), "email"].str.contains(" at ").all()
+        names = res.loc[mask["name"].to_numpy(), "first_name"]
+        assert names.eq(names.str.lower()).all()
+        countries = res.loc[mask["country"].to_numpy(), "nationality"]
+        assert countries.isin(fm.faults.UNKNOWN_COUNTRIES).all()
+        assert (
+            res.index[mask["duplicate"].to_numpy()]
+            .isin(res.index[~mask.any(axis=1).to_numpy()])
+            .all()
+        )
+
+        res, mask = fm.corrupt(assignment, rate=0.2, rng=0)
+        assert not res[mask["mark"].to_numpy()].between(0, 100).any()
+
+    def test_seed(self, cohort):
+        # Check that the same seed gives the same faults.
+        res, mask = fm.corrupt(cohort, rate=0.1, rng=1)
+        other, other_mask = fm.corrupt(cohort, rate=0.1, rng=1)
+        pd.testing.assert_frame_equal(res, other)
+        pd.testing.assert_frame_equal(mask, other_mask)
+
+    def test_invalid(self, cohort, assignment):
+        # Check the exceptions are raised for invalid arguments.
+        with pytest.raises(ValueError):
+            fm.corrupt(cohort, rate=1.5)
+        with pytest.raises(ValueError):
+            fm.corrupt(cohort, rate=0.1, kinds=["mark"])
+        with pytest.raises(ValueError):
+            fm.corrupt(assignment, rate=0.1, kinds=["email"])
+        with pytest.raises(ValueError):
+            fm.corrupt(cohort, rate=1, kinds=["duplicate"])
@@ -426,8 +426,76 @@ class TestCohort:
         valid_cohort.loc["tf97", "first_name"] = "WRONG NAME"
         assert not fm.isvalid.cohort(valid_cohort)
 
+    def test_single_category(self, valid_cohort):
+        # Check that categorical columns with a single category are validated.
+        valid_cohort["enrollment_status"] = "enrolled"
+        valid_cohort["fee_status"] = pd.Categorical(["home"] * 3)
+        assert fm.isvalid.cohort(valid_cohort)
+
     def test_github(self, valid_cohort):
         course = valid_cohort.github.str.extract(r"(^.*?)\-", expand=False)
         username = valid_cohort.github.str.extract(r"\-(.*?$)", expand=False)
         assert course.map(fm.isvalid.course).all()
         assert username.map(fm.isvalid.username).all()
+
+
+class TestArrow:
+    @pytest.fixture(autouse=True)
+    def pyarrow(self):
+        return pytest.importorskip("pyarrow")
+
+    def test_cohort(self, pyarrow, valid_cohort):
+        # Check that Arrow tables and record batches of valid cohorts are valid.
+        table = pyarrow.Table.from_pandas(valid_cohort)
+        assert fm.isvalid.cohort(table)
+        assert fm.isvalid.cohort(table.to_batches()[0])
+
+    def test_cohort_invalid(self, pyarrow, valid_cohort, invalid_cohort):
+        # Check that invalid cohorts are invalid.
+        assert not fm.isvalid.cohort(pyarrow.Table.from_pandas(invalid_cohort))
+        valid_cohort.loc["tf97", "first_name"] = "WRONG NAME"
+        assert not fm.isvalid.cohort(pyarrow.Table.from_pandas(valid_cohort))
+
+    def test_cohort_username(self, pyarrow, valid_cohort):
+        # Check that cohorts without valid usernames are invalid.
+        valid_cohort.index = ["1", "2", "3"]
+        assert not fm.isvalid.cohort(pyarrow.Table.from_pandas(valid_cohort))
+        assert not fm.isvalid.cohort(
+            pyarrow.Table.from_pandas(valid_cohort, preserve_index=False)
+        )
+
+    def test_cohort_categorical(self, pyarrow):
+        # Check that generated cohorts with categorical columns are valid.
+        assert fm.isvalid.cohort(pyarrow.Table.from_pandas(fm.cohort(50, rng=0)))
+
+    def test_parquet(self, pyarrow, tmp_path):
+        # Check that Parquet files are validated batch by batch.
+        import pyarrow.parquet as pq
+
+        df = fm.cohort(100, rng=0)
+        path = tmp_path / "cohort.parquet"
+        df.to_parquet(path, row_group_size=30)
+        assert fm.isvalid.cohort(pq.ParquetFile(path))
+
+        # Duplicate usernames in different batches.
+        pd.concat([df, df.iloc[:1]]).to_parquet(path, row_group_size=30)
+        assert not fm.isvalid.cohort(pq.ParquetFile(path))
+
+    def test_assignment(self, pyarrow, valid_assignment, invalid_assignment):
+        # Check that assignments are validated.
+        table = pyarrow.Table.from_pandas(valid_assignment.to_frame("mark"))
+        assert fm.isvalid.assignment(table)
+        assert fm.isvalid.assignment(
+            table, valid_usernames=["abc123", "def4561", "g789"]
+        )
+        assert not fm.isvalid.assignment(table, valid_usernames=["def4561", "g789"])
+        assert not fm.isvalid.assignment(
+            pyarrow.Table.from_pandas(invalid_assignment.to_frame("mark"))
+        )
+
+    def test_assignment_missing(self, pyarrow):
+        # Check that missing marks are valid and non-numerical marks are not.
+        table = pyarrow.table({"username": ["ab12", "cd34"], "mark": [50.0, None]})
+        assert fm.isvalid.assignment(table)
+        table = pyarrow.table({"username": ["ab12", "cd34"], "mark": ["50", "60"]})
+        assert not fm.isvalid.assignment(table)
@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+import fakeitmakeit as fm
+
+
+class TestUserNames:
+    def test_type(self):
+        # Check that the pool is an array of strings.
+        assert isinstance(fm.pools.user_names(), np.ndarray)
+        assert fm.pools.user_names().dtype.kind == "U"
+
+    def test_unique(self):
+        # Check that all user names in the pool are unique.
+        pool = fm.pools.user_names()
+        assert len(np.unique(pool)) == len(pool) > 1000
+
+    def test_valid(self):
+        # Check that all user names form a valid email.
+        assert all(fm.isvalid.email(f"{u}@example.com") for u in fm.pools.user_names())
+
+
+class TestDomains:
+    def test_type(self):
+        # Check that the pool is an array of strings.
+        assert isinstance(fm.pools.domains(), np.ndarray)
+        assert fm.pools.domains().dtype.kind == "U"
+
+    def test_valid(self):
+        # Check that all domains form a valid email.
+        assert all(fm.isvalid.email(f"user@{d}") for d in fm.pools.domains())
+
+
+class TestSentences:
+    def test_type(self):
+        # Check that the pool is an array of strings.
+        assert isinstance(fm.pools.sentences(), np.ndarray)
+        assert all(isinstance(value, str) for value in fm.pools.sentences())
+
+    def test_sentence(self):
+        # Check that sentences start with an uppercase letter and end with a dot.
+        assert all(s[0].isupper() and s.endswith(".") for s in fm.pools.sentences())
+
+
+class TestNames:
+    def test_type(self):
+        # Check that the pool is an array of strings.
+        assert isinstance(fm.pools.names(), np.ndarray)
+        assert fm.pools.names().dtype.kind == "U"
+
+    def test_size(self):
+        # Check the size of the pool.
+        assert len(fm.pools.names("de_DE", "female")) == fm.pools.NAME_POOL_SIZE
+
+    def test_valid(self):
+        # Check that all names are valid without special characters.
+        for locale, gender in [(None, None), ("zh_CN", "male"), ("es_AR", "female")]:
+            pool = fm.pools.names(locale, gender)
+            assert all(fm.isvalid.name(n, allow_special_characters=False) for n in pool)
+
+    def test_last_name(self):
+        # Check that names with stripped suffixes still have first and last names.
+        assert all(len(n.split()) > 1 for n in fm.pools.names("nl_NL", "male"))
+
+    def test_cached(self):
+        # Check that the pool is saved on disk and memory-mapped read-only.
+        pool = fm.pools.names("en_GB", "male")
+        path = fm.pools.cache_dir() / f"pools-{fm.pools.cache_key()}"
+        assert (path / "names-en_GB-male.npy").exists()
+        assert isinstance(pool, np.memmap)
+        assert not pool.flags.writeable
+
+
+class TestCache:
+    def test_cache_dir(self, monkeypatch, tmp_path):
+        # Check that the cache directory can be set with an environment variable.
+        monkeypatch.setenv("FAKEITMAKEIT_CACHE_DIR", str(tmp_path))
+        assert fm.pools.cache_dir() == tmp_path
+
+    def test_cache_key(self, monkeypatch):
+        # Check that the key changes if the country-locale mapping changes.
+        key = fm.pools.cache_key()
+        monkeypatch.setitem(fm.util.COUNTRY_LOCALE, "Neverland", "en_GB")
+        fm.pools.cache_key.cache_clear()
+        try:
+            assert fm.pools.cache_key() != key
+        finally:
+            monkeypatch.undo()
+            fm.pools.cache_key.cache_clear()
+        assert fm.pools.cache_key() == key
+
+    def test_not_writable(self, monkeypatch, tmp_path):
+        # Check that the pool is generated even if the cache is not writable.
+        (tmp_path / "file").touch()
+        monkeypatch.setenv("FAKEITMAKEIT_CACHE_DIR", str(tmp_path / "file"))
+        pool = fm.pools.names.__wrapped__("en_IE", "female")
+        assert len(pool) == fm.pools.NAME_POOL_SIZE
+
+
+class TestRejectionStats:
+    def test_routed(self):
+        # Check that a locale whose names are always rejected is routed to fallback.
+        fm.pools.names("he_IL", "female")
+        stats = fm.pools.rejection_stats()["he_IL"]
+        assert stats["rate"] == 1.0
+        assert stats["attempts"] >= fm.pools.REJECTION_MIN_SAMPLES
+        assert stats["routed"] > 0
+
+    def test_fallback(self):
+        # Check that routed pools differ between locales and match the gender.
+        from faker.providers.person.en_US import Provider
+
+        he_female = fm.pools.names("he_IL", "female")
+        ar_female = fm.pools.names("ar_SA", "female")
+        assert len(set(he_female) & set(ar_female)) < 0.1 * len(he_female)
+        assert all(v.split()[0] in Provider.first_names_female for v in he_female)
+        he_male = fm.pools.names("he_IL", "male")
+        assert all(v.split()[0] in Provider.first_names_male for v in he_male)
+
+    def test_not_routed(self):
+        # Check that a locale whose names are valid is not routed.
+        fm.pools.names("en_GB", "female")
+        stats = fm.pools.rejection_stats()["en_GB"]
+        assert stats["rate"] < fm.pools.REJECTION_THRESHOLD
+        assert stats["routed"] == 0
+
+    def test_transliterated(self):
+        # Check that names in other scripts are transliterated instead of rejected.
+        fm.pools.names("ru_RU", "female")
+        stats = fm.pools.rejection_stats()["ru_RU"]
+        assert stats["rate"] < 0.5
+        assert stats["routed"] == 0
+
+    def test_retries(self, monkeypatch):
+        # Check the exception is raised when the retries are exhausted.
+        monkeypatch.setattr(fm.pools, "NAME_RETRIES", 0)
+        with pytest.raises(RuntimeError):
+            fm.pools._generate_names("he_IL", "male")
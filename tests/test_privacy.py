@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fakeitmakeit as fm
+
+
+@pytest.fixture(scope="module")
+def cohort():
+    return fm.cohort(n=500, rng=0)
+
+
+class TestPseudonymise:
+    def test_valid(self, cohort):
+        # Check that the pseudonymised cohort is valid.
+        res = fm.pseudonymise(cohort, key="secret")
+        assert fm.isvalid.cohort(res)
+        assert res["cid"].is_unique
+
+    def test_replaced(self, cohort):
+        # Check that identities are replaced and other columns are not.
+        res = fm.pseudonymise(cohort, key="secret")
+        assert not (res.index == cohort.index).any()
+        assert (res["cid"].to_numpy() != cohort["cid"].to_numpy()).mean() > 0.99
+        assert (res["email"].to_numpy() != cohort["email"].to_numpy()).all()
+        for col in ["gender", "nationality", "course", "title", "fee_status"]:
+            assert res[col].tolist() == cohort[col].tolist()
+
+    def test_consistent(self, cohort):
+        # Check that the same username is mapped to the same identity.
+        res = fm.pseudonymise(cohort, key="secret")
+        subset = fm.pseudonymise(cohort.iloc[[10, 3, 10]], key="secret")
+        expected = res.iloc[[10, 3, 10]]
+        assert subset.index.equals(expected.index)
+        for col in ["cid", "first_name", "last_name", "email", "personal_email"]:
+            assert subset[col].tolist() == expected[col].tolist()
+
+    def test_key(self, cohort):
+        # Check that different keys give different identities.
+        res1 = fm.pseudonymise(cohort, key="secret")
+        res2 = fm.pseudonymise(cohort, key=b"another secret")
+        assert (res1.index != res2.index).mean() > 0.99
+
+    def test_format(self, cohort):
+        # Check that usernames and CIDs keep their format.
+        res = fm.pseudonymise(cohort, key="secret")
+        assert (res.index.str.len() == cohort.index.str.len()).all()
+        assert (
+            res.index.str[0].str.isalpha() == cohort.index.str[0].str.isalpha()
+        ).all()
+        assert res["cid"].str[:2].tolist() == cohort["cid"].str[:2].tolist()
+        assert (res["email"].str.split("@").str[1] == "imperial.ac.uk").all()
+
+    def test_github(self, cohort):
+        # Check that usernames in github are replaced.
+        res = fm.pseudonymise(cohort, key="secret")
+        assert (res["github"] == res["course"].astype(str) + "-" + res.index).all()
+
+    def test_github_handle(self, cohort):
+        # Check that handles without usernames are replaced too.
+        df = cohort.assign(github="octocat")
+        res = fm.pseudonymise(df, key="secret")
+        assert (res["github"] == res["course"].astype(str) + "-" + res.index).all()
+
+    def test_tutors(self):
+        # Check that distinct tutors are mapped to distinct names.
+        df = fm.cohort(n=500, rng=0, n_tutors=100)
+        res = fm.pseudonymise(df, key="secret")
+        assert res["tutor"].nunique() == 100
+
+    def test_tutors_subset(self):
+        # Check that tutors keep fake names when other tutors are not in the frame.
+        df = fm.cohort(n=500, rng=0, n_tutors=100)
+        res = fm.pseudonymise(df, key="secret")
+        rows = df["tutor"].isin(df["tutor"].unique()[:10]).to_numpy()
+        sub = fm.pseudonymise(df[rows], key="secret")
+        assert sub["tutor"].tolist() == res["tutor"][rows].tolist()
+
+    def test_tutors_collision(self, monkeypatch):
+        # Check that colliding tutors get distinct names and only the tutor with
+        # the larger hash depends on the other tutor.
+        pool = np.array(["Ann Lee", "Bob Ray"])
+        monkeypatch.setattr(fm.pools, "names", lambda: pool)
+        tutors = np.array(["Jo Kim", "Al Roe", "Cy Poe"], dtype=object)
+        key = b"k" * 32
+        hashes = fm.privacy._hashes(key, "tutor", tutors) % np.uint64(2)
+        # Pick two tutors which select the same name.
+        i, j = next(
+            (i, j) for i in range(3) for j in range(i + 1, 3) if hashes[i] == hashes[j]
+        )
+        res = fm.privacy._permute_tutors(tutors[[i, j]], key)
+        assert sorted(res) == ["Ann Lee", "Bob Ray"]
+        alone = [fm.privacy._permute_tutors(tutors[[k]], key)[0] for k in (i, j)]
+        assert alone[0] == alone[1]
+        assert sum(a == r for a, r in zip(alone, res, strict=True)) == 1
+
+    def test_clear(self, cohort):
+        # Check that memoised identities are cleared.
+        fm.pseudonymise(cohort, key="secret")
+        assert fm.privacy._memo
+        fm.privacy.clear()
+        assert not fm.privacy._memo
+
+    def test_invalid(self, cohort):
+        # Check the exception is raised for invalid identities.
+        with pytest.raises(ValueError):
+            fm.pseudonymise(cohort.reset_index(), key="secret")
+        df = cohort.copy()
+        df.loc[df.index[0], "email"] = "not an email"
+        with pytest.raises(ValueError):
+            fm.pseudonymise(df, key="secret")
+
+    def test_names_only(self):
+        # Check that a frame with only some identity columns is pseudonymised.
+        df = pd.DataFrame(
+            {"first_name": ["Ana", "Bo"]},
+            index=pd.Index(["ab12", "cd345"], name="username"),
+        )
+        res = fm.pseudonymise(df, key="secret")
+        assert list(res.columns) == ["first_name"]
+        assert res["first_name"].map(fm.isvalid.name).all()
@@ -0,0 +1,90 @@
+import subprocess
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+import fakeitmakeit as fm
+import fakeitmakeit.pytest_plugin as fmpp
+from fakeitmakeit.pytest_plugin import DatasetCache
+
+
+def test_fake_cohort(fake_cohort):
+    # Check that the default cohort is valid and reproducible.
+    assert len(fake_cohort) == 100
+    assert fm.isvalid.cohort(fake_cohort)
+    pd.testing.assert_frame_equal(fake_cohort, fm.cohort(100, rng=0))
+
+
+@pytest.mark.fakeitmakeit(n=20, seed=1)
+def test_fake_cohort_marker(fake_cohort):
+    # Check that parameters are set with the marker.
+    pd.testing.assert_frame_equal(fake_cohort, fm.cohort(20, rng=1))
+
+
+@pytest.mark.parametrize("fake_cohort", [{"n": 10}, {"n": 15}], indirect=True)
+def test_fake_cohort_indirect(fake_cohort):
+    # Check that parameters are set with indirect parametrisation.
+    assert len(fake_cohort) in {10, 15}
+
+
+@pytest.mark.fakeitmakeit(n=20, seed=1, assignments=3)
+def test_fake_gradebook(fake_cohort, fake_gradebook):
+    # Check that the gradebook matches the cohort.
+    assert list(fake_gradebook.columns) == ["assignment1", "assignment2", "assignment3"]
+    assert fake_gradebook.index.equals(fake_cohort.index)
+    assert all(fm.isvalid.assignment(fake_gradebook[col]) for col in fake_gradebook)
+
+
+@pytest.mark.fakeitmakeit(n=20, seed=2)
+def test_view(fake_cohort, request, fakeitmakeit_cache):
+    # Check that modifying the dataset does not modify the cached one.
+    fake_cohort.loc[fake_cohort.index[0], "first_name"] = "Modified"
+    fake_cohort.loc[:, "cid"] = "00000000"
+    cached = fakeitmakeit_cache.get("cohort", fm.cohort, n=20, rng=2)
+    assert "Modified" not in cached["first_name"].to_numpy()
+    assert (cached["cid"] != "00000000").all()
+
+
+class TestDatasetCache:
+    def test_get(self, tmp_path):
+        # Check that the dataset is generated once and stored on disk.
+        calls = []
+
+        def generate(n):
+            calls.append(n)
+            return list(range(n))
+
+        cache = DatasetCache(tmp_path)
+        assert cache.get("data", generate, n=3) == [0, 1, 2]
+        assert cache.get("data", generate, n=3) == [0, 1, 2]
+        assert calls == [3]
+        assert (tmp_path / "data-n=3.pickle").exists()
+
+    def test_shared(self, tmp_path):
+        # Check that another process loads the dataset from disk.
+        DatasetCache(tmp_path).get("data", lambda n: list(range(n)), n=3)
+        assert DatasetCache(tmp_path).get("data", None, n=3) == [0, 1, 2]
+
+    def test_stale_lock(self, tmp_path, monkeypatch):
+        # Check that the lock of a process which no longer exists is taken over.
+        process = subprocess.Popen([sys.executable, "-c", ""])
+        process.wait()
+        (tmp_path / "data-n=3.lock").write_text(str(process.pid))
+        monkeypatch.setattr(fmpp, "LOCK_TIMEOUT", 30)
+
+        start = time.monotonic()
+        data = DatasetCache(tmp_path).get("data", lambda n: list(range(n)), n=3)
+        assert data == [0, 1, 2]
+        assert time.monotonic() - start < 30
+        assert not (tmp_path / "data-n=3.lock").exists()
+
+    def test_failed(self, tmp_path):
+        # Check that the lock is released when generating the dataset fails.
+        def generate(n):
+            raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            DatasetCache(tmp_path).get("data", generate, n=3)
+        assert not (tmp_path / "data-n=3.lock").exists()
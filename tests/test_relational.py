@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+import fakeitmakeit as fm
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return fm.dataset(300, modules=7, assignments_per_module=3, rng=0)
+
+
+class TestDataset:
+    def test_tables(self, tables):
+        # Check that all tables are generated.
+        assert list(tables) == [
+            "students",
+            "modules",
+            "enrollments",
+            "assignments",
+            "marks",
+        ]
+        assert all(isinstance(table, pd.DataFrame) for table in tables.values())
+
+    def test_students(self, tables):
+        # Check that students are a valid cohort.
+        assert len(tables["students"]) == 300
+        assert fm.isvalid.cohort(tables["students"])
+
+    def test_modules(self, tables):
+        # Check that modules are unique and belong to all courses.
+        modules = tables["modules"]
+        assert len(modules) == 7
+        assert modules.index.is_unique
+        assert set(modules["course"]) == set(fm.util.COURSES)
+
+    def test_enrollments(self, tables):
+        # Check that students are enrolled in all modules of their course.
+        enrollments = tables["enrollments"]
+        courses = tables["students"]["course"].astype(object)
+        expected = courses.map(tables["modules"]["course"].value_counts())
+        counts = enrollments.groupby("username").size()
+        assert counts.reindex(courses.index).tolist() == expected.tolist()
+        assert enrollments["module"].isin(tables["modules"].index).all()
+
+    def test_assignments(self, tables):
+        # Check that each module has the assignments with weights summing to 1.
+        assignments = tables["assignments"]
+        assert len(assignments) == 7 * 3
+        assert assignments.groupby("module")["weight"].sum().round(10).eq(1).all()
+
+    def test_marks(self, tables):
+        # Check that there is a mark for each assignment of each enrollment.
+        marks = tables["marks"]
+        assert len(marks) == len(tables["enrollments"]) * 3
+        assert not marks.duplicated(["username", "assignment"]).any()
+        assert marks["username"].isin(tables["students"].index).all()
+        assert marks["mark"].between(0, 100).all()
+
+    def test_rng(self):
+        # Check that datasets are reproducible.
+        res1 = fm.dataset(20, modules=3, rng=1)
+        res2 = fm.dataset(20, modules=3, rng=1)
+        assert all(res1[name].equals(res2[name]) for name in res1)
+
+    @pytest.mark.parametrize("file_format", ["csv", "parquet"])
+    def test_path(self, tmp_path, file_format):
+        # Check that tables are written to files.
+        if file_format == "parquet":
+            pytest.importorskip("pyarrow")
+        res = fm.dataset(20, modules=3, rng=1, path=tmp_path, file_format=file_format)
+        read = getattr(pd, f"read_{file_format}")
+        for name, table in res.items():
+            written = read(tmp_path / f"{name}.{file_format}")
+            assert len(written) == len(table)
+
+    def test_invalid_format(self):
+        # Check the exception is raised for unsupported file formats.
+        with pytest.raises(ValueError):
+            fm.dataset(10, file_format="xlsx")
+
+    def test_too_few_modules(self):
+        # Check the exception is raised if a course would have no modules.
+        with pytest.raises(ValueError):
+            fm.dataset(10, modules=len(fm.util.COURSES) - 1)
@@ -0,0 +1,215 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import fakeitmakeit as fm
+
+
+def year(n, rng):
+    return rng.integers(1, 5, size=n)
+
+
+class TestSchema:
+    def test_default(self):
+        # Check that the default schema generates a valid cohort.
+        df = fm.schema.COHORT_SCHEMA.generate(n=100, rng=0)
+        assert fm.isvalid.cohort(df)
+        assert list(df.columns) == list(fm.cohort_slice(0, 0, 5).columns)
+
+    def test_plan(self):
+        # Check that each column is generated after its dependencies.
+        plan = [column.name for column in fm.schema.COHORT_SCHEMA.plan]
+        for column in fm.schema.COHORT_SCHEMA.plan:
+            for dependency in column.depends_on:
+                assert plan.index(dependency) < plan.index(column.name)
+
+    def test_add(self):
+        # Check that a column depending on other columns can be added.
+        schema = fm.schema.COHORT_SCHEMA.add(
+            fm.Column("year", year),
+            fm.Column(
+                "initials",
+                lambda n, rng, first_name, last_name: [
+                    f"{a[0]}{b[0]}" for a, b in zip(first_name, last_name)
+                ],
+                ("first_name", "last_name"),
+            ),
+        )
+        df = schema.generate(n=50, rng=1)
+        assert df["year"].between(1, 4).all()
+        initials = df["first_name"].str[0] + df["last_name"].str[0]
+        assert (df["initials"] == initials).all()
+
+    def test_drop(self):
+        # Check that dropped columns needed by other columns are not in the output.
+        df = fm.schema.COHORT_SCHEMA.drop("first_name", "gender").generate(n=10)
+        assert "first_name" not in df.columns and "gender" not in df.columns
+        assert {"last_name", "title"} <= set(df.columns)
+
+    def test_select(self):
+        # Check that only the columns needed by the selected columns are generated.
+        schema = fm.schema.COHORT_SCHEMA.select("github")
+        assert schema.kept() == ["username", "github"]
+        plan = {column.name for column in schema.plan}
+        assert {"course", "first_name"} <= plan
+        assert not {"email", "personal_email", "tutor", "cid"} & plan
+        df = schema.generate(n=10, rng=0)
+        assert list(df.columns) == ["github"]
+
+    def test_select_unknown(self):
+        # Check the exception is raised for unknown columns.
+        with pytest.raises(ValueError):
+            fm.schema.COHORT_SCHEMA.select("shoe_size")
+
+    def test_unique(self):
+        # Check that values of unique columns are redrawn.
+        schema = fm.Schema(columns=(fm.Column("year", year, unique=True),))
+        df = schema.generate(n=4, rng=0)
+        assert sorted(df["year"]) == [1, 2, 3, 4]
+
+    def test_taken(self):
+        # Check that values of unique columns avoid taken values.
+        schema = fm.Schema(columns=(fm.Column("year", year, unique=True),))
+        df = schema.generate(n=2, rng=0, taken={"year": [1, 2]})
+        assert sorted(df["year"]) == [3, 4]
+
+    def test_not_enough_unique(self):
+        # Check the exception is raised if unique values cannot be generated.
+        schema = fm.Schema(columns=(fm.Column("year", year, unique=True),))
+        with pytest.raises(ValueError):
+            schema.generate(n=5, rng=0)
+
+    def test_dtype(self):
+        # Check that the column data type is set.
+        schema = fm.Schema(columns=(fm.Column("year", year, dtype="category"),))
+        assert isinstance(schema.generate(n=5)["year"].dtype, pd.CategoricalDtype)
+
+    @pytest.mark.parametrize(
+        "columns",
+        [
+            (fm.Column("a", year), fm.Column("a", year)),
+            (fm.Column("a", year, ("b",)),),
+            (fm.Column("a", year, ("b",)), fm.Column("b", year, ("a",))),
+        ],
+    )
+    def test_invalid(self, columns):
+        # Check the exception is raised for invalid schemas.
+        with pytest.raises(ValueError):
+            fm.Schema(columns=columns)
+
+    def test_rng(self):
+        # Check that generated dataframes are reproducible.
+        schema = fm.Schema(columns=(fm.Column("a", lambda n, rng: rng.random(n)),))
+        res1, res2 = schema.generate(3, rng=0), schema.generate(3, rng=0)
+        assert np.array_equal(res1["a"], res2["a"])
+
+    def test_threads(self):
+        # Check that the dataframe is generated in chunks with independent generators.
+        schema = fm.Schema(columns=(fm.Column("a", lambda n, rng: rng.random(n)),))
+        res = schema.generate(10, rng=0, threads=3)["a"]
+        assert len(res) == 10
+        assert res.is_unique
+        assert np.array_equal(res, schema.generate(10, rng=0, threads=3)["a"])
+
+    def test_threads_invalid(self):
+        # Check the exception is raised for a non-positive number of threads.
+        schema = fm.Schema(columns=(fm.Column("year", year),))
+        with pytest.raises(ValueError):
+            schema.generate(n=5, threads=0)
+
+
+class TestFrame:
+    def test_pandas(self):
+        # Check that the index is set and categorical columns are categorical.
+        res = fm.schema.frame(
+            {"a": np.array(["x", "y"]), "b": np.array([1, 2])},
+            dtypes={"a": "category"},
+            index="b",
+        )
+        assert res.index.name == "b"
+        assert isinstance(res["a"].dtype, pd.CategoricalDtype)
+
+    def test_pyarrow(self):
+        # Check that the index column is first and data types are converted.
+        pa = pytest.importorskip("pyarrow")
+        res = fm.schema.frame(
+            {"a": np.array(["x", "y"]), "b": np.array([1, 2])},
+            dtypes={"a": "category", "b": "int32"},
+            index="b",
+            backend="pyarrow",
+        )
+        assert res.column_names == ["b", "a"]
+        assert pa.types.is_dictionary(res.schema.field("a").type)
+        assert res.schema.field("b").type == pa.int32()
+
+    def test_polars(self):
+        # Check that polars dataframes have categorical columns.
+        pl = pytest.importorskip("polars")
+        pytest.importorskip("pyarrow")
+        res = fm.schema.frame(
+            {"a": np.array(["x", "y"])}, dtypes={"a": "category"}, backend="polars"
+        )
+        assert res.schema["a"] == pl.Categorical
+
+    @pytest.mark.parametrize("backend", ["polars", "pyarrow"])
+    def test_missing_backend(self, backend, monkeypatch):
+        # Check the exception names the extra if the backend is not installed.
+        monkeypatch.setitem(sys.modules, backend, None)
+        with pytest.raises(ImportError, match="arrow"):
+            fm.schema.frame({"a": np.array([1, 2])}, backend=backend)
+
+    @pytest.mark.parametrize("backend", ["pandas", "pyarrow", "numpy"])
+    def test_duplicate_index(self, backend):
+        # Check the exception is raised for duplicate index values.
+        pytest.importorskip(backend)
+        with pytest.raises(ValueError):
+            fm.schema.frame({"a": np.array([1, 1])}, index="a", backend=backend)
+
+    def test_numpy(self):
+        # Check that structured arrays have fixed-width and categorical fields.
+        res = fm.schema.frame(
+            {"a": np.array(["x", "yz", "x"]), "b": np.array(["é", "f", "g"])},
+            dtypes={"a": "category"},
+            index="b",
+            backend="numpy",
+        )
+        assert res.dtype.names == ("b", "a")
+        assert res.dtype["a"] == np.uint8
+        assert res.dtype["b"] == np.dtype("S2")
+        assert fm.schema.categories(res)["a"][res["a"]].tolist() == ["x", "yz", "x"]
+        assert np.strings.decode(res["b"], "utf-8").tolist() == ["é", "f", "g"]
+
+    def test_numpy_fixed(self):
+        # Check that fixed categories and widths do not depend on the values.
+        res = fm.schema.frame(
+            {"a": np.array(["y", "y"]), "b": np.array(["é", "f"])},
+            dtypes={"a": "category"},
+            backend="numpy",
+            categories={"a": ("x", "y", "z")},
+            widths={"b": 8},
+        )
+        assert res["a"].tolist() == [1, 1]
+        assert res.dtype["b"] == np.dtype("S8")
+        assert fm.schema.categories(res)["a"].tolist() == ["x", "y", "z"]
+
+        # Check the exception is raised for unknown labels and too wide values.
+        with pytest.raises(ValueError):
+            fm.schema.frame(
+                {"a": np.array(["w"])},
+                dtypes={"a": "category"},
+                backend="numpy",
+                categories={"a": ("x", "y")},
+            )
+        with pytest.raises(ValueError):
+            fm.schema.frame({"b": np.array(["abc"])}, backend="numpy", widths={"b": 2})
+
+    def test_numpy_view(self):
+        # Check that slices are views which keep the lookup tables.
+        res = fm.schema.frame(
+            {"a": np.array(["x", "y", "z"])}, dtypes={"a": "category"}, backend="numpy"
+        )
+        view = res[1:]
+        assert view.base is res
+        assert fm.schema.categories(view)["a"].tolist() == ["x", "y", "z"]
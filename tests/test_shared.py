@@ -0,0 +1,69 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import fakeitmakeit as fm
+
+
+@pytest.fixture(scope="module")
+def cohort():
+    return fm.cohort(n=50, rng=0)
+
+
+def _attached_nationalities(handle):
+    return fm.attach_cohort(handle)["nationality"].value_counts().to_dict()
+
+
+class TestShareCohort:
+    def test_roundtrip(self, cohort):
+        # Check that the attached cohort is the same as the shared one.
+        with fm.share_cohort(cohort) as handle:
+            pd.testing.assert_frame_equal(fm.attach_cohort(handle), cohort)
+
+    def test_gradebook(self, cohort):
+        # Check that numeric dataframes can be shared as well.
+        gradebook = fm.gradebook(cohort.index, rng=0)
+        with fm.share_cohort(gradebook) as handle:
+            pd.testing.assert_frame_equal(fm.attach_cohort(handle), gradebook)
+
+    def test_handle(self, cohort):
+        # Check that the handle is small.
+        with fm.share_cohort(cohort) as handle:
+            assert len(pickle.dumps(handle)) < 10_000
+
+    def test_zero_copy(self, cohort):
+        # Check that numeric and categorical buffers are not copied.
+        gradebook = fm.gradebook(cohort.index, rng=0).join(cohort["course"])
+        with fm.share_cohort(gradebook) as handle:
+            df1, df2 = fm.attach_cohort(handle), fm.attach_cohort(handle)
+            for col in ["assignment1", "assignment5"]:
+                assert np.shares_memory(df1[col].to_numpy(), df2[col].to_numpy())
+            codes1 = df1["course"].array.codes
+            assert np.shares_memory(codes1, df2["course"].array.codes)
+            assert not codes1.flags.writeable
+
+    def test_other_process(self, cohort):
+        # Check that the cohort can be attached in another process.
+        with fm.share_cohort(cohort) as handle:
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                res = pool.apply(_attached_nationalities, (handle,))
+        assert res == cohort["nationality"].value_counts().to_dict()
+
+    def test_detach(self, cohort):
+        # Check that the block is closed once attached dataframes are not in use.
+        with fm.share_cohort(cohort) as handle:
+            df = fm.attach_cohort(handle)
+            with pytest.raises(BufferError):
+                fm.detach_cohort(handle)
+            del df
+            fm.detach_cohort(handle)
+            assert handle.name not in fm.shared._attached
+            fm.detach_cohort(handle)
+
+    def test_invalid_dtype(self, cohort):
+        # Check the exception is raised for columns which cannot be shared.
+        with pytest.raises(TypeError):
+            fm.share_cohort(cohort.assign(comment=[{}] * len(cohort)))
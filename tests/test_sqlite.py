@@ -0,0 +1,80 @@
+import contextlib
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import fakeitmakeit as fm
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "cohort.db"
+    fm.load_sqlite(path, n_students=250, n_assignments=4, seed=0, chunk_size=100)
+    with contextlib.closing(sqlite3.connect(path)) as con:
+        yield con
+
+
+class TestLoadSqlite:
+    def test_students(self, database):
+        # Check that students are valid and unique across chunks.
+        res = pd.read_sql("SELECT * FROM students", database, index_col="username")
+        assert len(res) == 250
+        assert fm.isvalid.cohort(res)
+        assert res.index.is_unique
+        assert all(res[col].is_unique for col in ["cid", "email", "personal_email"])
+
+    def test_one_chunk(self, tmp_path):
+        # Check that the students table contains the cohort generated with the seed.
+        path = tmp_path / "cohort.db"
+        fm.load_sqlite(path, n_students=250, seed=0)
+        with contextlib.closing(sqlite3.connect(path)) as con:
+            res = pd.read_sql("SELECT * FROM students", con, index_col="username")
+        expected = fm.cohort(250, rng=0)
+        assert res.index.tolist() == expected.index.tolist()
+        assert res["cid"].tolist() == expected["cid"].tolist()
+        assert res["email"].tolist() == expected["email"].tolist()
+
+    def test_marks(self, database):
+        # Check that each student has a mark for each assignment.
+        res = pd.read_sql("SELECT * FROM marks", database)
+        assert len(res) == 250 * 4
+        assert set(res["assignment"]) == {1, 2, 3, 4}
+        assert res.groupby("username").size().eq(4).all()
+        assert res["mark"].between(0, 100).all()
+
+    def test_foreign_key(self, database):
+        # Check that all marks belong to students.
+        query = (
+            "SELECT COUNT(*) FROM marks "
+            "LEFT JOIN students USING (username) WHERE students.cid IS NULL"
+        )
+        assert database.execute(query).fetchone() == (0,)
+
+    def test_indexes(self, database):
+        # Check that the indexes are built.
+        query = "SELECT name FROM sqlite_master WHERE type = 'index'"
+        assert {name for (name,) in database.execute(query)} == {
+            "students_username",
+            "students_cid",
+            "marks_username_assignment",
+        }
+
+    def test_wal(self, database):
+        # Check that the database uses write-ahead logging.
+        assert database.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+    def test_seed(self, database, tmp_path):
+        # Check that databases generated with the same seed are the same.
+        path = tmp_path / "other.db"
+        fm.load_sqlite(path, n_students=250, n_assignments=4, seed=0, chunk_size=100)
+        query = "SELECT * FROM marks ORDER BY username, assignment"
+        with contextlib.closing(sqlite3.connect(path)) as con:
+            assert con.execute(query).fetchall() == database.execute(query).fetchall()
+
+    def test_existing(self, tmp_path):
+        # Check the exception is raised if the tables already exist.
+        path = tmp_path / "cohort.db"
+        fm.load_sqlite(path, n_students=10, seed=0)
+        with pytest.raises(sqlite3.OperationalError):
+            fm.load_sqlite(path, n_students=10, seed=0)
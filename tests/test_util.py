@@ -1,5 +1,12 @@
+import concurrent.futures
 import numbers
+import os
 import re
+import subprocess
+import sys
+
+import numpy as np
+import pytest
 
 import fakeitmakeit as fm
 
@@ -10,6 +17,19 @@ def test_version():
     assert re.fullmatch(r"20[0-9]{2}\.[0-9]{1,2}\.[0-9]{1,2}", fm.__version__)
 
 
+def test_lazy_imports():
+    # Check that heavy dependencies are not imported until they are needed.
+    code = (
+        "import sys, fakeitmakeit as fm;"
+        "fm.cid(); fm.isvalid.email('a@b.com'); fm.isvalid.name('Albert');"
+        "print(*sorted({'pandas', 'faker', 'pycountry'} & set(sys.modules)))"
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert res.stdout.strip() == ""
+
+
 class TestGENDERS:
     def test_type(self):
         # Check that GENDERS is a dictionary.
@@ -119,3 +139,193 @@ class TestDiscreteDraw:
     def test_certain(self):
         # Check that the output is always the same if probability is 1.
         assert fm.util.discrete_draw({"a": 0, "b": 1}) == "b"
+
+    def test_size(self):
+        # Check that an array of values is drawn.
+        res = fm.util.discrete_draw({"a": 1, "b": 3}, rng=0, size=10_000)
+        assert res.shape == (10_000,)
+        assert 0.22 <= (res == "a").mean() <= 0.28
+
+
+class TestTransliterate:
+    def test_diacritics(self):
+        # Check that diacritics are removed.
+        assert fm.util.transliterate("Zoë Müller-Ďurčová") == "Zoe Muller-Durcova"
+
+    def test_letters(self):
+        # Check that letters without ASCII base letters are replaced.
+        assert fm.util.transliterate("Ørsted Weiß") == "Orsted Weiss"
+        assert fm.util.transliterate("Юлия Щербакова") == "Yuliya Shcherbakova"
+        assert fm.util.transliterate("Γιώργος") == "Giorgos"
+
+    def test_valid(self):
+        # Check that transliterated names pass validation without special characters.
+        for value in ["Łucja Wójcik", "Ævar Þórsson", "Ирина Ёлкина", "Şükrü Öztürk"]:
+            res = fm.util.transliterate(value)
+            assert fm.isvalid.name(res, allow_special_characters=False)
+
+    def test_kept(self):
+        # Check that characters which cannot be transliterated are kept.
+        assert fm.util.transliterate("王 Smith") == "王 Smith"
+
+
+class TestGetRng:
+    def test_default(self):
+        # Check that the default generator is reused in the main thread.
+        assert fm.util.get_rng() is fm.util.get_rng()
+
+    def test_threads(self):
+        # Check that each thread has its own default generator.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            res = executor.submit(lambda: (fm.util.get_rng(), fm.util.get_rng()))
+            first, second = res.result()
+        assert first is second
+        assert first is not fm.util.get_rng()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+    def test_fork(self):
+        # Check that forked processes do not share the state of the default generator.
+        # Processes are forked from a new single-threaded interpreter.
+        code = (
+            "import os; import fakeitmakeit as fm; fm.util.get_rng()\n"
+            "for _ in range(2):\n"
+            "    if (pid := os.fork()) == 0:\n"
+            "        print(fm.cid(), flush=True); os._exit(0)\n"
+            "    os.waitpid(pid, 0)\n"
+        )
+        res = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        first, second = res.stdout.split()
+        assert first != second
+
+    def test_seed(self):
+        # Check that a seed gives a reproducible generator.
+        assert fm.util.get_rng(0).random() == fm.util.get_rng(0).random()
+
+
+class TestPermute:
+    @pytest.mark.parametrize("n", [1, 2, 10, 1000, 12345])
+    def test_permutation(self, n):
+        # Check that all values are mapped to unique values in range(n).
+        res = fm.util.permute(np.arange(n), n=n, key=42)
+        assert sorted(res.tolist()) == list(range(n))
+
+    def test_key(self):
+        # Check that different keys give different permutations.
+        values = np.arange(1000)
+        assert (
+            fm.util.permute(values, 1000, 1) == fm.util.permute(values, 1000, 1)
+        ).all()
+        assert (
+            fm.util.permute(values, 1000, 1) != fm.util.permute(values, 1000, 2)
+        ).any()
+
+    def test_invalid(self):
+        # Check the exception is raised for values out of range.
+        with pytest.raises(ValueError):
+            fm.util.permute([10], n=10, key=0)
+
+
+@pytest.fixture
+def bias():
+    return fm.util.CohortBias(
+        gender={"male": 1, "female": 1},
+        course={"acse": 1, "edsml": 1, "gems": 1},
+        country_bias={"China": 1000},
+        conditionals={
+            "course": {"given": "nationality", "table": {"China": {"edsml": 1}}},
+            "gender": fm.util.ConditionalTable(
+                "course", {"gems": {"male": 1, "female": 3}}
+            ),
+        },
+    )
+
+
+class TestCohortBias:
+    def test_marginals(self):
+        # Check that the default bias samples the marginal distributions.
+        res = fm.util.cohort_bias.sample(10_000, rng=0)
+        assert set(res) == set(fm.util.BIAS_COLUMNS)
+        assert 0.36 <= (res["course"] == "acse").mean() <= 0.44
+        assert set(res["nationality"]) <= set(fm.util.COUNTRIES)
+
+    def test_order(self, bias):
+        # Check that parents are sampled before their children.
+        assert bias.order() == ("nationality", "course", "gender")
+
+    def test_conditionals(self, bias):
+        # Check that columns follow the conditional tables.
+        res = bias.sample(20_000, rng=0)
+        china = res["nationality"] == "China"
+        assert set(res["course"][china]) == {"edsml"}
+        assert {"acse", "gems"} <= set(res["course"][~china])
+        female = res["gender"][res["course"] == "gems"] == "female"
+        assert 0.7 <= female.mean() <= 0.8
+
+    def test_given(self, bias):
+        # Check that given values are not sampled, but children depend on them.
+        res = bias.sample(100, rng=0, given={"nationality": ["China"] * 100})
+        assert set(res["course"]) == {"edsml"}
+
+    def test_rng(self, bias):
+        # Check that sampling is reproducible.
+        res1, res2 = bias.sample(100, rng=1), bias.sample(100, rng=1)
+        assert all((res1[c] == res2[c]).all() for c in fm.util.BIAS_COLUMNS)
+
+    def test_replace(self, bias):
+        # Check that replaced fields are compiled again.
+        bias.sample(10, rng=0)
+        bias.gender = {"nonbinary": 1}
+        bias.conditionals = {}
+        assert set(bias.sample(10, rng=0)["gender"]) == {"nonbinary"}
+
+    def test_modify(self, bias):
+        # Check that fields modified in place are compiled again.
+        bias.sample(10, rng=0)
+        bias.course["gems"] = 1e9
+        bias.conditionals["gender"].table["gems"]["nonbinary"] = 1e9
+        res = bias.sample(10, rng=0)
+        assert set(res["course"]) - {"edsml"} == {"gems"}
+        assert set(res["gender"][res["course"] == "gems"]) == {"nonbinary"}
+
+    def test_reuse(self, bias):
+        # Check that distributions are compiled again only after they change.
+        bias.sample(10, rng=0)
+        compiled = bias._compiled()
+        bias.sample(10, rng=0)
+        assert bias._compiled()[1] is compiled[1]
+        bias.conditionals["gender"].table["acse"] = {}
+        bias.conditionals["gender"].table["acse"]["nonbinary"] = 1
+        assert bias._compiled()[1] is not compiled[1]
+        res = bias.sample(100, rng=0)
+        assert set(res["gender"][res["course"] == "acse"]) == {"nonbinary"}
+
+    def test_json(self, bias, tmp_path):
+        # Check that profiles are saved to and loaded from JSON.
+        bias.to_json(tmp_path / "bias.json")
+        res = fm.util.CohortBias.from_json(tmp_path / "bias.json")
+        assert res == bias
+
+    @pytest.mark.parametrize(
+        "conditionals",
+        [
+            {"year": {"given": "course", "table": {}}},
+            {
+                "course": {"given": "gender", "table": {}},
+                "gender": {"given": "course", "table": {}},
+            },
+        ],
+    )
+    def test_invalid(self, conditionals):
+        # Check the exception is raised for unknown columns and cycles.
+        with pytest.raises(ValueError):
+            fm.util.CohortBias({"male": 1}, {"acse": 1}, {}, conditionals)
+
+    def test_cohort(self, bias, monkeypatch):
+        # Check that cohorts and students are generated with the cohort bias.
+        monkeypatch.setattr(fm.util, "cohort_bias", bias)
+        df = fm.cohort(200, rng=0)
+        assert set(df.loc[df["nationality"] == "China", "course"]) == {"edsml"}
+        student = fm.student(countryval="China", rng=0)
+        assert student.course == "edsml"